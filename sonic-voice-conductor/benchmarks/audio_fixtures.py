@@ -0,0 +1,70 @@
+"""WAV-Fixtures für die Audio-Benchmarks: echte Aufnahmen aus einem Verzeichnis oder synthetische.
+
+Ein Fixture-Verzeichnis enthält name.wav und optional name.txt (Referenztranskript für WER).
+Ohne Verzeichnis werden sprachähnliche Signale erzeugt (Grundton + Obertöne mit
+Silbenhüllkurve, davor/danach Rauschen) – gut für VAD/Trimming, nicht für WER.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from svc.audio.wav import read_wav, write_wav  # noqa: E402
+
+
+@dataclass
+class Fixture:
+    name: str
+    audio: np.ndarray
+    transcript: str | None = None
+    speech: tuple[int, int] | None = None  # bekannte Sprach-Grenzen in Samples (nur synthetisch)
+
+
+def synth_utterance(
+    rng: np.random.Generator, sample_rate: int = 16000, total: float = 3.0
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """Sprachähnliches Signal in einer festen Aufnahmelänge, wie sie Recorder.record ohne VAD liefert."""
+    n = int(total * sample_rate)
+    audio = rng.normal(0, 10 ** (-60 / 20), n).astype(np.float32)  # Raumrauschen ~ -60 dBFS
+    start = int(rng.uniform(0.15, 0.6) * sample_rate)
+    length = int(rng.uniform(0.3, 1.4) * sample_rate)
+    length = min(length, n - start - sample_rate // 5)
+    t = np.arange(length) / sample_rate
+    f0 = rng.uniform(100, 220) * (1 + 0.03 * np.sin(2 * np.pi * 5 * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(np.pi * t * rng.uniform(3.5, 5.5)) ** 2 + 0.15, 0, 1)
+    voice = voice * syllables * np.hanning(length) ** 0.3
+    voice *= 10 ** (-18 / 20) / (np.sqrt(np.mean(voice**2)) + 1e-9)
+    audio[start : start + length] += voice.astype(np.float32)
+    return audio, (start, start + length)
+
+
+def load_fixtures(directory: Path | None, count: int = 20, sample_rate: int = 16000, seed: int = 0) -> list[Fixture]:
+    if directory is not None:
+        fixtures = []
+        for wav in sorted(Path(directory).glob("*.wav")):
+            txt = wav.with_suffix(".txt")
+            transcript = txt.read_text(encoding="utf-8").strip() if txt.exists() else None
+            fixtures.append(Fixture(wav.stem, read_wav(wav, sample_rate), transcript))
+        if not fixtures:
+            raise SystemExit(f"Keine *.wav in {directory}")
+        return fixtures
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(count):
+        audio, speech = synth_utterance(rng, sample_rate)
+        out.append(Fixture(f"synth_{i:02d}", audio, speech=speech))
+    return out
+
+
+def write_fixtures(directory: Path, fixtures: list[Fixture], sample_rate: int = 16000) -> None:
+    """Synthetische Fixtures als WAV ablegen (z.B. um sie anzuhören oder weiterzuverwenden)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for f in fixtures:
+        write_wav(directory / f"{f.name}.wav", f.audio, sample_rate)
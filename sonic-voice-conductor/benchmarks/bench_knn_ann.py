@@ -0,0 +1,83 @@
+"""Benchmark: exakte kNN-Suche vs. IVF (ANN) auf synthetischen Examples.
+
+    python benchmarks/bench_knn_ann.py --sizes 10000 100000 500000 --dim 768
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from svc.intent.ann import IVFIndex  # noqa: E402
+from svc.intent.index import EmbeddingIndex, normalize_rows  # noqa: E402
+
+
+def synthetic(n: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Cluster um Intent-Zentren, ähnlich wie echte Example-Embeddings."""
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    out = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, 50000):
+        m = min(50000, n - start)
+        out[start : start + m] = centers[rng.integers(0, clusters, size=m)] + 0.6 * rng.normal(size=(m, dim))
+    return out
+
+
+def percentile_ms(samples: list[float], p: float) -> float:
+    return float(np.percentile(samples, p) * 1000)
+
+
+def run(n: int, dim: int, queries: int, nprobes: list[int], k: int) -> None:
+    rng = np.random.default_rng(n)
+    data = synthetic(n, dim, clusters=max(16, n // 500), rng=rng)
+    index = EmbeddingIndex(dim, capacity=n)
+    index.append(np.arange(n), data, ["X"] * n, [""] * n, [{}] * n)
+    del data
+    qs = normalize_rows(index.matrix[rng.integers(0, n, size=queries)] + 0.2 * rng.normal(size=(queries, dim)))
+
+    t = time.perf_counter()
+    ivf = IVFIndex.build(index.matrix)
+    build_s = time.perf_counter() - t
+
+    exact_times, truth = [], []
+    for q in qs:
+        t = time.perf_counter()
+        truth.append([i for _, i in index.search(q, k)])
+        exact_times.append(time.perf_counter() - t)
+    print(f"\nn={n:>7}  dim={dim}  lists={ivf.n_lists}  build={build_s:.1f}s")
+    print(f"  {'mode':<12} {'p50 ms':>8} {'p95 ms':>8} {'recall@1':>9} {'recall@' + str(k):>9}")
+    print(f"  {'exact':<12} {percentile_ms(exact_times, 50):>8.2f} {percentile_ms(exact_times, 95):>8.2f} {1.0:>9.3f} {1.0:>9.3f}")
+    for nprobe in nprobes:
+        times, r1, rk = [], 0, 0
+        for q, exp in zip(qs, truth):
+            t = time.perf_counter()
+            got = [i for _, i in ivf.search(index.matrix, q, k, nprobe=nprobe)]
+            times.append(time.perf_counter() - t)
+            r1 += bool(got) and got[0] == exp[0]
+            rk += len(set(got) & set(exp))
+        label = f"ivf/{nprobe}"
+        print(
+            f"  {label:<12} {percentile_ms(times, 50):>8.2f} {percentile_ms(times, 95):>8.2f}"
+            f" {r1 / queries:>9.3f} {rk / (queries * k):>9.3f}"
+        )
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 500000])
+    ap.add_argument("--dim", type=int, default=768, help="nomic-embed-text: 768")
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    ap.add_argument("-k", type=int, default=3)
+    args = ap.parse_args()
+    for n in args.sizes:
+        run(n, args.dim, args.queries, args.nprobe, args.k)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
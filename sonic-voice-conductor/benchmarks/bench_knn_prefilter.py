@@ -0,0 +1,76 @@
+"""Benchmark: volle kNN-Suche vs. Intent-Prefilter (knn_index: intent) bei wachsender Example-Zahl.
+
+    python benchmarks/bench_knn_prefilter.py --sizes 1000 10000 100000 --intents 40
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from svc.intent.index import EmbeddingIndex, normalize_rows  # noqa: E402
+from svc.intent.prefilter import IntentPrefilter  # noqa: E402
+
+
+def synthetic(n: int, dim: int, n_intents: int, rng: np.random.Generator) -> tuple[np.ndarray, list[str]]:
+    """Intents als Cluster, innerhalb jedes Intents Unter-Cluster (Slot-Varianten)."""
+    centers = rng.normal(size=(n_intents, dim)).astype(np.float32)
+    variants = centers[:, None, :] + 0.5 * rng.normal(size=(n_intents, 6, dim)).astype(np.float32)
+    labels = rng.integers(0, n_intents, size=n)
+    sub = rng.integers(0, 6, size=n)
+    data = variants[labels, sub] + 0.35 * rng.normal(size=(n, dim)).astype(np.float32)
+    return data, [f"I{c}" for c in labels]
+
+
+def percentile_ms(samples: list[float], p: float) -> float:
+    return float(np.percentile(samples, p) * 1000)
+
+
+def run(n: int, dim: int, n_intents: int, queries: int, k: int) -> None:
+    rng = np.random.default_rng(n)
+    data, intents = synthetic(n, dim, n_intents, rng)
+    index = EmbeddingIndex(dim, capacity=n)
+    index.append(np.arange(n), data, intents, [""] * n, [{}] * n)
+    qs = normalize_rows(data[rng.integers(0, n, size=queries)] + 0.2 * rng.normal(size=(queries, dim)))
+    del data
+
+    t = time.perf_counter()
+    pre = IntentPrefilter.build(index)
+    build_s = time.perf_counter() - t
+
+    full, staged, same = [], [], 0
+    for q in qs:
+        t = time.perf_counter()
+        exp = index.search(q, k)
+        full.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        got = pre.search(index, q, k)
+        staged.append(time.perf_counter() - t)
+        same += [p for _, p in got] == [p for _, p in exp]
+    print(
+        f"n={n:>7}  prototypes={len(pre):>4}  build={build_s:.2f}s  "
+        f"full p50={percentile_ms(full, 50):.2f}ms  intent p50={percentile_ms(staged, 50):.2f}ms  "
+        f"speedup={np.median(full) / np.median(staged):.1f}x  scanned={pre.scan_fraction:.0%}  "
+        f"identisch={same}/{len(qs)}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--intents", type=int, default=40)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--k", type=int, default=3)
+    args = ap.parse_args()
+    for n in args.sizes:
+        run(n, args.dim, args.intents, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
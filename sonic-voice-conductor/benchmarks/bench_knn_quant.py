@@ -0,0 +1,99 @@
+"""Benchmark: float32 vs. float16 vs. int8 Index-Matrix, mit und ohne exakten Re-Rank.
+
+    python benchmarks/bench_knn_quant.py --db ~/.local/share/svc/svc.db   # echte Examples
+    python benchmarks/bench_knn_quant.py --n 100000 --dim 768             # synthetisch
+
+Mit --db werden die gespeicherten Examples (float32-BLOBs) selbst als Queries benutzt,
+jeweils leicht verrauscht; gemessen wird die Top-1-Übereinstimmung mit float32.
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from svc.intent.index import EmbeddingIndex, normalize_rows, top_k  # noqa: E402
+
+
+def load_db(path: Path) -> tuple[np.ndarray, list[str]]:
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute(
+            "SELECT intent, embedding FROM examples WHERE embedding IS NOT NULL AND length(embedding) > 0"
+        ).fetchall()
+    if not rows:
+        sys.exit(f"{path}: keine Embeddings gefunden (storage: mmap? dann --n nutzen)")
+    row_bytes = len(rows[0][1])
+    rows = [r for r in rows if len(r[1]) == row_bytes]
+    data = np.frombuffer(b"".join(r[1] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+    return data, [r[0] for r in rows]
+
+
+def synthetic(n: int, dim: int, rng: np.random.Generator) -> tuple[np.ndarray, list[str]]:
+    clusters = max(16, n // 500)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    data = centers[labels] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    return data, [f"I{c}" for c in labels]
+
+
+def percentile_ms(samples: list[float], p: float) -> float:
+    return float(np.percentile(samples, p) * 1000)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--db", type=Path, help="svc.db mit Examples (sonst synthetisch)")
+    ap.add_argument("--n", type=int, default=100000)
+    ap.add_argument("--dim", type=int, default=768)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=3)
+    ap.add_argument("--rerank", type=int, default=4)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    data, intents = load_db(args.db) if args.db else synthetic(args.n, args.dim, rng)
+    n, dim = data.shape
+    qs = normalize_rows(data[rng.integers(0, n, size=args.queries)] + 0.2 * rng.normal(size=(args.queries, dim)))
+
+    indexes = {}
+    for dtype in ("float32", "float16", "int8"):
+        index = EmbeddingIndex(dim, capacity=n, dtype=dtype)
+        for start in range(0, n, 8192):
+            stop = min(start + 8192, n)
+            m = stop - start
+            index.append(np.arange(start, stop), data[start:stop], intents[start:stop], [""] * m, [{}] * m)
+        indexes[dtype] = index
+    ref = indexes["float32"]
+    truth = [top_k(ref.scores(q), 1)[0] for q in qs]
+
+    print(f"n={n}  dim={dim}  queries={args.queries}  k={args.k}  rerank={args.rerank}")
+    print(f"  {'mode':<16} {'MB':>7} {'p50 ms':>8} {'p95 ms':>8} {'recall@1':>9} {'intent@1':>9}")
+    for dtype, index in indexes.items():
+        variants = [(dtype, False)] + ([(dtype + "+rerank", True)] if index.quantized else [])
+        for name, rerank in variants:
+            times, r1, agree = [], 0, 0
+            for q, exp in zip(qs, truth):
+                t = time.perf_counter()
+                if rerank:
+                    cand = top_k(index.scores(q), args.k * args.rerank)
+                    exact = ref.matrix[cand] @ q  # steht für den Re-Rank aus BLOB/Vektordatei
+                    best = int(cand[np.argsort(-exact)[: args.k]][0])
+                else:
+                    best = int(top_k(index.scores(q), args.k)[0])
+                times.append(time.perf_counter() - t)
+                r1 += best == exp
+                agree += intents[best] == intents[exp]
+            print(
+                f"  {name:<16} {index.nbytes / 2**20:>7.1f} {percentile_ms(times, 50):>8.2f} "
+                f"{percentile_ms(times, 95):>8.2f} {r1 / len(qs):>9.3f} {agree / len(qs):>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: Retry-Rate und p95-Latenz des LLM-Fallbacks ohne vs. mit JSON-Schema (Ollama `format`).
+
+Braucht einen laufenden Ollama-Server mit dem konfigurierten Modell.
+
+    python benchmarks/bench_llm_schema.py --model llama3.2 --rounds 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from svc.intent.knn_store import KNNStore  # noqa: E402
+from svc.intent.parser import IntentParser  # noqa: E402
+from svc.intent.rules import ALLOWED_INTENTS  # noqa: E402
+from svc.intent.schema import intent_json_schema  # noqa: E402
+from svc.llm.ollama_client import OllamaClient  # noqa: E402
+
+PHRASES = [
+    "mach mal richtig druck",
+    "etwas düsterer bitte",
+    "nimm die hats ein bisschen raus",
+    "lass es atmen",
+    "schneller werden",
+    "gib mir einen langen break",
+    "zurück wie vorher",
+    "das war super",
+    "äh keine ahnung",
+    "spiel das makro von vorhin",
+]
+
+
+def run(label: str, client: OllamaClient, constrained: bool, rounds: int, tmp: Path) -> None:
+    # Leerer kNN-Store: jede Phrase geht an das LLM
+    store = KNNStore(tmp / f"{label}.db", lambda t: [])
+    parser = IntentParser(store, client.generate, client.extract_json, constrained=constrained)
+    times, methods = [], []
+    for _ in range(rounds):
+        for phrase in PHRASES:
+            t = time.perf_counter()
+            methods.append(parser.parse(phrase)[1])
+            times.append(time.perf_counter() - t)
+    n = len(times)
+    print(
+        f"  {label:<12} retries {parser.llm_retries:>3}/{n} ({parser.llm_retries / n:>4.0%})  "
+        f"p50 {np.percentile(times, 50) * 1000:>6.0f} ms  p95 {np.percentile(times, 95) * 1000:>6.0f} ms  "
+        f"unknown {methods.count('unknown')}/{n}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--base-url", default="http://127.0.0.1:11434")
+    ap.add_argument("--model", default="llama3.2")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    free = OllamaClient(base_url=args.base_url, llm_model=args.model)
+    schema = OllamaClient(
+        base_url=args.base_url, llm_model=args.model, response_format=intent_json_schema(ALLOWED_INTENTS)
+    )
+    free.generate("Antworte mit OK.", "warmup")  # Modell laden
+    print(f"model={args.model}  phrases={len(PHRASES)} x {args.rounds}")
+    with tempfile.TemporaryDirectory() as tmp:
+        run("ohne Schema", free, False, args.rounds, Path(tmp))
+        run("mit Schema", schema, True, args.rounds, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: Prompt-Eval je Intent-Request, Chat (System-Prompt jedes Mal) vs. Session (geprimter context).
+
+Braucht einen laufenden Ollama-Server mit dem konfigurierten Modell.
+
+    python benchmarks/bench_llm_session.py --model llama3.2 --rounds 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from svc.llm.ollama_client import OllamaClient  # noqa: E402
+from svc.llm.prompts import INTENT_SYSTEM_PROMPT, build_intent_prompt  # noqa: E402
+
+PHRASES = ["mach mal richtig druck", "etwas düsterer bitte", "lass es atmen", "schneller werden", "das war super"]
+
+
+def run(label: str, client: OllamaClient, rounds: int) -> None:
+    client.warm_up_llm(INTENT_SYSTEM_PROMPT)  # Modell laden / primen
+    client.timings.clear()
+    for _ in range(rounds):
+        for phrase in PHRASES:
+            client.generate(INTENT_SYSTEM_PROMPT, build_intent_prompt(phrase))
+    timings = [t for t in client.timings if t.prompt_eval is not None]
+    if not timings:
+        print(f"  {label:<8} keine Prompt-Eval-Werte von Ollama")
+        return
+    print(
+        f"  {label:<8} prompt-eval p50 {np.median([t.prompt_eval for t in timings]) * 1000:>6.0f} ms "
+        f"({np.median([t.prompt_tokens or 0 for t in timings]):.0f} Tokens)  "
+        f"gesamt p50 {np.median([t.total for t in timings]) * 1000:>6.0f} ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--base-url", default="http://127.0.0.1:11434")
+    ap.add_argument("--model", default="llama3.2")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+    print(f"model={args.model}  requests={len(PHRASES) * args.rounds} je Modus")
+    for label, session in (("chat", False), ("session", True)):
+        client = OllamaClient(base_url=args.base_url, llm_model=args.model, session=session, keep_alive="10m")
+        run(label, client, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark: LLM-Intent ohne Stream vs. gestreamt mit Abbruch nach dem ersten JSON-Objekt.
+
+Braucht einen laufenden Ollama-Server mit dem konfigurierten Modell.
+
+    python benchmarks/bench_llm_stream.py --model llama3.2 --rounds 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from svc.llm.ollama_client import OllamaClient  # noqa: E402
+from svc.llm.prompts import INTENT_SYSTEM_PROMPT, build_intent_prompt  # noqa: E402
+
+PHRASES = [
+    "mach mal richtig druck",
+    "etwas düsterer bitte",
+    "nimm die hats ein bisschen raus",
+    "lass es atmen",
+    "schneller werden",
+    "gib mir einen langen break",
+    "zurück wie vorher",
+    "das war super",
+]
+
+
+def ms(values: list[float], p: float) -> float:
+    return float(np.percentile(values, p) * 1000)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--base-url", default="http://127.0.0.1:11434")
+    ap.add_argument("--model", default="llama3.2")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    client = OllamaClient(base_url=args.base_url, llm_model=args.model)
+    client.generate(INTENT_SYSTEM_PROMPT, build_intent_prompt("warmup"))  # Modell laden
+
+    full, full_ok = [], 0
+    for _ in range(args.rounds):
+        for phrase in PHRASES:
+            t = time.perf_counter()
+            raw = client.generate(INTENT_SYSTEM_PROMPT, build_intent_prompt(phrase))
+            full_ok += client.extract_json(raw) is not None
+            full.append(time.perf_counter() - t)
+
+    stream_ok = 0
+    for _ in range(args.rounds):
+        for phrase in PHRASES:
+            stream_ok += client.generate_json(INTENT_SYSTEM_PROMPT, build_intent_prompt(phrase)) is not None
+    timings = list(client.timings)
+    to_intent = [t.intent for t in timings if t.intent is not None]
+    n = len(full)
+
+    print(f"model={args.model}  requests={n}")
+    print(f"  {'mode':<28} {'p50 ms':>8} {'p95 ms':>8} {'JSON ok':>8}")
+    print(f"  {'ohne Stream (gesamt)':<28} {ms(full, 50):>8.0f} {ms(full, 95):>8.0f} {full_ok:>5}/{n}")
+    if to_intent:
+        print(f"  {'Stream: time-to-intent':<28} {ms(to_intent, 50):>8.0f} {ms(to_intent, 95):>8.0f} {stream_ok:>5}/{n}")
+    print(f"  {'Stream: gesamt':<28} {ms([t.total for t in timings], 50):>8.0f} {ms([t.total for t in timings], 95):>8.0f}")
+    print(f"  abgeschnitten: {sum(t.cut_off for t in timings)}/{len(timings)}, "
+          f"erstes Token p50 {ms([t.first_token for t in timings], 50):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
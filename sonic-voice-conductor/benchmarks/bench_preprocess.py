@@ -0,0 +1,64 @@
+"""Benchmark: Vorverarbeitung vor Whisper (Trimming, DC, Normalisierung) über WAV-Fixtures.
+
+Misst je Äußerung eingesparte Bytes/Audio-ms, die Rechenzeit und per tracemalloc den
+zusätzlichen Speicher (in place: nur Zwischenwerte je Frame, keine Kopie des Puffers). Zu den Fixtures kommen
+--silent reine Rauschaufnahmen, bei denen Whisper ganz entfallen muss.
+
+    python benchmarks/bench_preprocess.py
+    python benchmarks/bench_preprocess.py --fixtures aufnahmen/
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from audio_fixtures import load_fixtures  # noqa: E402
+from svc.audio.preprocess import preprocess  # noqa: E402
+from svc.audio.vad import VADSettings  # noqa: E402
+
+SR = 16000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fixtures", type=Path, default=None, help="Verzeichnis mit *.wav (Standard: synthetisch)")
+    ap.add_argument("--count", type=int, default=20)
+    ap.add_argument("--silent", type=int, default=5, help="zusätzliche Aufnahmen ohne Sprache")
+    args = ap.parse_args()
+
+    buffers = [f.audio for f in load_fixtures(args.fixtures, args.count, SR)]
+    rng = np.random.default_rng(1)
+    buffers += [rng.normal(0, 1e-3, 3 * SR).astype(np.float32) for _ in range(args.silent)]
+
+    settings = VADSettings()
+    saved_bytes, saved_ms, cpu, extra, skipped = [], [], [], [], 0
+    for audio in buffers:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        result = preprocess(audio, settings, SR)
+        cpu.append(time.perf_counter() - t0)
+        extra.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        saved_bytes.append(result.bytes_saved)
+        saved_ms.append(result.ms_saved)
+        skipped += not result.voiced
+
+    total = sum(b.nbytes for b in buffers)
+    print(f"Aufnahmen={len(buffers)} ({args.silent} ohne Sprache)  Puffer gesamt {total / 1024:.0f} KB")
+    print(f"  gespart je Äußerung: p50 {np.median(saved_bytes) / 1024:.0f} KB / {np.median(saved_ms):.0f} ms Audio, "
+          f"gesamt {sum(saved_bytes) / total:.0%} der Bytes")
+    print(f"  Whisper übersprungen: {skipped}/{len(buffers)}")
+    print(f"  Rechenzeit p50 {np.median(cpu) * 1000:.2f} ms, Zusatzspeicher max {max(extra) / 1024:.0f} KB "
+          f"(Puffer {max(b.nbytes for b in buffers) / 1024:.0f} KB; keine Kopie, nur Frame-Zwischenwerte)")
+
+
+if __name__ == "__main__":
+    main()
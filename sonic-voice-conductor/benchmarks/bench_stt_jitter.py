@@ -0,0 +1,100 @@
+"""Benchmark: Tick-Jitter des Scheduler-Threads während Whisper im Prozess vs. im STTPool dekodiert.
+
+Ein Thread tickt wie tick_loop alle --period Sekunden und misst mit TickJitter, wie
+spät er drankommt, während nacheinander die Fixtures dekodiert werden.
+
+    python benchmarks/bench_stt_jitter.py                  # braucht faster-whisper
+    python benchmarks/bench_stt_jitter.py --simulate       # ohne Whisper: reiner Python-Decoder hält das GIL
+    python benchmarks/bench_stt_jitter.py --fixtures aufnahmen/ --model small --workers 2
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from audio_fixtures import load_fixtures  # noqa: E402
+from svc.scheduler.jitter import TickJitter  # noqa: E402
+from svc.stt.pool import STTPool  # noqa: E402
+from svc.stt.whisper_stt import WhisperSTT  # noqa: E402
+
+SR = 16000
+
+
+class BusySTT:
+    """Ersatz-Decoder für --simulate: Python-Schleife proportional zur Audiolänge, gibt das GIL kaum ab."""
+
+    def __init__(self, per_second: int = 2_000_000, **_: object):
+        self.per_second = per_second
+
+    def warm_up(self, sample_rate: int = SR) -> None:
+        pass
+
+    def transcribe(self, audio, cancelled=None) -> str:
+        acc = 0
+        for i in range(int(len(audio) / SR * self.per_second)):
+            acc += i & 7
+        return str(acc)
+
+
+def measure(transcribe, fixtures, period: float) -> tuple[TickJitter, float]:
+    jitter = TickJitter(period)
+    stop = threading.Event()
+
+    def tick_loop() -> None:
+        while not stop.wait(period):
+            jitter.mark()
+
+    thread = threading.Thread(target=tick_loop, daemon=True)
+    thread.start()
+    time.sleep(5 * period)
+    t0 = time.perf_counter()
+    for f in fixtures:
+        transcribe(f.audio)
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    thread.join()
+    return jitter, elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fixtures", type=Path, default=None, help="Verzeichnis mit *.wav (Standard: synthetisch)")
+    ap.add_argument("--count", type=int, default=10)
+    ap.add_argument("--model", default="base")
+    ap.add_argument("--language", default="de")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--period", type=float, default=0.15, help="Tick-Intervall (tick_loop: 0.15)")
+    ap.add_argument("--simulate", action="store_true", help="BusySTT statt faster-whisper")
+    args = ap.parse_args()
+
+    fixtures = load_fixtures(args.fixtures, args.count, SR)
+    if args.simulate:
+        factory, kwargs = BusySTT, {}
+    else:
+        factory, kwargs = WhisperSTT, {"model_size": args.model, "language": args.language}
+
+    local = factory(**kwargs)
+    local.warm_up(sample_rate=SR)
+    in_process, t_local = measure(local.transcribe, fixtures, args.period)
+
+    pool = STTPool(workers=args.workers, sample_rate=SR, max_seconds=30.0, factory=factory, **kwargs)
+    pool.start()
+    try:
+        pooled, t_pool = measure(pool.transcribe, fixtures, args.period)
+    finally:
+        pool.close()
+
+    mode = "simuliert (BusySTT)" if args.simulate else f"faster-whisper {args.model}"
+    print(f"fixtures={len(fixtures)}  {mode}  Tick alle {args.period * 1000:.0f} ms")
+    print(f"  im Prozess:     {in_process.summary()}  ({len(in_process)} Ticks, Dekodieren {t_local:.2f} s)")
+    print(f"  STTPool x{args.workers}:      {pooled.summary()}  ({len(pooled)} Ticks, Dekodieren {t_pool:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
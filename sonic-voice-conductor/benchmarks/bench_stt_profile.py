@@ -0,0 +1,60 @@
+"""Benchmark: WER und Latenz von WhisperSTT mit stt_profile default vs. command.
+
+Braucht faster-whisper. WER nur für Fixtures mit name.txt (Referenztranskript); die
+synthetischen Fixtures liefern nur Latenzen.
+
+    python benchmarks/bench_stt_profile.py --fixtures befehle/          # name.wav + name.txt
+    python benchmarks/bench_stt_profile.py --fixtures befehle/ --model small --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from audio_fixtures import load_fixtures  # noqa: E402
+from svc.stt.decoding import PROFILES  # noqa: E402
+from svc.stt.wer import word_error_rate  # noqa: E402
+from svc.stt.whisper_stt import WhisperSTT  # noqa: E402
+
+SR = 16000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fixtures", type=Path, default=None, help="Verzeichnis mit *.wav/*.txt (Standard: synthetisch)")
+    ap.add_argument("--count", type=int, default=10)
+    ap.add_argument("--model", default="base")
+    ap.add_argument("--language", default="de")
+    ap.add_argument("--repeat", type=int, default=1, help="Durchläufe je Fixture (Latenz-Median)")
+    args = ap.parse_args()
+
+    fixtures = load_fixtures(args.fixtures, args.count, SR)
+    labelled = [f for f in fixtures if f.transcript]
+    print(f"fixtures={len(fixtures)} ({len(labelled)} mit Transkript)  model={args.model}")
+    for profile in PROFILES:
+        stt = WhisperSTT(model_size=args.model, language=args.language, profile=profile)
+        stt.warm_up(sample_rate=SR)
+        latencies, pairs = [], []
+        for f in fixtures:
+            runs = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                text = stt.transcribe(f.audio)
+                runs.append(time.perf_counter() - t0)
+            latencies.append(float(np.median(runs)))
+            if f.transcript:
+                pairs.append((f.transcript, text))
+        wer = f"{word_error_rate(pairs):.1%}" if pairs else "-"
+        p50, p95 = np.percentile(latencies, 50), np.percentile(latencies, 95)
+        print(f"  {profile:<8} WER {wer:>6}  p50 {p50 * 1000:>6.0f} ms  p95 {p95 * 1000:>6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: Aufnahmedauer mit VAD-Endpointing vs. feste record_seconds über WAV-Fixtures.
+
+Die WAVs werden in 100-ms-Blöcken wie vom InputStream-Callback in den Endpointer
+gespeist; "Aufnahme" ist die Audiozeit bis zum Endpunkt (so lange blockiert record()).
+
+    python benchmarks/bench_vad.py                      # synthetische Fixtures (als WAV geschrieben)
+    python benchmarks/bench_vad.py --fixtures aufnahmen/ --record-seconds 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from audio_fixtures import load_fixtures, write_fixtures  # noqa: E402
+from svc.audio.vad import Endpointer, VADSettings  # noqa: E402
+
+SR = 16000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fixtures", type=Path, default=None, help="Verzeichnis mit *.wav (Standard: synthetisch)")
+    ap.add_argument("--count", type=int, default=20)
+    ap.add_argument("--record-seconds", type=float, default=3.0)
+    ap.add_argument("--silence-ms", type=int, default=400)
+    ap.add_argument("--threshold-db", type=float, default=-40.0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.fixtures
+        if directory is None:
+            directory = Path(tmp)
+            synth = load_fixtures(None, args.count, SR)
+            write_fixtures(directory, synth, SR)
+            truth = {f.name: f.speech for f in synth}
+        else:
+            truth = {}
+        fixtures = load_fixtures(directory, sample_rate=SR)
+
+    settings = VADSettings(silence_ms=args.silence_ms, threshold_db=args.threshold_db)
+    block = SR // 10
+    captured, cpu, overshoot, clipped, empty = [], [], [], 0, 0
+    for f in fixtures:
+        ep = Endpointer(settings, SR, max_seconds=args.record_seconds)
+        t0 = time.perf_counter()
+        for i in range(0, len(f.audio), block):
+            if ep.feed(f.audio[i : i + block]):
+                break
+        cpu.append(time.perf_counter() - t0)
+        captured.append(ep.samples / SR)
+        start, end = ep.voiced_span()
+        if end == 0:
+            empty += 1
+        speech = truth.get(f.name)
+        if speech is not None:
+            overshoot.append((ep.samples - speech[1]) / SR)
+            clipped += start > speech[0] or end < speech[1]
+
+    fixed = args.record_seconds
+    p50, p95 = np.percentile(captured, 50), np.percentile(captured, 95)
+    print(f"fixtures={len(fixtures)}  silence_ms={args.silence_ms}  threshold={args.threshold_db} dBFS")
+    print(f"  fest:  {fixed * 1000:>6.0f} ms je Aufnahme")
+    print(f"  VAD:   p50 {p50 * 1000:>6.0f} ms  p95 {p95 * 1000:>6.0f} ms  "
+          f"(gespart p50 {(fixed - p50) * 1000:.0f} ms)")
+    print(f"  VAD-Rechenzeit je Aufnahme: {np.mean(cpu) * 1000:.2f} ms")
+    if overshoot:
+        print(f"  Endpunkt nach Sprachende: p50 {np.median(overshoot) * 1000:.0f} ms, "
+              f"Sprache abgeschnitten: {clipped}/{len(overshoot)}")
+    print(f"  ohne erkannte Sprache: {empty}/{len(fixtures)}")
+
+
+if __name__ == "__main__":
+    main()
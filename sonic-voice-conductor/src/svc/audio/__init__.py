@@ -1,5 +1,8 @@
 """Audio-Aufnahme für Voice-Input."""
 from .recorder import Recorder
 from .devices import resolve_device, list_devices
+from .preprocess import Preprocessor, preprocess
+from .ring import RingBuffer
+from .vad import Endpointer, VADSettings
 
-__all__ = ["Recorder", "resolve_device", "list_devices"]
+__all__ = ["Recorder", "resolve_device", "list_devices", "Endpointer", "VADSettings", "RingBuffer", "Preprocessor", "preprocess"]
@@ -1,10 +1,11 @@
 """Mikrofon-Device-Auflösung und Auflistung."""
-import sounddevice as sd
 
 
 def list_devices() -> list[dict]:
     """Gibt alle verfügbaren Audiogeräte zurück (sounddevice query_devices)."""
     try:
+        import sounddevice as sd
+
         devices = sd.query_devices()
         result = []
         for i, d in enumerate(devices):
@@ -28,6 +29,8 @@ def resolve_device(mic_device: str | int | None) -> int | None:
         return None
     if isinstance(mic_device, int):
         return mic_device
+    import sounddevice as sd
+
     devices = sd.query_devices()
     s = str(mic_device).lower()
     for i, d in enumerate(devices):
@@ -0,0 +1,73 @@
+"""Vorverarbeitung zwischen Recorder und Whisper: Stille kappen, DC entfernen, Spitzenpegel normalisieren."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .vad import VADSettings, voiced_frames
+
+
+@dataclass
+class PreprocessResult:
+    audio: np.ndarray  # View in den übergebenen Puffer, leer wenn nichts stimmhaft war
+    bytes_saved: int
+    ms_saved: float  # Audiodauer, die Whisper nicht mehr dekodieren muss
+
+    @property
+    def voiced(self) -> bool:
+        return self.audio.size > 0
+
+
+def preprocess(
+    audio: np.ndarray, settings: VADSettings, sample_rate: int = 16000, target_peak: float = 0.9
+) -> PreprocessResult:
+    """
+    Alles vektorisiert und in place auf `audio` (float32, beschreibbar): DC-Offset
+    abziehen, Stille vor/nach dem ersten/letzten stimmhaften Frame abschneiden (pad_ms
+    bleibt stehen), den Rest auf target_peak skalieren. `audio` muss dem Aufrufer
+    gehören – nie eine Ring-View des Recorders übergeben (dafür kopiert Preprocessor).
+    Weniger als min_speech_ms stimmhafte Frames gelten als "nichts erkannt".
+    """
+    n = len(audio)
+    if n:
+        audio -= audio.mean()  # float32, paarweise summiert: kein Cast-Puffer
+    voiced = np.flatnonzero(voiced_frames(audio, settings, sample_rate))
+    if voiced.size < max(1, settings.min_speech_ms // settings.frame_ms):
+        return PreprocessResult(audio[:0], audio.nbytes, n * 1000 / sample_rate)
+    frame = sample_rate * settings.frame_ms // 1000
+    pad = sample_rate * settings.pad_ms // 1000
+    out = audio[max(0, voiced[0] * frame - pad) : min(n, (voiced[-1] + 1) * frame + pad)]
+    peak = max(float(out.max()), -float(out.min()))  # ohne np.abs-Temporärarray
+    if peak > 0:
+        out *= target_peak / peak
+    return PreprocessResult(out, audio.nbytes - out.nbytes, (n - len(out)) * 1000 / sample_rate)
+
+
+class Preprocessor:
+    """
+    preprocess() mit festen Einstellungen und Zählern für die TUI. Die Eingabe (z.B. eine
+    View in den gespiegelten Ring des Recorders) bleibt unverändert: sie wird in einen
+    eigenen, wiederverwendeten Scratch-Puffer kopiert und dort in place bearbeitet. Das
+    Ergebnis ist eine View darauf und gilt bis zum nächsten Aufruf (ein Aufrufer zur Zeit).
+    """
+
+    def __init__(self, settings: VADSettings, sample_rate: int = 16000, target_peak: float = 0.9):
+        self.settings = settings
+        self.sample_rate = sample_rate
+        self.target_peak = target_peak
+        self.last: PreprocessResult | None = None
+        self.utterances = 0  # Aufrufe: mit stt_streaming jedes Dekodierfenster
+        self.skipped = 0  # ohne stimmhaften Anteil: Whisper gar nicht aufgerufen
+        self._scratch = np.empty(0, dtype=np.float32)
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        n = len(audio)
+        if self._scratch.size < n:
+            self._scratch = np.empty(max(n, 2 * self._scratch.size), dtype=np.float32)
+        buf = self._scratch[:n]
+        buf[...] = audio  # eine Kopie je Äußerung, keine Allokation im Normalfall
+        self.last = preprocess(buf, self.settings, self.sample_rate, self.target_peak)
+        self.utterances += 1
+        self.skipped += not self.last.voiced
+        return self.last.audio
@@ -1,23 +1,96 @@
 """Mikrofon-Aufnahme mit sounddevice."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Callable
+
 import numpy as np
-import sounddevice as sd
+
+from .ring import RingBuffer
+from .vad import Endpointer, VADSettings
 
 
 class Recorder:
-    """Push-to-talk Aufnahme: record() liefert Audio-Array."""
+    """
+    Push-to-talk Aufnahme: record() liefert Audio-Array.
+    Mit `vad` wird über einen Callback-InputStream gestreamt und beendet, sobald nach
+    der Sprache genug Stille kam (höchstens vad_max_seconds); geliefert wird nur der
+    stimmhafte Teil. Ohne `vad` feste record_seconds wie bisher.
+    persistent: ein einziger InputStream (start()/stop()) schreibt dauerhaft in einen
+    RingBuffer; record() beginnt preroll_ms vor dem Aufruf und liefert read-only Views in den
+    Ring statt neuer Arrays (gültig, bis ring_seconds weiteres Audio geschrieben ist).
+    """
 
     def __init__(
         self,
         sample_rate: int = 16000,
         record_seconds: float = 3.0,
         device: int | None = None,
+        vad: VADSettings | None = None,
+        vad_max_seconds: float = 6.0,
+        persistent: bool = False,
+        preroll_ms: int = 300,
+        ring_seconds: float = 30.0,
     ):
         self.sample_rate = sample_rate
         self.record_seconds = record_seconds
         self.device = device
+        self.vad = vad
+        self.vad_max_seconds = vad_max_seconds
+        self.preroll = sample_rate * preroll_ms // 1000
+        self.ring = RingBuffer(int(ring_seconds * sample_rate)) if persistent else None
+        self._stream = None
+        self._data = threading.Event()
+        self.last_duration = 0.0  # Sekunden, die die letzte Aufnahme blockiert hat
+        self.overflows = 0  # PortAudio input_overflow
+        self.last_endpointer: Endpointer | None = None
+
+    def start(self) -> None:
+        """Öffnet den dauerhaften InputStream (nur persistent; mehrfacher Aufruf ist harmlos)."""
+        if self.ring is None or self._stream is not None:
+            return
+        import sounddevice as sd
+
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            device=self.device,
+            blocksize=self.sample_rate // 50,  # 20 ms
+            callback=self._callback,
+        )
+        self._stream.start()
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def _callback(self, indata, frames, time_info, status) -> None:
+        if status.input_overflow:
+            self.overflows += 1
+        self.push(indata[:, 0])
 
-    def record(self) -> np.ndarray:
-        """Aufnahme durchführen. Mono, float32, normalisiert -1..1."""
+    def push(self, block: np.ndarray) -> None:
+        """Audio in den Ring schreiben (vom Stream-Callback, oder aus Dateien/Tests)."""
+        self.ring.write(block)
+        self._data.set()
+
+    def record(self, on_block: Callable[[np.ndarray, Endpointer], None] | None = None) -> np.ndarray:
+        """
+        Aufnahme durchführen. Mono, float32, normalisiert -1..1.
+        on_block (nur mit VAD): bekommt jeden Block samt Endpointer-Zustand, z.B. für Streaming-STT.
+        """
+        if self.ring is not None:
+            return self._record_ring(on_block)
+        if self.vad is not None:
+            return self.record_until_silence(on_block)
+        import sounddevice as sd
+
+        t0 = time.perf_counter()
         samples = int(self.sample_rate * self.record_seconds)
         recording = sd.rec(
             frames=samples,
@@ -27,4 +100,77 @@ class Recorder:
             device=self.device,
         )
         sd.wait()
+        self.last_duration = time.perf_counter() - t0
         return recording.flatten()
+
+    def record_until_silence(self, on_block: Callable[[np.ndarray, Endpointer], None] | None = None) -> np.ndarray:
+        """Streamt bis zum Endpunkt der VAD; leer, wenn keine Sprache kam."""
+        import sounddevice as sd
+
+        blocks: queue.Queue[np.ndarray] = queue.Queue()
+        endpointer = Endpointer(self.vad or VADSettings(), self.sample_rate, self.vad_max_seconds)
+
+        def callback(indata, frames, time_info, status) -> None:
+            if status.input_overflow:
+                self.overflows += 1
+            blocks.put(indata[:, 0].copy())  # indata gehört PortAudio und wird wiederverwendet
+
+        t0 = time.perf_counter()
+        chunks: list[np.ndarray] = []
+        with sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            device=self.device,
+            blocksize=endpointer.frame * 5,  # 100 ms bei 20-ms-Frames
+            callback=callback,
+        ):
+            while True:
+                block = blocks.get()
+                chunks.append(block)
+                done = endpointer.feed(block)
+                if on_block is not None:
+                    on_block(block, endpointer)
+                if done:
+                    break
+        self.last_duration = time.perf_counter() - t0
+        self.last_endpointer = endpointer
+        start, end = endpointer.voiced_span()
+        return np.concatenate(chunks)[start:end]
+
+    def _wait_past(self, pos: int) -> int:
+        """Blockiert, bis der Ring über `pos` hinaus geschrieben ist; liefert den Stand."""
+        while self.ring.written <= pos:
+            self._data.clear()
+            if self.ring.written > pos:
+                break
+            if not self._data.wait(timeout=2.0):
+                raise RuntimeError("Keine Audiodaten vom Mikrofon (Stream gestartet?)")
+        return self.ring.written
+
+    def _record_ring(self, on_block: Callable[[np.ndarray, Endpointer], None] | None) -> np.ndarray:
+        ring = self.ring
+        t0 = time.perf_counter()
+        mark = max(ring.oldest(), ring.written - self.preroll)  # Pre-Roll: Audio vor dem Tastendruck
+        if self.vad is None:
+            end = mark + int(self.sample_rate * self.record_seconds)
+            while self._wait_past(end - 1) < end:
+                pass
+            self.last_duration = time.perf_counter() - t0
+            return ring.view(mark, end)
+        endpointer = Endpointer(self.vad, self.sample_rate, self.vad_max_seconds)
+        step = endpointer.frame * 5  # in 100-ms-Happen lesen: ~10 Wakeups/s auch beim Dauerzuhören
+        pos = mark
+        while True:
+            written = self._wait_past(pos + step - 1)
+            block = ring.view(pos, written)
+            pos = written
+            done = endpointer.feed(block)
+            if on_block is not None:
+                on_block(block, endpointer)
+            if done:
+                break
+        self.last_duration = time.perf_counter() - t0
+        self.last_endpointer = endpointer
+        start, end = endpointer.voiced_span()
+        return ring.view(mark + start, mark + end)
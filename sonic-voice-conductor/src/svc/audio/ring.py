@@ -0,0 +1,58 @@
+"""Vorallozierter Ringpuffer für den dauerhaft offenen Mikrofon-Stream."""
+from __future__ import annotations
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fester float32-Ring über absolute Sample-Positionen (`written` zählt alles je
+    Geschriebene). Gespiegelt angelegt (2 x capacity, jedes Sample steht an i und
+    i + capacity): jedes Fenster bis capacity Samples ist zusammenhängend und
+    view() liefert es ohne Kopie. Ein View gilt, bis der Schreiber capacity Samples
+    weiter ist. Ein Schreiber (Audio-Callback), beliebig viele Leser.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.zeros(2 * capacity, dtype=np.float32)
+        self.written = 0
+        self.overruns = 0  # Leser war mehr als capacity zurück, Audio verloren
+
+    @property
+    def nbytes(self) -> int:
+        return self._buf.nbytes
+
+    def write(self, block: np.ndarray) -> None:
+        """Schreibt einen Block (höchstens zwei Slices je Hälfte, keine Allokation)."""
+        cap = self.capacity
+        n = len(block)
+        if n > cap:
+            self.written += n - cap
+            block, n = block[-cap:], cap
+        i = self.written % cap
+        first = min(n, cap - i)
+        self._buf[i : i + first] = block[:first]
+        self._buf[cap + i : cap + i + first] = block[:first]
+        rest = n - first
+        if rest:
+            self._buf[:rest] = block[first:]
+            self._buf[cap : cap + rest] = block[first:]
+        self.written += n  # erst nach den Daten sichtbar machen
+
+    def oldest(self) -> int:
+        """Älteste noch vorhandene absolute Position."""
+        return max(0, self.written - self.capacity)
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Read-only Zero-Copy-View auf [start, end). Zu alte Starts werden gekappt und als Overrun gezählt."""
+        end = min(end, self.written)
+        if start < self.oldest():
+            self.overruns += 1
+            start = self.oldest()
+        if end <= start:
+            return self._buf[:0]
+        s = start % self.capacity
+        out = self._buf[s : s + (end - start)]
+        out.flags.writeable = False  # Schreiben in eine Hälfte würde die Spiegelung zerstören
+        return out
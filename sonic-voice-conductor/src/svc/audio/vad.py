@@ -0,0 +1,116 @@
+"""Energie/Zero-Crossing-VAD und Endpointing für gestreamte Aufnahmen."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class VADSettings:
+    """Schwellen der Frame-VAD (siehe Config vad_*)."""
+
+    frame_ms: int = 20
+    threshold_db: float = -40.0  # RMS eines Frames in dBFS, ab dem er als Sprache zählt
+    zcr_max: float = 0.35  # Anteil Vorzeichenwechsel; darüber ist es Rauschen/Zischen
+    silence_ms: int = 400  # so viel Stille nach der Sprache beendet die Aufnahme
+    min_speech_ms: int = 100  # kürzere Ausschläge (Klick, Taste) starten keine Sprache
+    pad_ms: int = 150  # Rand vor/nach der Sprache, der mitgeliefert wird
+
+
+_ZCR_CHUNK = 32  # Frames je Block der ZCR-Berechnung
+
+
+def frame_features(audio: np.ndarray, frame: int) -> tuple[np.ndarray, np.ndarray]:
+    """RMS in dBFS und Zero-Crossing-Rate je vollständigem Frame (vektorisiert, ohne Kopie)."""
+    n = len(audio) // frame
+    if n == 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+    frames = audio[: n * frame].reshape(n, frame)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame)
+    energy_db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+    zcr = np.empty(n, dtype=np.float32)
+    for i in range(0, n, _ZCR_CHUNK):  # Bool-Zwischenarrays klein halten, auch bei langen Puffern
+        signs = np.signbit(frames[i : i + _ZCR_CHUNK])
+        crossings = (signs[:, 1:] != signs[:, :-1]).sum(axis=1, dtype=np.uint16)  # count_nonzero legt intp-Kopie an
+        zcr[i : i + _ZCR_CHUNK] = crossings / (frame - 1)
+    return energy_db.astype(np.float32), zcr
+
+
+def voiced_frames(audio: np.ndarray, settings: VADSettings, sample_rate: int) -> np.ndarray:
+    """Bool je Frame: laut genug und nicht rauschartig."""
+    frame = sample_rate * settings.frame_ms // 1000
+    energy_db, zcr = frame_features(audio, frame)
+    return (energy_db >= settings.threshold_db) & (zcr <= settings.zcr_max)
+
+
+class Endpointer:
+    """
+    Blockweise gefütterte VAD: feed() liefert True, sobald nach mindestens
+    min_speech_ms Sprache silence_ms Stille folgten oder max_seconds erreicht sind.
+    Blöcke beliebiger Länge; angefangene Frames werden bis zum nächsten Block gepuffert.
+    """
+
+    def __init__(self, settings: VADSettings, sample_rate: int = 16000, max_seconds: float = 6.0):
+        self.settings = settings
+        self.sample_rate = sample_rate
+        self.frame = sample_rate * settings.frame_ms // 1000
+        self.max_samples = int(max_seconds * sample_rate)
+        self._silence_frames = max(1, settings.silence_ms // settings.frame_ms)
+        self._min_speech_frames = max(1, settings.min_speech_ms // settings.frame_ms)
+        self._rest = np.empty(0, dtype=np.float32)
+        self.samples = 0  # insgesamt gefüttert
+        self._frames = 0  # ausgewertete Frames
+        self._run = 0  # aktuelle Folge stimmhafter Frames
+        self.speech_start: int | None = None  # erster Frame der ersten ausreichend langen Sprachfolge
+        self.speech_end = 0  # Frame nach dem letzten stimmhaften Frame
+        self.done = False
+
+    def feed(self, block: np.ndarray) -> bool:
+        if self.done:
+            return True
+        self.samples += len(block)
+        audio = np.concatenate((self._rest, block)) if len(self._rest) else block
+        n = len(audio) // self.frame
+        self._rest = np.array(audio[n * self.frame :], dtype=np.float32)
+        voiced = voiced_frames(audio[: n * self.frame], self.settings, self.sample_rate)
+        for i, v in enumerate(voiced):
+            idx = self._frames + i
+            if v:
+                self._run += 1
+                if self.speech_start is None and self._run >= self._min_speech_frames:
+                    self.speech_start = idx - self._run + 1
+                if self.speech_start is not None:
+                    self.speech_end = idx + 1
+            else:
+                self._run = 0
+                if self.speech_start is not None and idx + 1 - self.speech_end >= self._silence_frames:
+                    self.done = True
+                    break
+        self._frames += n
+        if self.samples >= self.max_samples:
+            self.done = True
+        return self.done
+
+    @property
+    def heard_speech(self) -> bool:
+        return self.speech_start is not None
+
+    @property
+    def speaking(self) -> bool:
+        """Letzter Frame war stimmhaft (False = Pause oder Ende)."""
+        return self.speech_start is not None and self._run > 0
+
+    @property
+    def speech_end_sample(self) -> int:
+        """Ende der bisher erkannten Sprache in Samples (ohne pad_ms)."""
+        return self.speech_end * self.frame
+
+    def voiced_span(self) -> tuple[int, int]:
+        """(start, end) in Samples inkl. pad_ms; (0, 0) wenn keine Sprache erkannt wurde."""
+        if self.speech_start is None:
+            return 0, 0
+        pad = self.sample_rate * self.settings.pad_ms // 1000
+        start = max(0, self.speech_start * self.frame - pad)
+        end = min(self.samples, self.speech_end * self.frame + pad)
+        return start, end
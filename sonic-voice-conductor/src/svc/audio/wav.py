@@ -0,0 +1,30 @@
+"""WAV lesen/schreiben (16-bit PCM) ohne zusätzliche Abhängigkeiten."""
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+
+def read_wav(path: Path, sample_rate: int = 16000) -> np.ndarray:
+    """Mono float32 -1..1, bei abweichender Rate linear auf sample_rate umgerechnet."""
+    with wave.open(str(path), "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: nur 16-bit PCM wird unterstützt")
+        rate, channels = w.getframerate(), w.getnchannels()
+        pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+    audio = pcm.reshape(-1, channels).mean(axis=1).astype(np.float32) / 32768.0
+    if rate != sample_rate and len(audio):
+        n = int(round(len(audio) * sample_rate / rate))
+        audio = np.interp(np.linspace(0, len(audio) - 1, n), np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def write_wav(path: Path, audio: np.ndarray, sample_rate: int = 16000) -> None:
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
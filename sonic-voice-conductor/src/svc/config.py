@@ -22,15 +22,78 @@ class Config(BaseSettings):
     ollama_base_url: str = Field(default="http://127.0.0.1:11434", description="Ollama API URL")
     llm_model: str = Field(default="llama3.2", description="LLM Modell für Intent-Parsing")
     embed_model: str = Field(default="nomic-embed-text", description="Embedding Modell")
+    embed_cache_size: int = Field(default=512, ge=0, description="Embedding-Cache Einträge im Speicher (0 = aus)")
+    embed_cache_max_rows: int = Field(default=20000, ge=0, description="Embedding-Cache Zeilen in der DB")
+    ollama_async: bool = Field(default=True, description="Live-Betrieb: asyncio-Client mit Pool, Deadlines, Circuit Breaker")
+    ollama_deadline: float = Field(default=15.0, gt=0, description="Deadline je LLM-Call in Sekunden")
+    ollama_embed_deadline: float = Field(default=3.0, gt=0, description="Deadline je Embedding-Call in Sekunden")
+    ollama_max_concurrency: int = Field(default=2, ge=1, description="Gleichzeitige Ollama-Requests")
+    ollama_breaker_failures: int = Field(default=3, ge=1, description="Fehler/Timeouts in Folge bis der Breaker öffnet")
+    ollama_breaker_reset: float = Field(default=30.0, gt=0, description="Sekunden bis zum Probe-Call nach dem Öffnen")
+    llm_cache_max_rows: int = Field(default=5000, ge=0, description="Persistenter LLM-Antwort-Cache, Zeilen (0 = aus)")
+    llm_cache_ttl_days: float = Field(default=30.0, gt=0, description="Gültigkeit gecachter LLM-Antworten in Tagen")
+    llm_session: bool = Field(default=True, description="System-Prompt primen und Ollama-context wiederverwenden")
+    llm_keep_alive: str = Field(default="30m", description="Ollama keep_alive für LLM und Embeddings")
+    warmup: bool = Field(default=True, description="Modelle beim Start im Hintergrund laden und anwärmen")
+    keepalive_interval: float = Field(default=300.0, ge=0, description="Sekunden zwischen Keep-alive-Pings (0 = aus)")
+    llm_schema: bool = Field(default=True, description="LLM-Antwort per JSON-Schema (Ollama format) erzwingen")
+    llm_stream: bool = Field(default=True, description="LLM streamen, nach dem ersten JSON-Objekt abbrechen")
+    llm_speculative: bool = Field(default=False, description="LLM parallel zur kNN-Suche starten, bei kNN-Treffer abbrechen")
+
+    # kNN
+    knn_index: str = Field(default="exact", description="kNN-Index: exact | intent (exakt, zweistufig) | ivf")
+    knn_nprobe: int = Field(default=8, ge=1, description="IVF: gescannte Listen (höher = Recall, niedriger = Latenz)")
+    knn_ann_min_examples: int = Field(default=5000, ge=1, description="IVF erst ab so vielen Examples")
+    knn_storage: str = Field(default="sqlite", description="Embedding-Speicher: sqlite (BLOB) | mmap (Vektordatei)")
+    knn_dtype: str = Field(
+        default="float32",
+        pattern="^(float32|float16|int8)$",
+        description="Residente Matrix: float32 | float16 (halber Speicher, aber langsam) | int8",
+    )
+    knn_rerank: int = Field(default=4, ge=1, description="float16/int8: k * rerank Kandidaten exakt nachrechnen")
+    compact_threshold: float = Field(default=0.97, ge=0.0, le=1.0, description="Cosine ab der Examples als Duplikat gelten")
+    compact_idle_minutes: float = Field(default=0.0, ge=0, description="Im Leerlauf kompaktieren nach so vielen Minuten (0 = aus)")
+
+    # Grammatik-Fastpath vor kNN/LLM
+    grammar_enabled: bool = Field(default=True, description="Reguläre Befehle ohne Embedding/LLM erkennen")
+
+    # Parse-Cache
+    intent_cache_size: int = Field(default=256, ge=0, description="Gecachte Phrasen (0 = aus)")
+    intent_cache_ttl: float = Field(default=900.0, gt=0, description="Lebensdauer eines Cache-Eintrags in Sekunden")
 
     # Whisper
     whisper_model_size: str = Field(default="base", description="faster-whisper Modellgröße")
+    stt_profile: str = Field(default="default", description="Whisper-Dekodierung: default | command (greedy, Befehlsvokabular)")
+    stt_workers: int = Field(default=0, ge=0, description="Whisper in N eigenen Prozessen (0 = im TUI-Prozess)")
     language: str = Field(default="de", description="Sprache für STT")
 
     # Audio
     record_seconds: float = Field(default=3.0, description="Aufnahmedauer für Voice-Input")
     sample_rate: int = Field(default=16000, description="Sample-Rate für Aufnahme")
     mic_device: str | int | None = Field(default=None, description="Mikrofon-Index oder Substring")
+    audio_persistent: bool = Field(default=True, description="Mikrofon-Stream dauerhaft offen, Ringpuffer mit Pre-Roll")
+    preroll_ms: int = Field(default=300, ge=0, description="Audio vor dem Tastendruck, das mit aufgenommen wird")
+    ring_seconds: float = Field(default=30.0, gt=0, description="Größe des Ringpuffers in Sekunden")
+
+    # Endpointing (VAD): Aufnahme endet nach der Sprache statt nach record_seconds
+    vad_enabled: bool = Field(default=True, description="Aufnahme per VAD beenden statt feste Dauer")
+    vad_threshold_db: float = Field(default=-40.0, le=0.0, description="Frame-RMS in dBFS ab dem Sprache zählt")
+    vad_zcr_max: float = Field(default=0.35, gt=0.0, le=1.0, description="Max. Zero-Crossing-Rate eines Sprach-Frames")
+    vad_silence_ms: int = Field(default=400, ge=20, description="Stille nach der Sprache bis zum Ende der Aufnahme")
+    vad_min_speech_ms: int = Field(default=100, ge=20, description="Kürzere Ausschläge zählen nicht als Sprache")
+    vad_pad_ms: int = Field(default=150, ge=0, description="Rand vor/nach der Sprache")
+    stt_preprocess: bool = Field(default=True, description="Vor Whisper: Stille kappen, DC entfernen, normalisieren")
+    preprocess_peak: float = Field(default=0.9, gt=0.0, le=1.0, description="Zielpegel der Spitzen-Normalisierung")
+    stt_streaming: bool = Field(default=True, description="Während der Aufnahme dekodieren, Teil-Hypothesen zeigen (braucht VAD)")
+    stt_stream_step: float = Field(default=0.6, gt=0, description="Sekunden neues Audio je Teil-Dekodierung")
+    vad_max_seconds: float = Field(default=6.0, gt=0, description="Obergrenze der Aufnahme mit VAD")
+
+    # Freihand-Modus
+    listen_mode: bool = Field(default=False, description="Dauerhaft zuhören, Wake-Word statt Enter (braucht audio_persistent + VAD)")
+    wake_word: str = Field(default="Dirigent", min_length=1, description="Wake-Word am Satzanfang")
+    wake_model_size: str = Field(default="tiny", description="Whisper-Modell für die Wake-Word-Prüfung")
+    wake_window: float = Field(default=1.5, gt=0, description="Sekunden vom Äußerungsanfang, die das Gate dekodiert")
+    wake_follow_up: float = Field(default=4.0, ge=0, description="Nach Wake-Word allein: so lange ohne Wake-Word zuhören")
 
     # Thresholds
     knn_auto: float = Field(default=0.85, ge=0.0, le=1.0, description="Confidence >= : sofort anwenden")
@@ -2,6 +2,9 @@
 from .schema import Intent, Slots
 from .parser import IntentParser
 from .knn_store import KNNStore
+from .index import EmbeddingIndex
+from .grammar import GrammarMatcher
+from .cache import IntentCache
 from .rules import apply_context_rules, normalize_intent
 
-__all__ = ["Intent", "Slots", "IntentParser", "KNNStore", "apply_context_rules", "normalize_intent"]
+__all__ = ["Intent", "Slots", "IntentParser", "KNNStore", "EmbeddingIndex", "GrammarMatcher", "IntentCache", "apply_context_rules", "normalize_intent"]
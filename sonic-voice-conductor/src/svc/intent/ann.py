@@ -0,0 +1,152 @@
+"""IVF Approximate Nearest Neighbour (pure NumPy) für große Example-Stores."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .index import normalize_rows
+
+_CHUNK = 8192
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index des ähnlichsten Centroids je Zeile, in Chunks (Speicher begrenzt)."""
+    out = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], _CHUNK):
+        block = vectors[start : start + _CHUNK] @ centroids.T
+        out[start : start + _CHUNK] = np.argmax(block, axis=1)
+    return out
+
+
+def spherical_kmeans(vectors: np.ndarray, k: int, iters: int = 10, seed: int = 0) -> np.ndarray:
+    """k-means auf normalisierten Vektoren (Cosine). Returns normalisierte Centroids (k, dim)."""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    k = max(1, min(k, n))
+    centroids = vectors[rng.choice(n, size=k, replace=False)].copy()
+    for _ in range(iters):
+        assign = _nearest_centroid(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = np.bincount(assign, minlength=k) == 0
+        # Leere Cluster mit zufälligen Punkten neu besetzen
+        if empty.any():
+            sums[empty] = vectors[rng.choice(n, size=int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted File Index: grobe k-means-Centroids, jede Zeile der Index-Matrix
+    gehört zu genau einer Liste. Suche scannt nur die `nprobe` nächsten Listen.
+    Speichert nur Positionen; die Vektoren bleiben in der EmbeddingIndex-Matrix.
+    """
+
+    def __init__(self, centroids: np.ndarray, assign: np.ndarray):
+        self.centroids = centroids.astype(np.float32)
+        self._built_size = len(assign)
+        self._assign = np.asarray(assign, dtype=np.int32)
+        self._build_lists()
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    def __len__(self) -> int:
+        return len(self._assign)
+
+    def _build_lists(self) -> None:
+        # CSR-Layout: Positionen sortiert nach Liste + Offsets; Neuzugänge in _extra
+        self._order = np.argsort(self._assign, kind="stable").astype(np.int64)
+        counts = np.bincount(self._assign, minlength=self.n_lists)
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._extra: list[list[int]] = [[] for _ in range(self.n_lists)]
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, n_lists: int | None = None, iters: int = 10, seed: int = 0) -> "IVFIndex":
+        """Baut den Index über die (normalisierten) Zeilen von `matrix`."""
+        n = matrix.shape[0]
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        # k-means auf einer Stichprobe, danach alle Zeilen zuordnen
+        sample_size = min(n, 64 * n_lists)
+        # normalize_rows: bei int8-Codes (Vektor / Skalierung) wieder auf die Einheitskugel
+        sample = normalize_rows(matrix[np.sort(rng.choice(n, size=sample_size, replace=False))])
+        centroids = spherical_kmeans(sample, n_lists, iters=iters, seed=seed)
+        return cls(centroids, _nearest_centroid(matrix, centroids))
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Ordnet neue Zeilen (Positionen ab len(self)) ihrer nächsten Liste zu."""
+        start = len(self._assign)
+        lists = _nearest_centroid(normalize_rows(vectors), self.centroids)
+        self._assign = np.concatenate([self._assign, lists])
+        for offset, lst in enumerate(lists):
+            self._extra[int(lst)].append(start + offset)
+
+    def needs_rebuild(self) -> bool:
+        """Nach Verdopplung seit dem Build passen die Centroids nicht mehr gut."""
+        return len(self._assign) > 2 * max(self._built_size, 1)
+
+    def search(
+        self,
+        matrix: np.ndarray,
+        query: np.ndarray,
+        k: int = 3,
+        nprobe: int = 8,
+        scale: np.ndarray | None = None,
+    ) -> list[tuple[float, int]]:
+        """
+        Top-k über die `nprobe` nächsten Listen. Returns (similarity, position).
+        `scale`: Skalierung je Zeile, wenn `matrix` int8-Codes enthält.
+        """
+        if len(self._assign) == 0 or k <= 0:
+            return []
+        nprobe = max(1, min(nprobe, self.n_lists))
+        c_scores = self.centroids @ query
+        probe = np.argpartition(-c_scores, nprobe - 1)[:nprobe] if nprobe < self.n_lists else np.arange(self.n_lists)
+        parts = []
+        for lst in probe:
+            parts.append(self._order[self._offsets[lst] : self._offsets[lst + 1]])
+            if self._extra[lst]:
+                parts.append(np.asarray(self._extra[lst], dtype=np.int64))
+        cand = np.concatenate(parts)
+        if cand.size == 0:
+            return []
+        scores = matrix[cand] @ query
+        if scale is not None:
+            scores *= scale[cand]
+        if k < cand.size:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(cand.size)
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), int(cand[i])) for i in top]
+
+    def save(self, path: Path, ids: np.ndarray) -> None:
+        """Persistiert Centroids + Zuordnung (atomar via Rename)."""
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, centroids=self.centroids, assign=self._assign, ids=np.asarray(ids, dtype=np.int64))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, ids: np.ndarray, matrix: np.ndarray) -> "IVFIndex | None":
+        """
+        Lädt persistierten Index für das gespeicherte Präfix von `ids` (neuere Zeilen
+        per add() nachtragen). None wenn Datei fehlt oder nicht mehr zur DB passt.
+        """
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                centroids, assign, saved_ids = data["centroids"], data["assign"], data["ids"]
+        except (OSError, ValueError, KeyError):
+            return None
+        n = len(saved_ids)
+        if centroids.shape[1] != matrix.shape[1] or n > len(ids) or not np.array_equal(ids[:n], saved_ids):
+            return None
+        return cls(centroids, assign)
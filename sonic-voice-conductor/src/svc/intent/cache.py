@@ -0,0 +1,96 @@
+"""Parse-Cache: finale (Intent, method) je normalisierter Phrase, korrekturbewusst."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from svc.llm.embed_cache import normalize_text
+
+from .schema import Intent
+
+
+@dataclass
+class _Entry:
+    intent: Intent
+    method: str
+    query: np.ndarray | None  # normalisiertes Query-Embedding
+    threshold: float  # ab dieser Similarity zu einem neuen Example wäre das Ergebnis ein anderes
+    expires_at: float
+
+
+class IntentCache:
+    """
+    LRU + TTL über normalisierte Phrasen, nur für Auto-Ergebnisse aus kNN/LLM.
+
+    Invalidierung bei neuen Examples ist präzise: ein Eintrag fliegt, wenn das neue
+    Example das Ergebnis ändern könnte, d.h. seine Similarity zur gecachten Query die
+    Schwelle des Eintrags erreicht (kNN: bisheriger Top-1-Score; LLM: knn_suggest),
+    oder wenn es genau dieselbe Phrase ist.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 900.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, phrase: str) -> tuple[Intent, str] | None:
+        key = normalize_text(phrase)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.intent.model_copy(deep=True), entry.method
+
+    def put(self, phrase: str, intent: Intent, method: str, query: np.ndarray | None, threshold: float) -> None:
+        key = normalize_text(phrase)
+        with self._lock:
+            self._entries[key] = _Entry(
+                intent.model_copy(deep=True), method, query, threshold, time.monotonic() + self.ttl_seconds
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def on_examples_changed(self, phrases: list[str], vectors: np.ndarray | None) -> None:
+        """KNNStore-Listener: verwirft alle Einträge, die die neuen Examples ändern könnten."""
+        keys = {normalize_text(p) for p in phrases}
+        with self._lock:
+            if not phrases:
+                stale = list(self._entries)  # Löschen/Kompaktieren: alles kann sich geändert haben
+            elif vectors is None:
+                stale = [k for k in self._entries if k in keys]
+            else:
+                stale = []
+                for key, entry in self._entries.items():
+                    if key in keys or entry.query is None or entry.query.size != vectors.shape[1]:
+                        stale.append(key)
+                    elif float(np.max(vectors @ entry.query)) >= entry.threshold:
+                        stale.append(key)
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,118 @@
+"""Kompaktierung: nahezu identische Examples (gleicher Intent + Slots) zusammenführen."""
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .knn_store import KNNStore
+
+
+@dataclass
+class CompactionResult:
+    examples_before: int = 0
+    removed: int = 0
+    clusters: int = 0  # Repräsentanten, in die mindestens ein Duplikat aufgegangen ist
+    latency_before_ms: float = 0.0
+    latency_after_ms: float = 0.0
+    db_bytes_before: int = 0
+    db_bytes_after: int = 0
+
+
+def find_duplicates(store: KNNStore, threshold: float = 0.97) -> list[tuple[int, list[int]]]:
+    """
+    Gruppiert nach (intent, slots) und clustert innerhalb der Gruppe gierig: das
+    meistgenutzte (bei Gleichstand älteste) offene Example wird Repräsentant, alle
+    offenen mit Cosine >= threshold gehen darin auf. Returns [(keep_id, [drop_ids])].
+    """
+    index = store.load()
+    if index is None:
+        return []
+    usage = store.usage_counts()
+    groups: dict[tuple[str, str], list[int]] = {}
+    for pos, (intent, slots) in enumerate(zip(index.intents, index.slots)):
+        groups.setdefault((intent, json.dumps(slots, sort_keys=True)), []).append(pos)
+    ids = index.ids
+    out: list[tuple[int, list[int]]] = []
+    for positions in groups.values():
+        if len(positions) < 2:
+            continue
+        positions.sort(key=lambda p: (-usage.get(int(ids[p]), 1), int(ids[p])))
+        pos = np.asarray(positions, dtype=np.int64)
+        vecs = store.exact_vectors(positions)
+        open_ = np.arange(len(pos))
+        while open_.size > 1:
+            sims = vecs[open_] @ vecs[open_[0]]
+            member = sims >= threshold
+            member[0] = True
+            if member.sum() > 1:
+                out.append((int(ids[pos[open_[0]]]), [int(ids[p]) for p in pos[open_[member][1:]]]))
+            open_ = open_[~member]
+    return out
+
+
+def _search_p50_ms(store: KNNStore, queries: np.ndarray) -> float:
+    times = []
+    for q in queries:
+        t = time.perf_counter()
+        store.search_vector(q, k=3)
+        times.append(time.perf_counter() - t)
+    return float(np.median(times) * 1000) if times else 0.0
+
+
+def _db_bytes(store: KNNStore) -> int:
+    return store.db_path.stat().st_size if store.db_path.exists() else 0
+
+
+def compact_examples(
+    store: KNNStore,
+    threshold: float = 0.97,
+    dry_run: bool = False,
+    vacuum: bool = False,
+    sample_queries: int = 50,
+) -> CompactionResult:
+    """
+    Führt Duplikat-Cluster zusammen (usage_count des Repräsentanten = Summe), baut
+    danach den aktiven Suchindex neu (exact/intent/ivf) und misst die Suchlatenz
+    vorher/nachher mit denselben Queries (Stichprobe gespeicherter Examples).
+    """
+    result = CompactionResult(db_bytes_before=_db_bytes(store))
+    index = store.load()
+    if index is None:
+        result.db_bytes_after = result.db_bytes_before
+        return result
+    result.examples_before = len(index)
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(index), size=min(sample_queries, len(index)), replace=False)
+    queries = store.exact_vectors(sorted(int(p) for p in sample))
+    result.latency_before_ms = _search_p50_ms(store, queries)
+
+    # Stand vor dem Scan: was währenddessen eingefügt wird, zählt für das nächste auto_compact
+    with store._lock:
+        added = store.added_since_compact
+    clusters = find_duplicates(store, threshold)
+    result.clusters = len(clusters)
+    if not dry_run:
+        # Auch ohne Duplikate geprüft: auto_compact soll erst nach weiteren Inserts wieder laufen
+        with store._lock:
+            store.added_since_compact = max(0, store.added_since_compact - added)
+    if dry_run or not clusters:
+        result.removed = sum(len(drop) for _, drop in clusters)
+        result.latency_after_ms = result.latency_before_ms
+        result.db_bytes_after = result.db_bytes_before
+        return result
+
+    usage = store.usage_counts()
+    merged = {keep: usage.get(keep, 1) + sum(usage.get(d, 1) for d in drop) for keep, drop in clusters}
+    result.removed = store.merge(merged, [d for _, drop in clusters for d in drop])
+    store.load()  # Index (und IVF/Prefilter) neu aufbauen, nicht mitmessen
+    store.flush()  # IVF-Neubau läuft im Hintergrund: abwarten und persistieren
+    result.latency_after_ms = _search_p50_ms(store, queries)
+    if vacuum:
+        with sqlite3.connect(store.db_path) as conn:
+            conn.execute("VACUUM")
+    result.db_bytes_after = _db_bytes(store)
+    return result
@@ -0,0 +1,186 @@
+"""Deterministische Grammatik für reguläre Befehle: läuft vor kNN und LLM."""
+from __future__ import annotations
+
+import re
+
+from .rules import RATINGS
+from .schema import Intent
+
+_UNITS = {
+    "null": 0, "ein": 1, "eins": 1, "eine": 1, "zwei": 2, "zwo": 2, "drei": 3, "vier": 4,
+    "fünf": 5, "fuenf": 5, "sechs": 6, "sieben": 7, "acht": 8, "neun": 9,
+}
+_TEENS = {
+    "zehn": 10, "elf": 11, "zwölf": 12, "zwoelf": 12, "dreizehn": 13, "vierzehn": 14,
+    "fünfzehn": 15, "fuenfzehn": 15, "sechzehn": 16, "siebzehn": 17, "achtzehn": 18, "neunzehn": 19,
+}
+_TENS = {
+    "zwanzig": 20, "dreissig": 30, "vierzig": 40, "fünfzig": 50, "fuenfzig": 50,
+    "sechzig": 60, "siebzig": 70, "achtzig": 80, "neunzig": 90,
+}
+
+
+def _below_100(word: str) -> int | None:
+    if word in _UNITS:
+        return _UNITS[word]
+    if word in _TEENS:
+        return _TEENS[word]
+    if word in _TENS:
+        return _TENS[word]
+    if "und" in word:
+        unit, tens = word.split("und", 1)
+        if unit in _UNITS and _UNITS[unit] > 0 and tens in _TENS:
+            return _UNITS[unit] + _TENS[tens]
+    return None
+
+
+def parse_number_word(word: str) -> int | None:
+    """Deutsches Zahlwort bis 999 ("hundertachtundzwanzig" -> 128), sonst None."""
+    word = word.replace("ß", "ss")
+    if "hundert" in word:
+        pre, post = word.split("hundert", 1)
+        hundreds = 1 if pre in ("", "ein", "eins") else _UNITS.get(pre)
+        rest = _below_100(post) if post else 0
+        if hundreds is None or rest is None:
+            return None
+        return hundreds * 100 + rest
+    return _below_100(word)
+
+
+def _numberize(text: str) -> str:
+    """Zahlwörter -> Ziffern, "null komma acht" / "0,8" -> "0.8"."""
+    tokens = []
+    for tok in text.split():
+        n = parse_number_word(tok)
+        tokens.append(str(n) if n is not None else tok)
+    out: list[str] = []
+    i = 0
+    while i < len(tokens):
+        # "<int> komma <ziffer> [<ziffer>]" zu Dezimalzahl zusammenziehen
+        if tokens[i] == "komma" and out and out[-1].isdigit() and i + 1 < len(tokens) and tokens[i + 1].isdigit():
+            digits = tokens[i + 1]
+            i += 2
+            while i < len(tokens) and len(tokens[i]) == 1 and tokens[i].isdigit():
+                digits += tokens[i]
+                i += 1
+            out[-1] = f"{out[-1]}.{digits}"
+            continue
+        out.append(tokens[i])
+        i += 1
+    return re.sub(r"(\d),(\d)", r"\1.\2", " ".join(out))
+
+
+def _normalize(phrase: str) -> str:
+    t = phrase.strip().lower().replace("ß", "ss")
+    t = re.sub(r"(?<!\d)[.,]|[.,](?!\d)|[!?;:\"']", " ", t)
+    return re.sub(r"\s+", " ", t).strip()
+
+
+_NUM = r"(\d+(?:\.\d+)?)"
+_PARAMS = {
+    "SET_ENERGY": r"energie|energy",
+    "SET_DARKNESS": r"dunkelheit|darkness",
+    "SET_HATS": r"hats|hihats|hi hats",
+}
+_BARS = r"(?:\s+(?:takte?n?|bars?))?"
+
+_RE_BPM = re.compile(rf"^(?:(?:bpm|tempo)\s+{_NUM}|{_NUM}\s*bpm)$")
+_RE_PARAM = {
+    name: re.compile(rf"^(?:{words})\s+(?:auf\s+)?{_NUM}(\s*prozent|\s*%)?$") for name, words in _PARAMS.items()
+}
+_RE_KICK = re.compile(r"^kick\s+(an|on|1|aus|off|0)$")  # "ein" ist nach _numberize "1"
+_RE_BREAK = re.compile(rf"^break(?:\s+(?:für\s+|fuer\s+)?{_NUM}{_BARS})?$")
+_RE_SCHEDULE = re.compile(rf"^in\s+{_NUM}{_BARS}\s+(break|drop)$")
+_RE_PROFILE = re.compile(r"^(?:profil|profile)\s+(\w+)$")
+_RE_MACRO = re.compile(r"^(?:makro|macro)\s+(.+)$")
+_KEYWORDS = {
+    "drop": "DROP",
+    "undo": "UNDO", "rückgängig": "UNDO", "rueckgaengig": "UNDO",
+    "save": "SAVE", "speichern": "SAVE",
+    "reset": "RESET",
+    "hold": "HOLD", "halten": "HOLD",
+}
+
+def normalize_command(phrase: str) -> str:
+    """Kleinschreibung, ohne Satzzeichen, Zahlwörter als Ziffern (auch für WER-Vergleiche)."""
+    return _numberize(_normalize(phrase))
+
+
+def vocabulary() -> list[str]:
+    """Schlüsselwörter der Befehlsgrammatik (ohne Zahlen, Profil- und Makronamen)."""
+    words = ["bpm", "tempo", "energie", "dunkelheit", "hats", "prozent", "kick", "an", "aus",
+             "break", "takte", "in", "profil", "makro"]
+    words += [w for w in _KEYWORDS if "ue" not in w]  # ASCII-Umschrift ("rueckgaengig") schreibt Whisper nicht
+    words += list(RATINGS)
+    return list(dict.fromkeys(words))
+
+
+class GrammarMatcher:
+    """
+    Vorkompilierte Regeln für vollständig reguläre Befehle ("bpm 128", "break 16 takte",
+    "kick aus", "profil warmup", "energie 0.8"). Relative Befehle ("energie hoch")
+    bleiben bewusst kNN/LLM überlassen, damit gelernte Korrekturen greifen.
+    """
+
+    def __init__(self) -> None:
+        from svc.macros.registry import get_macro
+        from svc.profiles.profiles import get_profile
+
+        self._get_macro = get_macro
+        self._get_profile = get_profile
+        self.hits = 0
+        self.misses = 0
+
+    def match(self, phrase: str) -> Intent | None:
+        """Returns Intent (confidence 1.0) oder None, wenn keine Regel passt."""
+        intent = self._match(_numberize(_normalize(phrase)))
+        if intent is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return intent
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _match(self, text: str) -> Intent | None:
+        if not text:
+            return None
+        if text in _KEYWORDS:
+            return Intent(intent=_KEYWORDS[text], slots={}, confidence=1.0)
+        if text in RATINGS:
+            return Intent(intent="RATE", slots={"rating": text}, confidence=1.0)
+        if m := _RE_BPM.match(text):
+            return Intent(intent="SET_BPM", slots={"value": float(m.group(1) or m.group(2))}, confidence=1.0)
+        for name, rx in _RE_PARAM.items():
+            if m := rx.match(text):
+                value = float(m.group(1))
+                if m.group(2):
+                    if "." in m.group(1):
+                        return None  # "0.8 prozent": 0.8 oder 0.008 gemeint? kNN/LLM entscheiden
+                    value /= 100
+                if not 0.0 <= value <= 1.0:
+                    return None
+                return Intent(intent=name, slots={"value": value}, confidence=1.0)
+        if m := _RE_KICK.match(text):
+            value = 0 if m.group(1) in ("aus", "off", "0") else 1
+            return Intent(intent="KICK_ON", slots={"value": value}, confidence=1.0)
+        if m := _RE_BREAK.match(text):
+            slots = {"bars": int(float(m.group(1)))} if m.group(1) else {}
+            return Intent(intent="BREAK", slots=slots, confidence=1.0)
+        if m := _RE_SCHEDULE.match(text):
+            return Intent(
+                intent="SCHEDULE",
+                slots={"action": m.group(2), "bars": int(float(m.group(1)))},
+                confidence=1.0,
+            )
+        if m := _RE_PROFILE.match(text):
+            profile = self._get_profile(m.group(1))
+            return Intent(intent="PROFILE_SET", slots={"name": profile.name}, confidence=1.0) if profile else None
+        m = _RE_MACRO.match(text)
+        macro = self._get_macro(m.group(1) if m else text)
+        if macro:
+            return Intent(intent="MACRO_RUN", slots={"name": macro.name}, confidence=1.0)
+        return None
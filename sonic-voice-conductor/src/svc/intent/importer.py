@@ -0,0 +1,112 @@
+"""Bulk-Import von Examples aus JSONL/CSV mit gebündelten Embeddings."""
+from __future__ import annotations
+
+import csv
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .knn_store import KNNStore
+from .rules import normalize_intent
+from .schema import Intent
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    skipped_existing: int = 0
+    skipped_invalid: int = 0
+
+
+def read_examples(path: Path, fmt: str | None = None) -> Iterator[tuple[str, str, dict] | None]:
+    """
+    Liest (phrase, intent, slots) aus JSONL ({"phrase", "intent", "slots"}) oder CSV
+    (Spalten phrase,intent[,slots] mit slots als JSON). Ungültige Zeilen -> None,
+    auch kaputtes JSON oder Nicht-Objekte mitten in der Datei.
+    """
+    fmt = fmt or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            rows: Iterator[dict | str] = csv.DictReader(f)
+        else:
+            rows = (line for line in f if line.strip())
+        for row in rows:
+            try:
+                if isinstance(row, str):
+                    row = json.loads(row)
+                if not isinstance(row, dict):
+                    raise TypeError(f"Zeile ist kein Objekt: {row!r}")
+                slots = row.get("slots") or {}
+                if isinstance(slots, str):
+                    slots = json.loads(slots)
+                phrase = str(row["phrase"]).strip()
+                intent = normalize_intent(Intent(intent=str(row["intent"]), slots=slots))
+            except (KeyError, ValueError, TypeError):
+                yield None
+                continue
+            if not phrase or intent.intent == "UNKNOWN":
+                yield None
+                continue
+            yield phrase, intent.intent, intent.slots_dict()
+
+
+def _example_key(phrase: str, intent: str, slots: dict) -> tuple[str, str, str]:
+    return phrase, intent, json.dumps(slots, sort_keys=True)
+
+
+def _existing_keys(db_path: Path) -> set[tuple[str, str, str]]:
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT phrase, intent, slots_json FROM examples").fetchall()
+    return {_example_key(p, i, json.loads(s) if s else {}) for p, i, s in rows}
+
+
+def import_examples(
+    store: KNNStore,
+    path: Path,
+    embed_batch: Callable[[list[str]], list[list[float]]],
+    fmt: str | None = None,
+    batch_size: int = 64,
+    concurrency: int = 4,
+    progress: Callable[[int, int], None] | None = None,
+) -> ImportResult:
+    """
+    Importiert Examples. Pro Chunk (batch_size * concurrency Zeilen) laufen bis zu
+    `concurrency` Embed-Requests parallel, danach ein executemany in einer Transaktion.
+    Wiederaufnehmbar: bereits vorhandene (phrase, intent, slots) werden übersprungen,
+    ein abgebrochener Import verliert höchstens den laufenden Chunk.
+    progress(verarbeitet, gesamt) nach jedem Chunk.
+    """
+    result = ImportResult()
+    seen = _existing_keys(store.db_path)
+    todo: list[tuple[str, str, dict]] = []
+    for item in read_examples(path, fmt):
+        if item is None:
+            result.skipped_invalid += 1
+            continue
+        key = _example_key(*item)
+        if key in seen:
+            result.skipped_existing += 1
+            continue
+        seen.add(key)
+        todo.append(item)
+
+    total = len(todo)
+    chunk = batch_size * concurrency
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for start in range(0, total, chunk):
+            part = todo[start : start + chunk]
+            batches = [[p for p, _, _ in part[i : i + batch_size]] for i in range(0, len(part), batch_size)]
+            embeddings = [e for batch in pool.map(embed_batch, batches) for e in batch]
+            store.add_many(
+                [p for p, _, _ in part],
+                [i for _, i, _ in part],
+                [s for _, _, s in part],
+                embeddings,
+            )
+            result.imported += len(part)
+            if progress:
+                progress(result.imported, total)
+    return result
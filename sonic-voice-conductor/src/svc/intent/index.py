@@ -0,0 +1,196 @@
+"""Residenter Embedding-Index: normalisierte Matrix (float32/float16/int8) + parallele Metadaten."""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+DTYPES = ("float32", "float16", "int8")
+_CHUNK = 4096
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalisiert Zeilen (float32). Null-Vektoren bleiben Null."""
+    arr = np.asarray(vectors, dtype=np.float32)
+    if arr.ndim == 1:
+        arr = arr[None, :]
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return arr / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positionen der k größten Scores, absteigend (argpartition + Sortierung nur der k)."""
+    if k >= scores.size:
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class EmbeddingIndex:
+    """
+    Einmal geladener kNN-Index.
+    Hält eine zusammenhängende, vorab normalisierte Matrix (Kapazität wächst durch
+    Verdoppeln) und parallele Listen für id, intent, phrase, slots.
+    dtype "float16"/"int8" (mit Skalierung je Vektor) speichert kompakt; Scores sind
+    dann Näherungen, die der Aufrufer auf den Top-Kandidaten exakt nachrechnet.
+    Alternativ über eine fremde float32-Matrix (z.B. memmap der VectorFile), siehe from_arrays().
+    """
+
+    def __init__(self, dim: int, capacity: int = 256, dtype: str = "float32"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unbekannter dtype {dtype!r}, erlaubt: {', '.join(DTYPES)}")
+        self.dim = dim
+        self.dtype = dtype
+        self._matrix = np.zeros((max(capacity, 1), dim), dtype=np.dtype(dtype))
+        self._scale = np.ones(max(capacity, 1), dtype=np.float32) if dtype == "int8" else None
+        self._ids = np.zeros(max(capacity, 1), dtype=np.int64)
+        self._size = 0
+        self._external = False
+        self.intents: list[str] = []
+        self.phrases: list[str] = []
+        self.slots: list[dict[str, Any]] = []
+
+    @classmethod
+    def from_arrays(
+        cls,
+        matrix: np.ndarray,
+        ids: np.ndarray,
+        intents: list[str],
+        phrases: list[str],
+        slots: list[dict[str, Any]],
+    ) -> "EmbeddingIndex":
+        """Index direkt über eine bereits normalisierte float32-Matrix, ohne Kopie."""
+        index = cls.__new__(cls)
+        index.dim = matrix.shape[1]
+        index.dtype = "float32"
+        index._scale = None
+        index._external = True
+        index.intents, index.phrases, index.slots = [], [], []
+        index.extend_external(matrix, ids, intents, phrases, slots)
+        return index
+
+    def extend_external(
+        self,
+        matrix: np.ndarray,
+        ids: np.ndarray,
+        intents: list[str],
+        phrases: list[str],
+        slots: list[dict[str, Any]],
+    ) -> None:
+        """Tauscht die fremde Matrix gegen eine längere Sicht und hängt die neuen Metadaten an."""
+        if not self._external:
+            raise ValueError("extend_external() nur für Indizes aus from_arrays()")
+        self._matrix, self._ids = matrix, ids
+        self._size = matrix.shape[0]
+        self.intents.extend(intents)
+        self.phrases.extend(phrases)
+        self.slots.extend(slots)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def quantized(self) -> bool:
+        return self.dtype != "float32"
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """View auf die belegten Zeilen (kein Kopieren). Bei float16/int8 die Codes."""
+        return self._matrix[: self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[: self._size]
+
+    @property
+    def scale(self) -> np.ndarray | None:
+        """Skalierung je Zeile bei int8, sonst None."""
+        return None if self._scale is None else self._scale[: self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Speicher der belegten Vektorzeilen (inkl. int8-Skalierung)."""
+        n = self._size * self.dim * self._matrix.itemsize
+        return n + (self._size * 4 if self._scale is not None else 0)
+
+    def rows(self, sel: slice | np.ndarray) -> np.ndarray:
+        """float32-Zeilen (bei float32 als View für Slices, sonst dequantisiert)."""
+        codes = self._matrix[: self._size][sel]
+        if not self.quantized:
+            return codes
+        out = codes.astype(np.float32)
+        if self._scale is not None:
+            out *= self._scale[: self._size][sel][..., None]
+        return out
+
+    def _reserve(self, n: int) -> None:
+        if n <= self._matrix.shape[0]:
+            return
+        cap = self._matrix.shape[0]
+        while cap < n:
+            cap *= 2
+        matrix = np.zeros((cap, self.dim), dtype=self._matrix.dtype)
+        matrix[: self._size] = self._matrix[: self._size]
+        ids = np.zeros(cap, dtype=np.int64)
+        ids[: self._size] = self._ids[: self._size]
+        if self._scale is not None:
+            scale = np.ones(cap, dtype=np.float32)
+            scale[: self._size] = self._scale[: self._size]
+            self._scale = scale
+        self._matrix, self._ids = matrix, ids
+
+    def append(
+        self,
+        ids: list[int] | np.ndarray,
+        vectors: np.ndarray,
+        intents: list[str],
+        phrases: list[str],
+        slots: list[dict[str, Any]],
+    ) -> None:
+        """Hängt Zeilen an (Vektoren werden hier normalisiert und ggf. quantisiert)."""
+        if self._external:
+            raise ValueError("append() nicht für Indizes über fremde Matrix, extend_external() nutzen")
+        vecs = normalize_rows(vectors)
+        if vecs.shape[1] != self.dim:
+            raise ValueError(f"Embedding-Dimension {vecs.shape[1]} passt nicht zum Index ({self.dim})")
+        n = vecs.shape[0]
+        start = self._size
+        self._reserve(start + n)
+        if self._scale is not None:
+            scale = np.abs(vecs).max(axis=1) / 127.0
+            scale[scale == 0] = 1.0
+            self._matrix[start : start + n] = np.round(vecs / scale[:, None])
+            self._scale[start : start + n] = scale
+        else:
+            self._matrix[start : start + n] = vecs
+        self._ids[start : start + n] = ids
+        self._size = start + n
+        self.intents.extend(intents)
+        self.phrases.extend(phrases)
+        self.slots.extend(slots)
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Similarity zu allen Zeilen. float16/int8: chunkweise nach float32, ohne Vollkopie."""
+        if not self.quantized:
+            return self.matrix @ query
+        out = np.empty(self._size, dtype=np.float32)
+        buf = np.empty((min(_CHUNK, self._size), self.dim), dtype=np.float32)
+        for start in range(0, self._size, _CHUNK):
+            stop = min(start + _CHUNK, self._size)
+            block = buf[: stop - start]
+            block[...] = self._matrix[start:stop]
+            np.dot(block, query, out=out[start:stop])
+        if self._scale is not None:
+            out *= self._scale[: self._size]
+        return out
+
+    def search(self, query: np.ndarray, k: int = 3) -> list[tuple[float, int]]:
+        """
+        Top-k per Matrix-Vektor-Produkt. `query` muss normalisiert sein.
+        Returns Liste von (similarity, position), absteigend sortiert.
+        """
+        if self._size == 0 or k <= 0:
+            return []
+        scores = self.scores(query)
+        return [(float(scores[i]), int(i)) for i in top_k(scores, k)]
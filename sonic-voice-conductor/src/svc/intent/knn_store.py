@@ -1,20 +1,149 @@
 """SQLite Examples + Embeddings + kNN Similarity."""
 from __future__ import annotations
 
+import json
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Callable
 
 import numpy as np
 
+from .ann import IVFIndex
+from .index import DTYPES, EmbeddingIndex, normalize_rows
+from .prefilter import IntentPrefilter
+from .vector_store import VectorFile
+
+# Höchstens so viele ids pro "IN (...)": ältere SQLite-Builds erlauben nur 999 Variablen
+SQL_IN_CHUNK = 500
+# IVF-Zuordnungen erst nach so vielen Inserts (oder bei flush()) auf die Platte schreiben
+IVF_SAVE_EVERY = 500
+
 
 class KNNStore:
-    """Speichert Voice-Examples mit Embeddings, kNN-Matching."""
+    """
+    Speichert Voice-Examples mit Embeddings, kNN-Matching.
+    index_mode: "exact" (Brute-Force über die residente Matrix), "intent" (exakt, aber
+    zweistufig über Intent-Prototypen, siehe IntentPrefilter) oder "ivf" (Approximate,
+    ab ann_min_examples; nprobe = Recall vs. Latenz).
+    storage: "sqlite" (Embedding als BLOB in examples) oder "mmap" (normalisierte
+    Vektoren in svc.vectors.f32/.ids, SQLite hält nur Metadaten). Der Wechsel geht in
+    beide Richtungen: sqlite holt vorhandene Vektordateien beim Start in die BLOBs zurück.
+    dtype: Format der residenten Matrix, "float32" | "float16" | "int8". Bei float16/int8
+    liefert der Scan k * rerank Kandidaten, die exakt in float32 aus der Quelle (BLOB bzw.
+    Vektordatei) nachgerechnet werden. Die Quelle bleibt float32, daher ist der Wechsel
+    jederzeit ohne Neu-Embedding möglich.
+    """
 
-    def __init__(self, db_path: Path, embed_fn: Callable[[str], list[float]]):
+    def __init__(
+        self,
+        db_path: Path,
+        embed_fn: Callable[[str], list[float]],
+        index_mode: str = "exact",
+        nprobe: int = 8,
+        ann_min_examples: int = 5000,
+        storage: str = "sqlite",
+        dtype: str = "float32",
+        rerank: int = 4,
+    ):
+        if dtype not in DTYPES:
+            # Früh scheitern, nicht erst beim ersten load() mitten im Live-Betrieb
+            raise ValueError(f"Unbekannter dtype {dtype!r}, erlaubt: {', '.join(DTYPES)}")
         self.db_path = db_path
         self.embed_fn = embed_fn
+        self.index_mode = index_mode
+        self.nprobe = nprobe
+        self.ann_min_examples = ann_min_examples
+        self.dtype = dtype
+        self.rerank = rerank
+        self._index: EmbeddingIndex | None = None
+        self._ivf: IVFIndex | None = None
+        self._prefilter: IntentPrefilter | None = None
+        self._loaded = False
+        self._vectors: VectorFile | None = None
+        self._listeners: list[Callable[[list[str], np.ndarray | None], None]] = []
+        # Suche, Inserts und Kompaktierung können aus verschiedenen Threads kommen
+        self._lock = threading.RLock()
+        self.added_since_compact = 0
+        self._ivf_unsaved = 0  # Zeilen im IVF-Index, die noch nicht in ivf_path stehen
+        self._ivf_build: threading.Thread | None = None
+        self.dropped_blobs = 0  # Migration nach mmap: BLOBs mit falscher Dimension verworfen
         self._init_db()
+        if storage == "mmap":
+            self._vectors = VectorFile(self.db_path.with_suffix(".vectors"))
+            self._migrate_blobs()
+        else:
+            self._restore_blobs()
+
+    @property
+    def ivf_path(self) -> Path:
+        """IVF-Index liegt neben der DB (svc.db -> svc.ivf.npz)."""
+        return self.db_path.with_suffix(".ivf.npz")
+
+    @property
+    def prefilter(self) -> IntentPrefilter | None:
+        """Intent-Prototypen (nur index_mode "intent", nach load())."""
+        return self._prefilter
+
+    def add_listener(self, fn: Callable[[list[str], np.ndarray | None], None]) -> None:
+        """
+        Callback bei Änderungen an den Examples: fn(phrases, normalisierte Vektoren)
+        nach Inserts, fn([], None) wenn sich beliebige Examples geändert haben (Löschen).
+        """
+        self._listeners.append(fn)
+
+    def _notify(self, phrases: list[str], vectors: np.ndarray | None) -> None:
+        for fn in self._listeners:
+            fn(phrases, vectors)
+
+    def _migrate_blobs(self) -> None:
+        """Einmalige Migration: Embeddings aus examples.embedding in die Vektordatei."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT id, embedding FROM examples "
+                "WHERE embedding IS NOT NULL AND length(embedding) > 0 ORDER BY id"
+            ).fetchall()
+            if not rows:
+                return
+            row_bytes = 4 * self._vectors.dim if self._vectors.dim else len(rows[0][1])
+            usable = [r for r in rows if len(r[1]) == row_bytes]
+            self.dropped_blobs = len(rows) - len(usable)
+            # Nach Absturz mitten in der Migration: schon übertragene ids überspringen
+            done = set(self._vectors.ids().tolist())
+            todo = [r for r in usable if r[0] not in done]
+            if todo:
+                vectors = np.frombuffer(b"".join(r[1] for r in todo), dtype=np.float32)
+                self._vectors.append([r[0] for r in todo], normalize_rows(vectors.reshape(len(todo), -1)))
+            # Auch BLOBs falscher Dimension leeren (in der Vektordatei unbrauchbar, wie ein
+            # Example ohne Embedding): sonst liest jeder Start alle BLOBs erneut und VACUUMt
+            conn.executemany("UPDATE examples SET embedding = NULL WHERE id = ?", [(r[0],) for r in rows])
+            conn.commit()
+        # Hier wurden immer BLOBs geleert, sonst wäre oben schon Schluss
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("VACUUM")
+
+    def _restore_blobs(self) -> None:
+        """
+        Rückweg von storage "mmap": Vektoren aus der Vektordatei zurück in
+        examples.embedding (nur Rows ohne BLOB), danach die Vektordatei entfernen.
+        Die Datei hält normalisierte Vektoren; für Cosine ist das gleichwertig.
+        """
+        vectors = VectorFile(self.db_path.with_suffix(".vectors"))
+        if not vectors.vec_path.exists():
+            return
+        if len(vectors):
+            ids = vectors.ids().tolist()
+            data = vectors.vectors()
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    "UPDATE examples SET embedding = ? WHERE id = ? AND embedding IS NULL",
+                    [(np.ascontiguousarray(data[j]).tobytes(), int(i)) for j, i in enumerate(ids)],
+                )
+                conn.commit()
+            del data
+        # Erst nach dem Commit löschen: ein Absturz davor wiederholt nur die Migration
+        vectors.vec_path.unlink()
+        vectors.ids_path.unlink(missing_ok=True)
 
     def _init_db(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -26,46 +155,333 @@ class KNNStore:
                     intent TEXT NOT NULL,
                     slots_json TEXT,
                     embedding BLOB,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    usage_count INTEGER NOT NULL DEFAULT 1
                 )
             """)
+            # Migration älterer DBs (vor Kompaktierung)
+            columns = {r[1] for r in conn.execute("PRAGMA table_info(examples)")}
+            if "usage_count" not in columns:
+                conn.execute("ALTER TABLE examples ADD COLUMN usage_count INTEGER NOT NULL DEFAULT 1")
             conn.execute("CREATE INDEX IF NOT EXISTS ix_examples_intent ON examples(intent)")
             conn.commit()
 
+    def load(self) -> EmbeddingIndex | None:
+        """Lädt alle Examples einmalig in den residenten Index (idempotent)."""
+        with self._lock:
+            self._refresh_vectors()
+            if not self._loaded:
+                self._index = self._load_index()
+                self._ivf = None
+                self._prefilter = None
+                self._loaded = True
+                self._sync_ivf()
+                if self.index_mode == "intent" and self._index is not None:
+                    self._prefilter = IntentPrefilter.build(self._index)
+            return self._index
+
+    def _refresh_vectors(self) -> None:
+        """Vektordatei von einem anderen Prozess ersetzt/verlängert: Index neu aufbauen."""
+        if self._vectors is not None and self._vectors.refresh():
+            self.reload()
+
+    def reload(self) -> None:
+        """Verwirft den Index; nächster Zugriff lädt neu aus der DB."""
+        with self._lock:
+            self._index = None
+            self._ivf = None
+            self._ivf_unsaved = 0
+            self._prefilter = None
+            self._loaded = False
+
+    def _sync_ivf(self) -> None:
+        """
+        Lädt oder erweitert den IVF-Index passend zum residenten Index (unter self._lock).
+        Ein Neubau (k-means) läuft im Hintergrund, bis dahin sucht der Store exakt bzw.
+        mit dem bisherigen IVF. Gespeichert wird nach IVF_SAVE_EVERY Inserts, nach einem
+        Neubau und bei flush() – nicht bei jeder Korrektur.
+        """
+        index = self._index
+        if self.index_mode != "ivf" or index is None or len(index) < self.ann_min_examples:
+            return
+        if self._ivf is None:
+            self._ivf = IVFIndex.load(self.ivf_path, index.ids, index.matrix)
+            if self._ivf is None:
+                self._start_ivf_build(index)
+                return
+        if len(self._ivf) < len(index):
+            self._ivf_unsaved += len(index) - len(self._ivf)
+            self._ivf.add(index.matrix[len(self._ivf) :])
+        if self._ivf.needs_rebuild():
+            self._start_ivf_build(index)
+        elif self._ivf_unsaved >= IVF_SAVE_EVERY:
+            self._save_ivf()
+
+    def _start_ivf_build(self, index: EmbeddingIndex) -> None:
+        if self._ivf_build is not None and self._ivf_build.is_alive():
+            return  # Zeilen, die währenddessen dazukommen, trägt der Build am Ende nach
+        n, matrix = len(index), index.matrix  # Präfix bleibt unverändert, auch wenn der Index wächst
+
+        def build() -> None:
+            ivf = IVFIndex.build(matrix)
+            with self._lock:
+                if self._index is not index:
+                    return  # inzwischen neu geladen (z.B. Kompaktierung): der Nachfolger baut selbst
+                if len(index) > n:
+                    ivf.add(index.matrix[n:])
+                self._ivf = ivf
+                self._save_ivf()
+
+        self._ivf_build = threading.Thread(target=build, daemon=True, name="svc-ivf")
+        self._ivf_build.start()
+
+    def _save_ivf(self) -> None:
+        self._ivf.save(self.ivf_path, self._index.ids[: len(self._ivf)])
+        self._ivf_unsaved = 0
+
+    def flush(self) -> None:
+        """Wartet auf einen laufenden IVF-Neubau und speichert noch nicht persistierte Zuordnungen."""
+        build = self._ivf_build
+        if build is not None:
+            build.join()
+        with self._lock:
+            if self._ivf is not None and self._ivf_unsaved and self._index is not None:
+                self._save_ivf()
+
+    def _load_index(self) -> EmbeddingIndex | None:
+        if self._vectors is not None:
+            return self._load_mmap_index()
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT id, phrase, intent, slots_json, embedding FROM examples "
+                "WHERE embedding IS NOT NULL AND length(embedding) > 0 ORDER BY id"
+            ).fetchall()
+        if not rows:
+            return None
+        # Dimension vom ersten Example; abweichende (z.B. altes Embed-Modell) ignorieren
+        row_bytes = len(rows[0][4])
+        rows = [r for r in rows if len(r[4]) == row_bytes]
+        dim = row_bytes // 4
+        vectors = np.frombuffer(b"".join(r[4] for r in rows), dtype=np.float32).reshape(len(rows), dim)
+        index = EmbeddingIndex(dim, capacity=len(rows), dtype=self.dtype)
+        index.append(
+            [r[0] for r in rows],
+            vectors,
+            [r[2] for r in rows],
+            [r[1] for r in rows],
+            [json.loads(r[3]) if r[3] else {} for r in rows],
+        )
+        return index
+
+    def _load_mmap_index(self) -> EmbeddingIndex | None:
+        """Index direkt über die memmap der Vektordatei (keine Kopie der Vektoren)."""
+        vf = self._vectors
+        with sqlite3.connect(self.db_path) as conn:
+            meta = {
+                r[0]: (r[1], r[2], r[3])
+                for r in conn.execute("SELECT id, phrase, intent, slots_json FROM examples")
+            }
+        # Verwaiste Vektoren (gelöschte Rows, Absturz vor Commit) vorher entfernen
+        if len(vf) and not np.isin(vf.ids(), np.fromiter(meta.keys(), dtype=np.int64)).all():
+            vf.compact(np.fromiter(meta.keys(), dtype=np.int64))
+        if len(vf) == 0:
+            return None
+        ids = vf.ids()
+        rows = [meta[i] for i in ids.tolist()]
+        intents = [r[1] for r in rows]
+        phrases = [r[0] for r in rows]
+        slots = [json.loads(r[2]) if r[2] else {} for r in rows]
+        if self.dtype == "float32":
+            return EmbeddingIndex.from_arrays(vf.vectors(), ids, intents, phrases, slots)
+        # Quantisiert: Codes resident, die float32-Datei wird nur beim Re-Rank gelesen
+        index = EmbeddingIndex(vf.dim, capacity=len(ids), dtype=self.dtype)
+        vectors = vf.vectors()
+        for start in range(0, len(ids), 8192):
+            stop = start + 8192
+            index.append(ids[start:stop], vectors[start:stop], intents[start:stop], phrases[start:stop], slots[start:stop])
+        return index
+
     def add(self, phrase: str, intent: str, slots: dict) -> None:
-        """Neues Example hinzufügen (mit Embedding)."""
-        import json
-        emb = self.embed_fn(phrase)
-        arr = np.array(emb, dtype=np.float32)
+        """Neues Example hinzufügen (mit Embedding). Index wird inkrementell erweitert."""
+        self.add_many([phrase], [intent], [slots], [self.embed_fn(phrase)])
+
+    def add_many(
+        self,
+        phrases: list[str],
+        intents: list[str],
+        slots: list[dict],
+        embeddings: list[list[float]],
+    ) -> list[int]:
+        """
+        Fügt Examples mit fertigen Embeddings in einer Transaktion ein (executemany).
+        Index, IVF und Listener werden einmal pro Aufruf aktualisiert. Returns neue ids.
+        """
+        n = len(phrases)
+        if n == 0:
+            return []
+        arrs = [np.asarray(e, dtype=np.float32) for e in embeddings]
+        dim = self._expected_dim() or next((a.size for a in arrs if a.size), 0)
+        with_vec = [j for j, a in enumerate(arrs) if a.size and a.size == dim]
+        vecs = normalize_rows(np.stack([arrs[j] for j in with_vec])) if with_vec else None
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Unter der Schreibsperre (Kompaktierung ersetzt die Datei vor ihrem Commit):
+                # sonst landen die Zeilen hinter einem veralteten Zeilenstand
+                self._refresh_vectors()
+                start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM examples").fetchone()[0] + 1
+                ids = list(range(start, start + n))
+                conn.executemany(
+                    "INSERT INTO examples (id, phrase, intent, slots_json, embedding) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (ids[j], phrases[j], intents[j], json.dumps(slots[j]),
+                         arrs[j].tobytes() if self._vectors is None and arrs[j].size else None)
+                        for j in range(n)
+                    ],
+                )
+                # Vektoren vor dem Commit schreiben: stirbt der Prozess dazwischen, bleiben nur
+                # verwaiste Vektoren, die _load_mmap_index() wegräumt
+                if self._vectors is not None and vecs is not None:
+                    self._vectors.append([ids[j] for j in with_vec], vecs)
+                conn.commit()
+            self.added_since_compact += n
+            # Ohne geladenen Index: wird beim ersten load() mitgeladen
+            if self._loaded and vecs is not None:
+                self._extend_index(
+                    [ids[j] for j in with_vec],
+                    vecs,
+                    [intents[j] for j in with_vec],
+                    [phrases[j] for j in with_vec],
+                    [dict(slots[j]) for j in with_vec],
+                )
+        self._notify(list(phrases), vecs)
+        return ids
+
+    def _extend_index(
+        self, ids: list[int], vecs: np.ndarray, intents: list[str], phrases: list[str], slots: list[dict]
+    ) -> None:
+        """Hängt frisch gespeicherte Examples an Index, IVF und Prefilter an."""
+        start = len(self._index) if self._index is not None else 0
+        if self._vectors is not None and self.dtype == "float32":
+            vf = self._vectors
+            if self._index is None:
+                self._index = EmbeddingIndex.from_arrays(vf.vectors(), vf.ids(), intents, phrases, slots)
+            else:
+                self._index.extend_external(vf.vectors(), vf.ids(), intents, phrases, slots)
+        else:
+            if self._index is None:
+                self._index = EmbeddingIndex(vecs.shape[1], dtype=self.dtype)
+            self._index.append(ids, vecs, intents, phrases, slots)
+        self._sync_ivf()
+        if self.index_mode == "intent":
+            if self._prefilter is None:
+                self._prefilter = IntentPrefilter.build(self._index)
+            else:
+                self._prefilter.add(self._index, start)
+
+    def _expected_dim(self) -> int:
+        if self._vectors is not None and self._vectors.dim:
+            return self._vectors.dim
+        return self._index.dim if self._index is not None else 0
+
+    def delete(self, ids: list[int]) -> int:
+        """Löscht Examples. Die Vektordatei wird dabei kompaktiert. Returns gelöschte Rows."""
+        return self.merge({}, ids)
+
+    def merge(self, usage: dict[int, int], drop_ids: list[int]) -> int:
+        """
+        Fasst Examples zusammen: setzt usage_count der Repräsentanten (id -> Anzahl) und
+        löscht die aufgegangenen Rows, alles in einer Transaktion. Danach werden
+        Vektordatei und Index neu aufgebaut. Returns gelöschte Rows.
+        """
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    "UPDATE examples SET usage_count = ? WHERE id = ?",
+                    [(int(n), int(i)) for i, n in usage.items()],
+                )
+                cur = conn.executemany("DELETE FROM examples WHERE id = ?", [(int(i),) for i in drop_ids])
+                removed = cur.rowcount
+                remaining = np.array([r[0] for r in conn.execute("SELECT id FROM examples")], dtype=np.int64)
+                if self._vectors is not None:
+                    # Noch unter der Schreibsperre, damit kein anderer Prozess dazwischen anhängt.
+                    # Absturz vor dem Commit: nur die verschmolzenen Duplikate bleiben ohne Vektor
+                    self._vectors.refresh()
+                    self._vectors.compact(remaining)
+                conn.commit()
+            # IVFIndex.load() erkennt die geänderten ids und baut neu
+            self.reload()
+        self._notify([], None)
+        return removed
+
+    def usage_counts(self) -> dict[int, int]:
+        """usage_count je Example-id."""
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                "INSERT INTO examples (phrase, intent, slots_json, embedding) VALUES (?, ?, ?, ?)",
-                (phrase, intent, json.dumps(slots), arr.tobytes()),
-            )
-            conn.commit()
+            return dict(conn.execute("SELECT id, usage_count FROM examples").fetchall())
 
     def search(self, phrase: str, k: int = 3) -> list[tuple[float, str, str, dict]]:
         """
         kNN-Suche. Returns Liste von (similarity, intent, phrase, slots).
         Cosine similarity, höher = ähnlicher.
         """
-        import json
+        query = self.embed_query(phrase)
+        return [] if query is None else self.search_vector(query, k)
+
+    def embed_query(self, phrase: str) -> np.ndarray | None:
+        """Normalisiertes Query-Embedding, None bei leerem Vektor."""
         q_emb = np.array(self.embed_fn(phrase), dtype=np.float32)
-        q_norm = np.linalg.norm(q_emb)
-        if q_norm == 0:
-            return []
+        if q_emb.size == 0 or not np.any(q_emb):
+            return None
+        return normalize_rows(q_emb)[0]
 
+    def exact_vectors(self, positions: list[int]) -> np.ndarray:
+        """float32-Originalvektoren (normalisiert) zu Positionen des residenten Index."""
+        with self._lock:
+            index = self.load()
+            if index is None:
+                return np.zeros((0, 0), dtype=np.float32)
+            return self._exact_rows(index, positions)
+
+    def _exact_rows(self, index: EmbeddingIndex, positions: list[int]) -> np.ndarray:
+        if self._vectors is not None:
+            # Index und Vektordatei sind zeilengleich (gleiche Append-Reihenfolge)
+            return np.asarray(self._vectors.vectors()[positions], dtype=np.float32)
+        ids = [int(i) for i in index.ids[positions]]
+        blobs: dict[int, bytes] = {}
         with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute("SELECT phrase, intent, slots_json, embedding FROM examples").fetchall()
-
-        results = []
-        for phrase_row, intent, slots_json, emb_blob in rows:
-            if not emb_blob:
-                continue
-            emb = np.frombuffer(emb_blob, dtype=np.float32)
-            sim = float(np.dot(q_emb, emb) / (q_norm * np.linalg.norm(emb) + 1e-9))
-            slots = json.loads(slots_json) if slots_json else {}
-            results.append((sim, intent, phrase_row, slots))
-
-        results.sort(key=lambda x: -x[0])
-        return results[:k]
+            for start in range(0, len(ids), SQL_IN_CHUNK):
+                chunk = ids[start:start + SQL_IN_CHUNK]
+                blobs.update(
+                    conn.execute(
+                        f"SELECT id, embedding FROM examples WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                )
+        return normalize_rows(np.stack([np.frombuffer(blobs[i], dtype=np.float32) for i in ids]))
+
+    def _rerank(
+        self, index: EmbeddingIndex, query: np.ndarray, positions: list[int], k: int
+    ) -> list[tuple[float, int]]:
+        """Exakte float32-Scores für die Kandidaten des quantisierten Scans."""
+        scores = self._exact_rows(index, positions) @ query
+        order = np.argsort(-scores)[:k]
+        return [(float(scores[j]), positions[j]) for j in order]
+
+    def search_vector(self, query: np.ndarray, k: int = 3) -> list[tuple[float, str, str, dict]]:
+        """kNN-Suche mit bereits normalisiertem Query-Vektor (siehe embed_query)."""
+        with self._lock:
+            return self._search_vector(query, k)
+
+    def _search_vector(self, query: np.ndarray, k: int) -> list[tuple[float, str, str, dict]]:
+        index = self.load()
+        if index is None or query.size != index.dim:
+            return []
+        n = k * max(self.rerank, 1) if index.quantized else k
+        if self._ivf is not None:
+            hits = self._ivf.search(index.matrix, query, n, nprobe=self.nprobe, scale=index.scale)
+        elif self._prefilter is not None:
+            hits = self._prefilter.search(index, query, n)
+        else:
+            hits = index.search(query, n)
+        if index.quantized and hits:
+            hits = self._rerank(index, query, [i for _, i in hits], k)
+        return [(sim, index.intents[i], index.phrases[i], dict(index.slots[i])) for sim, i in hits]
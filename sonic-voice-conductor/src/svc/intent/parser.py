@@ -1,15 +1,22 @@
 """Intent-Parser: kNN -> LLM -> Confirm -> Correct. Merge-Logik."""
 from __future__ import annotations
 
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Callable
 
+from svc.llm.response_cache import LLMResponseCache
+
 from .schema import Intent, Slots
+from .cache import IntentCache
+from .grammar import GrammarMatcher
 from .knn_store import KNNStore
 from .rules import normalize_intent
 
 
 class IntentParser:
-    """Vereint kNN, LLM-Fallback und Korrektur-Lernen."""
+    """Vereint Grammatik, kNN, LLM-Fallback und Korrektur-Lernen."""
 
     def __init__(
         self,
@@ -19,61 +26,206 @@ class IntentParser:
         knn_auto: float = 0.85,
         knn_suggest: float = 0.65,
         llm_auto_conf: float = 0.8,
+        grammar: GrammarMatcher | None = None,
+        cache: IntentCache | None = None,
+        speculative: bool = False,
+        llm_generate_json: Callable[..., dict | None] | None = None,
+        constrained: bool = False,
+        llm_available: Callable[[], bool] | None = None,
+        llm_cache: LLMResponseCache | None = None,
     ):
+        """
+        speculative: LLM-Request parallel zur kNN-Suche starten. llm_generate muss dann
+        ein `cancel`-Event akzeptieren; greift kNN, wird die Generierung abgebrochen.
+        llm_generate_json: liefert direkt das Dict (gestreamt, Abbruch nach dem ersten
+        vollständigen Objekt, siehe OllamaClient.generate_json); ersetzt dann
+        llm_generate + extract_json.
+        constrained: LLM-Ausgabe ist per JSON-Schema erzwungen (Ollama `format`). Dann
+        wiederholt nur ein Transportfehler (ConnectionError) den Request, kein
+        unlesbares JSON – der strengere Retry-Prompt entfällt.
+        llm_available: liefert False, solange das LLM als ausgefallen gilt (Circuit
+        Breaker offen); dann wird es übersprungen und nur Grammatik/kNN entscheiden.
+        Ein nicht erreichbares Embedding-Modell lässt die kNN-Stufe aus, statt zu werfen.
+        llm_cache: persistente LLM-Antworten; ein Treffer ersetzt den LLM-Call und
+        liefert llm_cache_auto / llm_cache_suggest.
+        """
         self.knn_store = knn_store
         self.llm_generate = llm_generate
         self.extract_json = extract_json
+        self.llm_generate_json = llm_generate_json
+        self.constrained = constrained
+        self.llm_retries = 0
+        self.llm_available = llm_available
+        self.llm_skipped = 0  # kNN-only, weil das LLM nicht verfügbar war
+        self.llm_cache = llm_cache
         self.knn_auto = knn_auto
         self.knn_suggest = knn_suggest
         self.llm_auto_conf = llm_auto_conf
+        self.grammar = grammar
+        self.cache = cache
+        self.stats: Counter[str] = Counter()
+        self.speculative = speculative
+        self.spec_useful = 0  # spekulativer LLM-Call wurde gebraucht und lieferte ein Ergebnis
+        self.spec_wasted = 0  # kNN war schneller, Call lief aber schon und wurde abgebrochen
+        self._executor: ThreadPoolExecutor | None = None
+        if cache is not None:
+            # Jede Example-Änderung (Korrektur, Import, Kompaktierung) invalidiert passende Einträge
+            knn_store.add_listener(cache.on_examples_changed)
 
     def parse(self, phrase: str) -> tuple[Intent, str]:
         """
         Parst Phrase zu Intent.
-        Returns (Intent, method) mit method in: knn_auto, knn_suggest, llm_auto, llm_suggest, unknown.
+        Returns (Intent, method) mit method in: grammar_auto, knn_auto, knn_suggest,
+        llm_cache_auto, llm_cache_suggest, llm_auto, llm_suggest, unknown. Zählt
+        methods in self.stats.
         """
-        phrase = phrase.strip()
+        intent, method = self._parse(phrase.strip())
+        self.stats[method] += 1
+        return intent, method
+
+    def _parse(self, phrase: str) -> tuple[Intent, str]:
         if not phrase:
             return Intent(intent="UNKNOWN", slots={}, confidence=0.0), "unknown"
 
-        # 1. kNN
-        knn_results = self.knn_store.search(phrase, k=1)
+        # 0. Grammatik: reguläre Befehle ohne Embedding/LLM
+        if self.grammar:
+            matched = self.grammar.match(phrase)
+            if matched:
+                return normalize_intent(matched), "grammar_auto"
+
+        # 1. Cache für bereits aufgelöste Phrasen
+        if self.cache is not None:
+            cached = self.cache.get(phrase)
+            if cached:
+                return cached
+
+        from svc.llm.prompts import INTENT_SYSTEM_PROMPT, build_intent_prompt
+
+        # 2. kNN (spekulativ: LLM läuft schon parallel, außer die Antwort liegt im LLM-Cache)
+        user_prompt = build_intent_prompt(phrase)
+        use_llm = self.llm_available is None or self.llm_available()
+        cached, spec = None, None
+        if self.speculative and use_llm:
+            cached = self._cached_answer(user_prompt)
+            if cached is None:
+                spec = self._start_llm(INTENT_SYSTEM_PROMPT, user_prompt)
+        try:
+            query = self.knn_store.embed_query(phrase)
+        except ConnectionError:
+            query = None
+        knn_results = self.knn_store.search_vector(query, k=1) if query is not None else []
         if knn_results:
             sim, intent_name, _, slots = knn_results[0]
             if sim >= self.knn_auto:
-                return normalize_intent(Intent(intent=intent_name, slots=slots, confidence=float(sim))), "knn_auto"
+                self._cancel_llm(spec)
+                intent = normalize_intent(Intent(intent=intent_name, slots=slots, confidence=float(sim)))
+                if self.cache is not None:
+                    self.cache.put(phrase, intent, "knn_auto", query, threshold=float(sim))
+                return intent, "knn_auto"
             if sim >= self.knn_suggest:
+                self._cancel_llm(spec)
                 return normalize_intent(Intent(intent=intent_name, slots=slots, confidence=float(sim))), "knn_suggest"
 
-        # 2. LLM Fallback
-        from svc.llm.prompts import INTENT_SYSTEM_PROMPT, build_intent_prompt
-        raw = self.llm_generate(INTENT_SYSTEM_PROMPT, build_intent_prompt(phrase))
-        data = self.extract_json(raw)
+        # 3. LLM Fallback (bzw. dessen gecachte Antwort; ohne spekulativen Call erst jetzt nachsehen)
+        if cached is None and spec is None:
+            cached = self._cached_answer(user_prompt)
+        if cached is not None:
+            intent = normalize_intent(self._intent_from(cached))
+            if intent.confidence >= self.llm_auto_conf:
+                if self.cache is not None:
+                    self.cache.put(phrase, intent, "llm_cache_auto", query, threshold=self.knn_suggest)
+                return intent, "llm_cache_auto"
+            return intent, "llm_cache_suggest"
+        if not use_llm:
+            self.llm_skipped += 1
+            return Intent(intent="UNKNOWN", slots={}, confidence=0.0), "unknown"
+        transport_error = False
+        try:
+            if spec is not None:
+                data = spec[0].result()
+                self.spec_useful += bool(data)
+            else:
+                data = self._llm_data(INTENT_SYSTEM_PROMPT, user_prompt)
+        except ConnectionError:
+            data, transport_error = None, True
         if data:
-            intent = Intent(
-                intent=str(data.get("intent", "UNKNOWN")),
-                slots=data.get("slots") or {},
-                confidence=float(data.get("confidence", 0.5)),
-            )
-            intent = normalize_intent(intent)
+            intent = normalize_intent(self._intent_from(data))
             if intent.confidence >= self.llm_auto_conf:
+                self._remember(user_prompt, data, intent)
+                if self.cache is not None:
+                    # Ein Example ab knn_suggest würde künftig statt des LLM greifen
+                    self.cache.put(phrase, intent, "llm_auto", query, threshold=self.knn_suggest)
                 return intent, "llm_auto"
             return intent, "llm_suggest"
 
-        # Retry mit strengerer Anweisung
-        retry_prompt = "Antworte NUR mit einem JSON-Objekt, kein anderer Text. " + build_intent_prompt(phrase)
-        raw2 = self.llm_generate(INTENT_SYSTEM_PROMPT, retry_prompt)
-        data2 = self.extract_json(raw2)
+        if self.constrained and not transport_error:
+            return Intent(intent="UNKNOWN", slots={}, confidence=0.0), "unknown"
+        if self.llm_available is not None and not self.llm_available():
+            # Breaker hat gerade geöffnet: kein zweiter Versuch gegen ein hängendes Ollama
+            return Intent(intent="UNKNOWN", slots={}, confidence=0.0), "unknown"
+
+        # Retry: nach Transportfehler derselbe Request, sonst mit strengerer Anweisung
+        self.llm_retries += 1
+        retry_prompt = build_intent_prompt(phrase)
+        if not self.constrained:
+            retry_prompt = "Antworte NUR mit einem JSON-Objekt, kein anderer Text. " + retry_prompt
+        try:
+            data2 = self._llm_data(INTENT_SYSTEM_PROMPT, retry_prompt)
+        except ConnectionError:
+            data2 = None
         if data2:
-            intent = Intent(
-                intent=str(data2.get("intent", "UNKNOWN")),
-                slots=data2.get("slots") or {},
-                confidence=float(data2.get("confidence", 0.5)),
-            )
-            return normalize_intent(intent), "llm_suggest"
+            return normalize_intent(self._intent_from(data2)), "llm_suggest"
 
         return Intent(intent="UNKNOWN", slots={}, confidence=0.0), "unknown"
 
+    @staticmethod
+    def _intent_from(data: dict) -> Intent:
+        return Intent(
+            intent=str(data.get("intent", "UNKNOWN")),
+            slots=data.get("slots") or {},
+            confidence=float(data.get("confidence", 0.5)),
+        )
+
+    def _cached_answer(self, user_prompt: str) -> dict | None:
+        """LLM-Cache-Lookup (SQLite) – nur wenn ein LLM-Call anstünde, nicht bei jedem Parse."""
+        if self.llm_cache is None:
+            return None
+        from svc.llm.prompts import INTENT_SYSTEM_PROMPT
+
+        return self.llm_cache.get(INTENT_SYSTEM_PROMPT, user_prompt)
+
+    def _remember(self, user_prompt: str, data: dict, intent: Intent) -> None:
+        """
+        LLM-Antwort persistent cachen – nur auto-sichere: ein Vorschlag, den der DJ ablehnt,
+        käme sonst bis zum TTL als llm_cache_suggest wieder. UNKNOWN nie, das soll beim
+        nächsten Mal neu versucht werden.
+        """
+        if self.llm_cache is not None and intent.intent != "UNKNOWN":
+            from svc.llm.prompts import INTENT_SYSTEM_PROMPT
+
+            self.llm_cache.put(INTENT_SYSTEM_PROMPT, user_prompt, data)
+
+    def _llm_data(self, system: str, user: str, cancel: threading.Event | None = None) -> dict | None:
+        """LLM-Antwort als Dict (None wenn kein JSON kam)."""
+        kwargs = {"cancel": cancel} if cancel is not None else {}
+        if self.llm_generate_json is not None:
+            return self.llm_generate_json(system, user, **kwargs)
+        return self.extract_json(self.llm_generate(system, user, **kwargs))
+
+    def _start_llm(self, system: str, user: str) -> tuple[Future[dict | None], threading.Event]:
+        if self._executor is None:
+            # 2 Worker: ein abgebrochener Call kann noch bis zum nächsten Chunk laufen
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="svc-llm")
+        cancel = threading.Event()
+        return self._executor.submit(self._llm_data, system, user, cancel), cancel
+
+    def _cancel_llm(self, spec: tuple[Future[dict | None], threading.Event] | None) -> None:
+        """Verwirft den spekulativen Call, ohne auf ihn zu warten."""
+        if spec is not None:
+            spec[1].set()
+            if not spec[0].cancel():  # lief schon: der Request hat Ollama tatsächlich belastet
+                self.spec_wasted += 1
+
     def learn_correction(self, original_phrase: str, corrected_intent: str, corrected_slots: dict) -> None:
         """Speichert ursprüngliche Phrase als Example für korrigierten Intent."""
         self.knn_store.add(original_phrase, corrected_intent, corrected_slots)
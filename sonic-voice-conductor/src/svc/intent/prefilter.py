@@ -0,0 +1,128 @@
+"""Zweistufiges kNN: Intent-Prototypen grenzen die Suche ein, Ergebnis bleibt exakt."""
+from __future__ import annotations
+
+import numpy as np
+
+from .ann import _nearest_centroid, spherical_kmeans
+from .index import EmbeddingIndex, top_k
+
+_PROTO_SIZE = 256  # große Intents in Prototypen dieser Größenordnung aufteilen
+_MAX_PROTOS = 8
+
+
+class IntentPrefilter:
+    """
+    Prototypen je Intent (Mittelwert + Radius über die normalisierten Zeilen). Große
+    Intents werden per k-means in bis zu _MAX_PROTOS Prototypen geteilt.
+
+    Für jede Zeile x eines Prototyps mit Mittelwert m und Radius r gilt
+    q·x <= q·m + r (|q| = 1). Die Suche scannt Prototypen nach dieser Schranke
+    absteigend und hört auf, sobald die Schranke unter dem k-ten Treffer liegt:
+    gleiche Treffer wie die volle Suche, aber meist nur ein Bruchteil der Zeilen.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.intents: list[str] = []
+        self._sums = np.zeros((0, dim), dtype=np.float64)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._radii = np.zeros(0, dtype=np.float32)
+        self._positions: list[list[int]] = []
+        self._arrays: dict[int, np.ndarray] = {}
+        self._means: np.ndarray | None = None
+        self.rows_scanned = 0
+        self.rows_total = 0
+
+    @classmethod
+    def build(cls, index: EmbeddingIndex) -> "IntentPrefilter":
+        """Baut die Prototypen über alle Zeilen des Index."""
+        pre = cls(index.dim)
+        groups: dict[str, list[int]] = {}
+        for pos, intent in enumerate(index.intents):
+            groups.setdefault(intent, []).append(pos)
+        for intent, positions in groups.items():
+            pos = np.asarray(positions, dtype=np.int64)
+            rows = index.rows(pos)
+            n_protos = min(-(-len(pos) // _PROTO_SIZE), _MAX_PROTOS)
+            if n_protos > 1:
+                assign = _nearest_centroid(rows, spherical_kmeans(rows, n_protos, iters=5))
+                parts = [np.flatnonzero(assign == c) for c in range(n_protos)]
+            else:
+                parts = [np.arange(len(pos))]
+            for part in parts:
+                if part.size:
+                    pre._new_group(intent, pos[part], rows[part])
+        return pre
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _new_group(self, intent: str, positions: np.ndarray, rows: np.ndarray) -> None:
+        total = rows.sum(axis=0, dtype=np.float64)
+        mean = total / len(positions)
+        radius = float(np.linalg.norm(rows - mean, axis=1).max())
+        self.intents.append(intent)
+        self._sums = np.vstack([self._sums, total[None, :]])
+        self._counts = np.append(self._counts, len(positions))
+        self._radii = np.append(self._radii, np.float32(radius))
+        self._positions.append([int(p) for p in positions])
+        self._means = None
+
+    def add(self, index: EmbeddingIndex, start: int) -> None:
+        """Ordnet die Index-Zeilen ab `start` inkrementell ihrem nächsten Prototyp zu."""
+        rows = index.rows(slice(start, len(index)))
+        for offset, row in enumerate(rows):
+            pos = start + offset
+            intent = index.intents[pos]
+            groups = [g for g, name in enumerate(self.intents) if name == intent]
+            if not groups:
+                self._new_group(intent, np.array([pos]), row[None, :])
+                continue
+            means = self._sums[groups] / self._counts[groups, None]
+            g = groups[int(np.argmax(means @ row))]
+            old = self._sums[g] / self._counts[g]
+            self._sums[g] += row
+            self._counts[g] += 1
+            new = self._sums[g] / self._counts[g]
+            # Mittelwert verschiebt sich: alte Zeilen liegen höchstens r + |Verschiebung| entfernt
+            shift = float(np.linalg.norm(new - old))
+            self._radii[g] = max(self._radii[g] + shift, float(np.linalg.norm(row - new)))
+            self._positions[g].append(pos)
+            self._arrays.pop(g, None)
+        self._means = None
+
+    def _group_positions(self, g: int) -> np.ndarray:
+        arr = self._arrays.get(g)
+        if arr is None:
+            arr = self._arrays[g] = np.asarray(self._positions[g], dtype=np.int64)
+        return arr
+
+    def search(self, index: EmbeddingIndex, query: np.ndarray, k: int = 3) -> list[tuple[float, int]]:
+        """Top-k wie EmbeddingIndex.search. Returns (similarity, position), absteigend."""
+        if len(self) == 0 or k <= 0:
+            return []
+        if self._means is None:
+            self._means = (self._sums / self._counts[:, None]).astype(np.float32)
+        # kleiner Zuschlag gegen Rundung in float32, sonst könnten Gleichstände wegfallen
+        bounds = self._means @ query + self._radii + 1e-5
+        best_scores = np.empty(0, dtype=np.float32)
+        best_pos = np.empty(0, dtype=np.int64)
+        scanned = 0
+        for g in np.argsort(-bounds):
+            if best_scores.size >= k and bounds[g] < best_scores[-1]:
+                break
+            pos = self._group_positions(int(g))
+            scores = index.rows(pos) @ query
+            scanned += pos.size
+            best_scores = np.concatenate([best_scores, scores])
+            best_pos = np.concatenate([best_pos, pos])
+            keep = top_k(best_scores, k)
+            best_scores, best_pos = best_scores[keep], best_pos[keep]
+        self.rows_scanned += scanned
+        self.rows_total += len(index)
+        return [(float(s), int(p)) for s, p in zip(best_scores, best_pos)]
+
+    @property
+    def scan_fraction(self) -> float:
+        """Anteil der tatsächlich gescannten Zeilen über alle bisherigen Suchen."""
+        return self.rows_scanned / self.rows_total if self.rows_total else 0.0
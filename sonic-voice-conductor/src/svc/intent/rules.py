@@ -3,15 +3,18 @@ from __future__ import annotations
 
 from .schema import Intent, Slots
 
+ALLOWED_INTENTS = (
+    "SET_ENERGY", "SET_DARKNESS", "SET_HATS", "SET_BPM", "KICK_ON",
+    "BREAK", "DROP", "UNDO", "SAVE", "RESET", "PROFILE_SET", "MACRO_RUN",
+    "SCHEDULE", "HOLD", "RATE", "UNKNOWN",
+)
+RATINGS = ("gut", "langweilig", "peak", "fail")
+
 
 def normalize_intent(intent: Intent) -> Intent:
     """Normalisiert Slots (Typen, Grenzen) und Intent-Name."""
     name = str(intent.intent).strip().upper()
-    if name not in {
-        "SET_ENERGY", "SET_DARKNESS", "SET_HATS", "SET_BPM", "KICK_ON",
-        "BREAK", "DROP", "UNDO", "SAVE", "RESET", "PROFILE_SET", "MACRO_RUN",
-        "SCHEDULE", "HOLD", "RATE", "UNKNOWN",
-    }:
+    if name not in ALLOWED_INTENTS:
         name = "UNKNOWN"
 
     slots = intent.slots_dict()
@@ -56,7 +59,7 @@ def normalize_intent(intent: Intent) -> Intent:
         out["bars"] = clamp(int(float(slots.get("bars", 8))), 1, 64)
     elif name == "RATE":
         r = str(slots.get("rating", "")).lower()
-        if r in ("gut", "langweilig", "peak", "fail"):
+        if r in RATINGS:
             out["rating"] = r
 
     return Intent(intent=name, slots=out, confidence=intent.confidence)
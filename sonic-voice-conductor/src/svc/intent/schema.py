@@ -1,7 +1,7 @@
 """Intent + Slots Pydantic-Modelle."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Sequence, get_args
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,7 @@ class Slots(BaseModel):
     mode: str | None = None
     name: str | None = None
     action: str | None = None
+    rating: str | None = None
 
 
 class Intent(BaseModel):
@@ -29,3 +30,26 @@ class Intent(BaseModel):
         if isinstance(s, Slots):
             return s.model_dump(exclude_none=True)
         return dict(s) if s else {}
+
+
+_JSON_TYPES = {float: "number", int: "integer", str: "string"}
+
+
+def intent_json_schema(allowed_intents: Sequence[str]) -> dict[str, Any]:
+    """
+    JSON-Schema für LLM-Antworten (Ollama `format`): Intent mit Enum der erlaubten
+    Namen, Slots aus den Feldern von Slots (alle optional), confidence 0-1.
+    """
+    slot_props = {}
+    for name, field in Slots.model_fields.items():
+        types = [t for t in get_args(field.annotation) if t is not type(None)]
+        slot_props[name] = {"type": _JSON_TYPES[types[0]]}
+    return {
+        "type": "object",
+        "properties": {
+            "intent": {"type": "string", "enum": list(allowed_intents)},
+            "slots": {"type": "object", "properties": slot_props},
+            "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        },
+        "required": ["intent", "slots", "confidence"],
+    }
@@ -0,0 +1,156 @@
+"""Append-only, memory-mapped float32-Vektordatei für Example-Embeddings."""
+from __future__ import annotations
+
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+_MAGIC = b"SVCV"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII")  # magic, version, dim, reserved -> 16 Bytes
+
+
+class VectorFile:
+    """
+    Zwei Dateien nebeneinander: `<base>.f32` (Header + N x dim float32, zusammenhängend)
+    und `<base>.ids` (N x int64, examples.id je Zeile).
+
+    Crash-sicheres Append: erst Vektoren schreiben + fsync, dann ids + fsync.
+    Eine Zeile existiert erst, wenn ihre id geschrieben ist; beim Öffnen werden
+    halbe Zeilen abgeschnitten. Kompaktierung schreibt neue Dateien und ersetzt
+    per os.replace (Roll-forward beim nächsten Öffnen, falls dazwischen abgestürzt).
+
+    Ersetzt oder verlängert ein anderer Prozess die Dateien (z.B. svc compact-examples
+    neben einem laufenden svc live), passen Zeilenzahl und memmap nicht mehr: refresh()
+    erkennt das an Inode/Größe und liest den Stand neu ein.
+    """
+
+    def __init__(self, base: Path):
+        self.vec_path = base.with_name(base.name + ".f32")
+        self.ids_path = base.with_name(base.name + ".ids")
+        self.dim = 0
+        self.count = 0
+        self._stamp: tuple[int, int] | None = None  # (Inode, Größe) nach dem letzten eigenen Zugriff
+        self._recover()
+
+    @staticmethod
+    def _tmp(path: Path) -> Path:
+        return path.with_name(path.name + ".tmp")
+
+    def _file_stamp(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.vec_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size
+
+    def refresh(self) -> bool:
+        """Neu einlesen, falls die Datei seit dem letzten eigenen Zugriff fremd geändert wurde."""
+        if self._file_stamp() == self._stamp:
+            return False
+        self._recover()
+        return True
+
+    def _recover(self) -> None:
+        self.dim = 0
+        self.count = 0
+        self._stamp = None
+        vec_tmp, ids_tmp = self._tmp(self.vec_path), self._tmp(self.ids_path)
+        if ids_tmp.exists() and not vec_tmp.exists():
+            # Kompaktierung war nach dem Vektor-Rename unterbrochen: fertig machen
+            os.replace(ids_tmp, self.ids_path)
+        for tmp in (vec_tmp, ids_tmp):
+            tmp.unlink(missing_ok=True)
+        if not self.vec_path.exists() or self.vec_path.stat().st_size < _HEADER.size:
+            self.vec_path.unlink(missing_ok=True)
+            self.ids_path.unlink(missing_ok=True)
+            return
+        with open(self.vec_path, "rb") as f:
+            magic, version, dim, _ = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION or dim == 0:
+            raise ValueError(f"{self.vec_path} ist keine gültige Vektordatei")
+        self.dim = dim
+        n_vec = (self.vec_path.stat().st_size - _HEADER.size) // (4 * dim)
+        n_ids = self.ids_path.stat().st_size // 8 if self.ids_path.exists() else 0
+        self.count = min(n_vec, n_ids)
+        # Halbe/verwaiste Zeilen vom letzten Absturz abschneiden
+        with open(self.vec_path, "r+b") as f:
+            f.truncate(_HEADER.size + self.count * 4 * dim)
+        with open(self.ids_path, "ab") as f:
+            f.truncate(self.count * 8)
+        self._stamp = self._file_stamp()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _write_header(self, f, dim: int) -> None:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, dim, 0))
+
+    def append(self, ids: list[int] | np.ndarray, vectors: np.ndarray) -> None:
+        """Hängt Zeilen an (fsync je Aufruf, daher für Batches einmal aufrufen)."""
+        vecs = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vecs.ndim == 1:
+            vecs = vecs[None, :]
+        ids_arr = np.asarray(ids, dtype=np.int64)
+        if self.dim == 0:
+            self.dim = vecs.shape[1]
+            with open(self.vec_path, "wb") as f:
+                self._write_header(f, self.dim)
+            self.ids_path.write_bytes(b"")
+        if vecs.shape[1] != self.dim:
+            raise ValueError(f"Embedding-Dimension {vecs.shape[1]} passt nicht zur Vektordatei ({self.dim})")
+        with open(self.vec_path, "ab") as f:
+            f.write(vecs.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self.ids_path, "ab") as f:
+            f.write(ids_arr.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self.count += len(ids_arr)
+        self._stamp = self._file_stamp()
+
+    def vectors(self) -> np.ndarray:
+        """Read-only memmap (count, dim) – kein Kopieren."""
+        if self.count == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(self.vec_path, dtype=np.float32, mode="r", offset=_HEADER.size, shape=(self.count, self.dim))
+
+    def ids(self) -> np.ndarray:
+        if self.count == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(self.count,))
+
+    def compact(self, keep_ids: np.ndarray) -> int:
+        """
+        Schreibt nur Zeilen mit id in `keep_ids` neu (Reihenfolge bleibt).
+        Returns Anzahl entfernter Zeilen.
+        """
+        if self.count == 0:
+            return 0
+        ids = self.ids()
+        mask = np.isin(ids, np.asarray(keep_ids, dtype=np.int64))
+        removed = int(self.count - mask.sum())
+        if removed == 0:
+            return 0
+        vec_tmp, ids_tmp = self._tmp(self.vec_path), self._tmp(self.ids_path)
+        with open(vec_tmp, "wb") as f:
+            self._write_header(f, self.dim)
+            vectors = self.vectors()
+            for start in range(0, self.count, 65536):
+                sel = mask[start : start + 65536]
+                f.write(np.ascontiguousarray(vectors[start : start + 65536][sel]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        with open(ids_tmp, "wb") as f:
+            f.write(np.ascontiguousarray(ids[mask]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        del vectors, ids
+        os.replace(vec_tmp, self.vec_path)
+        os.replace(ids_tmp, self.ids_path)
+        self.count -= removed
+        self._stamp = self._file_stamp()
+        return removed
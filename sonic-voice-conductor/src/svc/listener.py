@@ -0,0 +1,142 @@
+"""Freihand-Modus: dauerhaft zuhören, Wake-Word-Gate, volle Pipeline nur für durchgelassene Äußerungen."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from svc.stt.wake import WakeWordGate
+
+
+@dataclass
+class DutyCycle:
+    """Wandzeit-Anteile der Stufen seit dem Start; CPU des Prozesses in Phasen ohne Sprache."""
+
+    started: float = field(default_factory=time.perf_counter)
+    gate: float = 0.0
+    pipeline: float = 0.0
+    idle_wall: float = 0.0
+    idle_cpu: float = 0.0
+    utterances: int = 0
+    passed: int = 0
+    errors: int = 0
+
+    @property
+    def idle_cpu_share(self) -> float:
+        return self.idle_cpu / self.idle_wall if self.idle_wall else 0.0
+
+    def summary(self) -> str:
+        wall = max(1e-9, time.perf_counter() - self.started)
+        return (
+            f"Gate {self.gate / wall:.1%}, Pipeline {self.pipeline / wall:.1%}, "
+            f"Leerlauf-CPU {self.idle_cpu_share:.1%}; {self.passed}/{self.utterances} Äußerungen durchgelassen"
+            + (f", {self.errors} Fehler" if self.errors else "")
+        )
+
+
+class ContinuousListener:
+    """
+    Hintergrund-Thread für den Freihand-Modus. Stufe 1 ist `record` (Recorder mit
+    Ringpuffer und Energie-VAD: blockiert ohne Sprache bei geringer Last und liefert
+    leeres Audio nach vad_max_seconds). Stufe 2 ist das WakeWordGate. Nur was beide
+    passiert, wird mit `transcribe` voll dekodiert und ohne Wake-Word an `on_command`
+    gegeben. `armed` (z.B. wartende Rückfrage) öffnet das Gate von außen.
+    Fehler einer Äußerung (Mikrofon, Whisper, on_command) beenden den Thread nicht:
+    sie werden gezählt, an `on_error` gemeldet, und nach einer wachsenden Pause
+    (backoff bis backoff_max Sekunden) wird weiter zugehört.
+    """
+
+    def __init__(
+        self,
+        record: Callable[[], np.ndarray],
+        gate: WakeWordGate,
+        transcribe: Callable[[np.ndarray], str],
+        on_command: Callable[[str], None],
+        on_wake: Callable[[], None] | None = None,
+        armed: Callable[[], bool] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        backoff: float = 0.5,
+        backoff_max: float = 10.0,
+    ):
+        self.record = record
+        self.gate = gate
+        self.transcribe = transcribe
+        self.on_command = on_command
+        self.on_wake = on_wake
+        self.armed = armed
+        self.on_error = on_error
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.last_error: Exception | None = None
+        self.duty = DutyCycle()
+        self.paused = False
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, daemon=True, name="svc-listener")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            if self.paused:
+                self._stop.wait(0.2)
+                continue
+            try:
+                self.listen_once()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                self.duty.errors += 1
+                self.last_error = e
+                if self.on_error is not None:
+                    try:
+                        self.on_error(e)
+                    except Exception:
+                        pass
+                # Mikrofon weg o.ä.: nicht im Takt der Fehler weiterdrehen
+                self._stop.wait(min(self.backoff_max, self.backoff * 2 ** (failures - 1)))
+
+    def listen_once(self) -> str | None:
+        """Eine Äußerung abwarten und durch die Stufen schicken; liefert den Befehl oder None."""
+        duty = self.duty
+        t0, c0 = time.perf_counter(), time.process_time()
+        audio = self.record()
+        if not audio.size:
+            duty.idle_wall += time.perf_counter() - t0
+            duty.idle_cpu += time.process_time() - c0
+            return None
+        duty.utterances += 1
+        forced = self.armed is not None and self.armed()
+        if not forced:
+            t1 = time.perf_counter()
+            ok = self.gate.passes(audio)
+            duty.gate += time.perf_counter() - t1
+            if not ok:
+                return None
+        t2 = time.perf_counter()
+        try:
+            text = self.transcribe(audio)
+            rest = self.gate.split(text)
+            command = text if rest is None else rest
+            if not command:
+                if rest is not None:  # nur das Wake-Word: auf den Befehl warten
+                    self.gate.arm()
+                    if self.on_wake is not None:
+                        self.on_wake()
+                return None
+            self.gate.disarm()
+            duty.passed += 1
+            self.on_command(command)
+            return command
+        finally:
+            duty.pipeline += time.perf_counter() - t2
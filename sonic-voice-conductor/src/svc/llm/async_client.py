@@ -0,0 +1,214 @@
+"""asyncio-Client für Ollama: gepoolte HTTP-Session, Deadlines, Concurrency-Limit, Circuit Breaker."""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import httpx
+import ollama
+
+from .breaker import OPEN, CircuitBreaker
+from .ollama_client import LLMTransportError
+
+_END = object()
+
+
+class CircuitOpenError(LLMTransportError):
+    """Breaker für das Modell ist offen: Call wird ohne Request abgelehnt."""
+
+
+class AsyncOllamaClient:
+    """
+    Ein ollama.AsyncClient (httpx, Keep-alive-Pool) für alle Calls. Jeder Call hat eine
+    Deadline (inkl. Warten auf einen freien Slot), höchstens `max_concurrency` Requests
+    laufen gleichzeitig. Je Modell zählt ein CircuitBreaker Timeouts und
+    Transportfehler; ist er offen, schlägt der Call sofort mit CircuitOpenError fehl –
+    das LLM fällt dann aus, kNN (eigenes Embedding-Modell) läuft weiter.
+    Bis ein Modell einmal geantwortet hat, gilt `load_deadline` (Ollama lädt es erst).
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:11434",
+        deadline: float = 15.0,
+        embed_deadline: float = 3.0,
+        load_deadline: float = 120.0,
+        connect_timeout: float = 2.0,
+        max_concurrency: int = 2,
+        breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+    ):
+        self.deadline = deadline
+        self.embed_deadline = embed_deadline
+        self.load_deadline = load_deadline
+        self._client = ollama.AsyncClient(
+            host=base_url,
+            timeout=httpx.Timeout(max(deadline, load_deadline), connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._breaker_factory = breaker_factory
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._loaded: set[str] = set()
+        self.timeouts = 0
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self.breakers:
+            self.breakers[model] = self._breaker_factory()
+        return self.breakers[model]
+
+    def available(self, model: str) -> bool:
+        """False solange der Breaker des Modells offen ist (ohne einen Probe-Call zu verbrauchen)."""
+        return self.breaker(model).state != OPEN
+
+    def _deadline(self, method: str, model: str) -> float:
+        base = self.embed_deadline if method in ("embed", "embeddings") else self.deadline
+        return base if model in self._loaded else max(base, self.load_deadline)
+
+    def _admit(self, model: str) -> CircuitBreaker:
+        breaker = self.breaker(model)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Ollama-Modell {model} nicht verfügbar (Circuit Breaker offen)")
+        return breaker
+
+    def _failed(self, breaker: CircuitBreaker, e: BaseException) -> LLMTransportError:
+        breaker.record_failure()
+        if isinstance(e, TimeoutError):
+            self.timeouts += 1
+            return LLMTransportError("Ollama-Deadline überschritten")
+        return LLMTransportError(str(e) or type(e).__name__)
+
+    def _response_error(self, breaker: CircuitBreaker, e: ollama.ResponseError) -> Exception:
+        """5xx zählt als Ausfall (LLMTransportError), sonst antwortet der Server: Fehler liegt am Request."""
+        if e.status_code < 500:
+            breaker.record_success()
+            return e
+        return self._failed(breaker, e)
+
+    async def call(self, method: str, **kwargs: Any) -> Any:
+        """Ein nicht gestreamter Call (chat, generate, embed, embeddings) mit Deadline und Breaker."""
+        model = kwargs.get("model", "")
+        breaker = self._admit(model)
+        try:
+            async with asyncio.timeout(self._deadline(method, model)):
+                async with self._sem:
+                    resp = await getattr(self._client, method)(**kwargs)
+        except (TimeoutError, httpx.TransportError, ConnectionError) as e:
+            raise self._failed(breaker, e) from e
+        except ollama.ResponseError as e:
+            error = self._response_error(breaker, e)
+            if error is e:
+                raise
+            raise error from e
+        except BaseException:
+            breaker.release()  # Abbruch/anderer Fehler: Probe nicht blockiert lassen
+            raise
+        breaker.record_success()
+        self._loaded.add(model)
+        return resp
+
+    async def stream(self, method: str, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Gestreamter Call; die Deadline gilt für den ganzen Stream. Der erste Chunk zählt
+        als Erfolg (frühes aclose() danach ist normal); Abbruch vor dem ersten Chunk oder
+        andere Fehler geben nur den Probe-Platz frei.
+        """
+        model = kwargs.get("model", "")
+        breaker = self._admit(model)
+        settled = False
+        try:
+            async with asyncio.timeout(self._deadline(method, model)):
+                async with self._sem:
+                    chunks = await getattr(self._client, method)(stream=True, **kwargs)
+                    async for chunk in chunks:
+                        if not settled:
+                            settled = True
+                            breaker.record_success()
+                            self._loaded.add(model)
+                        yield chunk
+        except (TimeoutError, httpx.TransportError, ConnectionError) as e:
+            settled = True
+            raise self._failed(breaker, e) from e
+        except ollama.ResponseError as e:
+            settled = True
+            error = self._response_error(breaker, e)
+            if error is e:
+                raise
+            raise error from e
+        finally:
+            if not settled:
+                breaker.release()
+
+    async def aclose(self) -> None:
+        await self._client.close()
+
+
+class BlockingOllamaApi:
+    """
+    Synchrone Fassade mit den Signaturen der ollama-Modulfunktionen (chat, generate,
+    embeddings, embed) über einem AsyncOllamaClient, dessen Event-Loop in einem
+    eigenen Thread läuft. Als `api` an OllamaClient übergeben; Streams werden in
+    einem Task gelesen und über eine Queue geliefert, close() bricht den Task (und
+    damit die HTTP-Response) ab.
+    """
+
+    def __init__(self, client: AsyncOllamaClient):
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="svc-ollama", daemon=True)
+        self._thread.start()
+
+    def _run(self, coro: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _call(self, method: str, kwargs: dict[str, Any]) -> Any:
+        if kwargs.pop("stream", False):
+            return self._iterate(method, kwargs)
+        return self._run(self.client.call(method, **kwargs))
+
+    def _iterate(self, method: str, kwargs: dict[str, Any]) -> Iterator[Any]:
+        items: queue.Queue[Any] = queue.Queue()
+
+        async def pump() -> None:
+            try:
+                async for chunk in self.client.stream(method, **kwargs):
+                    items.put(chunk)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                items.put(e)
+                return
+            items.put(_END)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._loop)
+        try:
+            while True:
+                item = items.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def available(self, model: str) -> bool:
+        return self.client.available(model)
+
+    def chat(self, **kwargs: Any) -> Any:
+        return self._call("chat", kwargs)
+
+    def generate(self, **kwargs: Any) -> Any:
+        return self._call("generate", kwargs)
+
+    def embeddings(self, **kwargs: Any) -> Any:
+        return self._call("embeddings", kwargs)
+
+    def embed(self, **kwargs: Any) -> Any:
+        return self._call("embed", kwargs)
+
+    def close(self) -> None:
+        self._run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2.0)
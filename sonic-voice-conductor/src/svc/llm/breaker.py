@@ -0,0 +1,78 @@
+"""Circuit Breaker für Ollama-Calls."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    closed: Calls laufen normal; nach `failure_threshold` Fehlern (Transportfehler oder
+    Deadline überschritten) in Folge -> open. open: Calls werden sofort abgelehnt, bis
+    `reset_after` Sekunden vergangen sind -> half_open: genau ein Probe-Call darf
+    durch; Erfolg schließt, Fehler öffnet erneut.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_after: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_after = reset_after
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_running = False
+        self.trips = 0  # wie oft geöffnet
+        self.rejected = 0  # sofort abgelehnte Calls
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_after:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """True, wenn ein Call laufen darf (im half_open-Zustand nur der erste)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_after:
+                self._state = HALF_OPEN
+                self._probe_running = False
+            if self._state == HALF_OPEN and not self._probe_running:
+                self._probe_running = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_running = False
+
+    def release(self) -> None:
+        """Call endete ohne Ergebnis (abgebrochen, Programmfehler): Probe-Platz freigeben, Zustand bleibt."""
+        with self._lock:
+            self._probe_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.trips += 1
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_running = False
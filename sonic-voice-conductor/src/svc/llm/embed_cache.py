@@ -0,0 +1,121 @@
+"""Embedding-Cache: In-Prozess-LRU vor einer SQLite-Tabelle."""
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """Normalisiert Phrase für Cache-Keys: klein, ohne Satzzeichen am Rand, einfache Leerzeichen."""
+    t = re.sub(r"\s+", " ", text.strip().lower())
+    return t.strip(" .,!?;:\"'")
+
+
+def cache_key(model: str, text: str) -> str:
+    """Content-Adresse für (Modell, normalisierter Text)."""
+    return hashlib.sha1(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Zweistufiger Cache für Embeddings, Key = (embed_model, normalisierter Text).
+    Stufe 1: OrderedDict-LRU im Prozess. Stufe 2: Tabelle embed_cache in der DB,
+    begrenzt auf max_rows (älteste last_used werden verdrängt).
+    """
+
+    def __init__(self, db_path: Path, max_memory: int = 512, max_rows: int = 20000):
+        self.db_path = db_path
+        self.max_memory = max_memory
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._mem: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embed_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_embed_cache_last_used ON embed_cache(last_used)")
+            conn.commit()
+            self._rows = conn.execute("SELECT COUNT(*) FROM embed_cache").fetchone()[0]
+
+    def _remember(self, key: str, vec: list[float]) -> None:
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_memory:
+            self._mem.popitem(last=False)
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        """Cache-Lookup. Zählt Hit/Miss."""
+        key = cache_key(model, text)
+        with self._lock:
+            vec = self._mem.get(key)
+            if vec is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return vec
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT embedding FROM embed_cache WHERE key = ?", (key,)).fetchone()
+            if row:
+                conn.execute("UPDATE embed_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            vec = np.frombuffer(row[0], dtype=np.float32).tolist()
+            self._remember(key, vec)
+            self.hits += 1
+            return vec
+
+    def put(self, model: str, text: str, vec: list[float]) -> None:
+        """Speichert Embedding in beiden Stufen, verdrängt bei Überlauf."""
+        if not vec:
+            return
+        key = cache_key(model, text)
+        with self._lock:
+            self._remember(key, list(vec))
+        with sqlite3.connect(self.db_path) as conn:
+            # rowcount ist bei INSERT OR REPLACE auch fürs Ersetzen 1: nur neue Keys zählen
+            exists = conn.execute("SELECT 1 FROM embed_cache WHERE key = ?", (key,)).fetchone() is not None
+            conn.execute(
+                "INSERT OR REPLACE INTO embed_cache (key, model, text, embedding, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, model, normalize_text(text), np.asarray(vec, dtype=np.float32).tobytes(), time.time()),
+            )
+            if not exists:
+                self._rows += 1
+            if self._rows > self.max_rows:
+                # Auf 90 % kürzen, damit nicht bei jedem put() verdrängt wird
+                keep = int(self.max_rows * 0.9)
+                conn.execute(
+                    "DELETE FROM embed_cache WHERE key NOT IN "
+                    "(SELECT key FROM embed_cache ORDER BY last_used DESC LIMIT ?)",
+                    (keep,),
+                )
+                self._rows = conn.execute("SELECT COUNT(*) FROM embed_cache").fetchone()[0]
+            conn.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate, "rows": self._rows}
@@ -0,0 +1,49 @@
+"""Inkrementeller JSON-Scanner für gestreamte LLM-Ausgaben."""
+from __future__ import annotations
+
+from typing import Iterator
+
+
+class JsonObjectScanner:
+    """
+    Findet vollständige {...}-Objekte in einem Token-Strom, ohne auf das Ende zu warten.
+    Zählt Klammern außerhalb von Strings (inkl. Escapes); Text vor dem ersten "{"
+    und zwischen Objekten wird ignoriert.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, piece: str) -> Iterator[str]:
+        """Verarbeitet ein Stück Text, liefert jedes darin geschlossene Objekt als Text."""
+        start = 0 if self._depth else None
+        for i, ch in enumerate(piece):
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    start = i
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(piece[start : i + 1])
+                    obj = "".join(self._parts)
+                    self._parts = []
+                    start = None
+                    yield obj
+        if self._depth and start is not None:
+            self._parts.append(piece[start:])
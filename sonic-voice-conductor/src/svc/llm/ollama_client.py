@@ -1,38 +1,287 @@
 """Ollama Client: Generate + Embeddings."""
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
-from typing import Any
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterator
 
+import httpx
 import ollama
 
+from .embed_cache import EmbeddingCache
+from .json_scan import JsonObjectScanner
+
+
+@dataclass
+class GenerationTiming:
+    """Zeiten eines gestreamten Intent-Requests in Sekunden (ab Request-Start)."""
+
+    first_token: float = 0.0
+    intent: float | None = None  # erstes vollständiges JSON-Objekt, None wenn keins kam
+    total: float = 0.0  # bis der Stream beendet bzw. abgebrochen war
+    cut_off: bool = False  # nach dem JSON-Objekt abgebrochen statt zu Ende generiert
+    prompt_eval: float | None = None  # laut Ollama (nur wenn die Antwort zu Ende lief)
+    prompt_tokens: int | None = None
+
+
+# Priming für den Session-Modus: nur der System-Prompt mit leerem User-Turn. Ollama behandelt
+# prompt="" als reines Laden (ohne context), daher ein Leerzeichen; num_predict=1 verhindert,
+# dass das Modell eine Beispielantwort erfindet, die jeder Request als Vorgeschichte mitsähe.
+_PRIME_PROMPT = " "
+_PRIME_OPTIONS = {"num_predict": 1}
+
+
+class LLMTransportError(ConnectionError):
+    """Ollama nicht erreichbar, Timeout oder Verbindung während der Antwort abgebrochen."""
+
 
 class OllamaClient:
-    """Lokaler Ollama-Client für LLM und Embeddings."""
+    """
+    Lokaler Ollama-Client für LLM und Embeddings.
+    response_format: Ollama `format` für Chat-Requests ("json" oder ein JSON-Schema,
+    z.B. intent_json_schema()); das Modell kann dann nur passende Objekte erzeugen.
+    session: System-Prompt einmal über /api/generate vorverarbeiten und dessen
+    `context` für jeden Request wiederverwenden; Ollama wertet dann nur noch den
+    kurzen User-Teil aus. Ändern sich Modell, System-Prompt oder Format, wird neu
+    geprimt. keep_alive hält Modell (und KV-Cache) geladen.
+    api: Objekt mit chat/generate/embeddings/embed wie das ollama-Modul (Default),
+    z.B. BlockingOllamaApi für gepoolte Verbindungen, Deadlines und Circuit Breaker.
+    """
 
-    def __init__(self, base_url: str = "http://127.0.0.1:11434", llm_model: str = "llama3.2", embed_model: str = "nomic-embed-text"):
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:11434",
+        llm_model: str = "llama3.2",
+        embed_model: str = "nomic-embed-text",
+        embed_cache: EmbeddingCache | None = None,
+        response_format: str | dict[str, Any] | None = None,
+        session: bool = False,
+        keep_alive: str | float | None = None,
+        api: Any = None,
+    ):
         self.base_url = base_url
         self.llm_model = llm_model
         self.embed_model = embed_model
+        self.embed_cache = embed_cache
+        self.response_format = response_format
+        self.session = session
+        self.keep_alive = keep_alive
+        self.api = api if api is not None else ollama  # ollama-Modul oder BlockingOllamaApi
+        self._session_ctx: tuple[str, list[int]] | None = None  # (Schlüssel, context-Tokens)
+        self._session_lock = threading.Lock()
+        self.session_primes = 0
+        self.timings: deque[GenerationTiming] = deque(maxlen=100)
         os.environ.setdefault("OLLAMA_HOST", base_url)
 
-    def generate(self, system: str, user: str) -> str:
-        """LLM-Generierung. Liefert Rohtext."""
-        resp = ollama.chat(
-            model=self.llm_model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": user},
-            ],
-        )
+    def llm_available(self) -> bool:
+        """False, solange ein Circuit Breaker das LLM sperrt (nur mit BlockingOllamaApi)."""
+        available = getattr(self.api, "available", None)
+        return True if available is None else available(self.llm_model)
+
+    def _messages(self, system: str, user: str) -> list[dict[str, str]]:
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ]
+
+    def _keep_alive(self) -> dict[str, Any]:
+        return {} if self.keep_alive is None else {"keep_alive": self.keep_alive}
+
+    def _options(self) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {"model": self.llm_model, **self._keep_alive()}
+        if self.response_format is not None:
+            kwargs["format"] = self.response_format
+        return kwargs
+
+    def _session_key(self, system: str) -> str:
+        fmt = json.dumps(self.response_format, sort_keys=True)
+        return hashlib.sha1(f"{self.llm_model}\0{system}\0{fmt}".encode("utf-8")).hexdigest()
+
+    def _session_context(self, system: str) -> list[int]:
+        """context-Tokens des geprimten System-Prompts (primt bei geändertem Schlüssel neu)."""
+        key = self._session_key(system)
+        with self._session_lock:
+            if self._session_ctx is None or self._session_ctx[0] != key:
+                resp = self.api.generate(
+                    prompt=_PRIME_PROMPT, system=system, options=_PRIME_OPTIONS, **self._options()
+                )
+                self._session_ctx = (key, list(resp.get("context") or []))
+                self.session_primes += 1
+            return self._session_ctx[1]
+
+    def invalidate_session(self) -> None:
+        """Verwirft den geprimten Kontext (z.B. nach Modellwechsel auf dem Server)."""
+        with self._session_lock:
+            self._session_ctx = None
+
+    def warm_up_llm(self, system: str) -> None:
+        """
+        Modell laden und System-Prompt einmal auswerten, ohne Timing zu erfassen.
+        Im Session-Modus ist das genau das Priming; sonst ein Request mit leerem
+        User-Turn, dessen Prompt-Präfix Ollama für den ersten echten Request noch im Cache hat.
+        """
+        if self.session:
+            try:
+                self._session_context(system)
+            except (httpx.TransportError, ConnectionError) as e:
+                raise LLMTransportError(str(e)) from e
+            return
+        try:
+            self.api.chat(messages=self._messages(system, ""), options=_PRIME_OPTIONS, **self._options())
+        except (httpx.TransportError, ConnectionError) as e:
+            raise LLMTransportError(str(e)) from e
+
+    def ping_llm(self) -> None:
+        """Keep-alive: leerer Prompt lädt das Modell bzw. setzt dessen keep_alive neu, erzeugt keine Tokens."""
+        try:
+            self.api.generate(model=self.llm_model, prompt="", **self._keep_alive())
+        except (httpx.TransportError, ConnectionError) as e:
+            raise LLMTransportError(str(e)) from e
+
+    def ping_embed(self) -> None:
+        """Keep-alive für das Embedding-Modell (am Cache vorbei, damit Ollama den Request sieht)."""
+        try:
+            self.api.embed(model=self.embed_model, input="warmup", **self._keep_alive())
+        except (httpx.TransportError, ConnectionError) as e:
+            raise LLMTransportError(str(e)) from e
+
+    def _chat(self, system: str, user: str, stream: bool = False) -> Any:
+        """Chat-Request bzw. im Session-Modus /api/generate mit geprimtem context."""
+        try:
+            if self.session:
+                context = self._session_context(system)
+                return self.api.generate(prompt=user, context=context, stream=stream, **self._options())
+            return self.api.chat(messages=self._messages(system, user), stream=stream, **self._options())
+        except (httpx.TransportError, ConnectionError) as e:
+            raise LLMTransportError(str(e)) from e
+
+    def _content(self, resp: Any) -> str:
+        if self.session:
+            return resp.get("response") or ""
         return (resp.get("message") or {}).get("content", "")
 
+    def _record_eval(self, resp: Any, timing: GenerationTiming) -> None:
+        if resp.get("prompt_eval_duration") is not None:
+            timing.prompt_eval = resp["prompt_eval_duration"] / 1e9
+            timing.prompt_tokens = resp.get("prompt_eval_count")
+
+    def generate(self, system: str, user: str, cancel: threading.Event | None = None) -> str:
+        """
+        LLM-Generierung. Liefert Rohtext.
+        Mit `cancel` wird gestreamt: ist das Event gesetzt, wird der HTTP-Stream beim
+        nächsten Chunk geschlossen (Ollama bricht die Generierung dann ab) und "" geliefert.
+        """
+        if cancel is None:
+            t0 = time.perf_counter()
+            resp = self._chat(system, user)
+            timing = GenerationTiming(total=time.perf_counter() - t0)
+            self._record_eval(resp, timing)
+            self.timings.append(timing)
+            return self._content(resp)
+        parts: list[str] = []
+        stream = self._stream_chat(system, user)
+        try:
+            for piece in stream:
+                if cancel.is_set():
+                    return ""
+                parts.append(piece)
+        finally:
+            stream.close()  # schließt die HTTP-Response
+        return "" if cancel.is_set() else "".join(parts)
+
+    def generate_json(
+        self, system: str, user: str, cancel: threading.Event | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Gestreamte Generierung mit frühem Abbruch: sobald das erste vollständige
+        JSON-Objekt steht, wird der Stream geschlossen und das Dict geliefert. Tokens,
+        die das Modell danach noch erzeugen würde, fallen weg. Zeiten in self.timings.
+        """
+        timing = GenerationTiming()
+        scanner = JsonObjectScanner()
+        t0 = time.perf_counter()
+        stream = self._stream_chat(system, user, timing)
+        data: dict[str, Any] | None = None
+        try:
+            for piece in stream:
+                if cancel is not None and cancel.is_set():
+                    return None
+                if not timing.first_token:
+                    timing.first_token = time.perf_counter() - t0
+                for obj in scanner.feed(piece):
+                    try:
+                        data = json.loads(obj)
+                    except json.JSONDecodeError:
+                        continue
+                    timing.intent = time.perf_counter() - t0
+                    break
+                if data is not None:
+                    timing.cut_off = True
+                    break
+        finally:
+            stream.close()
+            timing.total = time.perf_counter() - t0
+            if cancel is None or not cancel.is_set():
+                self.timings.append(timing)
+        return data
+
+    def _stream_chat(self, system: str, user: str, timing: GenerationTiming | None = None) -> Iterator[str]:
+        """Gestreamter Chat, liefert Content-Stücke. Prompt-Eval-Zeit landet in `timing`."""
+        chunks = self._chat(system, user, stream=True)
+        try:
+            for chunk in chunks:
+                if timing is not None and chunk.get("done"):
+                    self._record_eval(chunk, timing)
+                piece = self._content(chunk)
+                if piece:
+                    yield piece
+        except httpx.TransportError as e:
+            raise LLMTransportError(str(e)) from e
+        finally:
+            chunks.close()
+
     def embed(self, text: str) -> list[float]:
-        """Embedding für einen Text. Liefert Vektor."""
-        resp = ollama.embeddings(model=self.embed_model, prompt=text)
-        return resp.get("embedding", [])
+        """
+        Embedding für einen Text. Liefert Vektor.
+        Mit embed_cache kommen wiederholte Phrasen ohne Ollama-Roundtrip aus dem Cache;
+        der normalisierte Text ist nur der Cache-Key, eingebettet wird immer `text`.
+        """
+        if self.embed_cache is None:
+            resp = self.api.embeddings(model=self.embed_model, prompt=text, **self._keep_alive())
+            return resp.get("embedding", [])
+        cached = self.embed_cache.get(self.embed_model, text)
+        if cached is not None:
+            return cached
+        resp = self.api.embeddings(model=self.embed_model, prompt=text, **self._keep_alive())
+        emb = resp.get("embedding", [])
+        self.embed_cache.put(self.embed_model, text, emb)
+        return emb
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embeddings für mehrere Texte in einem Request (/api/embed mit input-Liste)."""
+        if not texts:
+            return []
+        if self.embed_cache is None:
+            resp = self.api.embed(model=self.embed_model, input=list(texts), **self._keep_alive())
+            return [list(e) for e in resp.get("embeddings", [])]
+        out: list[list[float] | None] = [self.embed_cache.get(self.embed_model, t) for t in texts]
+        missing = [i for i, e in enumerate(out) if e is None]
+        if missing:
+            resp = self.api.embed(
+                model=self.embed_model,
+                input=[texts[i] for i in missing],
+                **self._keep_alive(),
+            )
+            for i, emb in zip(missing, resp.get("embeddings", [])):
+                out[i] = list(emb)
+                self.embed_cache.put(self.embed_model, texts[i], out[i])
+        return [e or [] for e in out]
 
     @staticmethod
     def extract_json(text: str) -> dict[str, Any] | None:
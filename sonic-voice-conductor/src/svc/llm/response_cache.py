@@ -0,0 +1,137 @@
+"""Persistenter Cache für LLM-Antworten (extrahiertes JSON) in der SQLite-DB."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .embed_cache import normalize_text
+from .prompts import INTENT_USER_TEMPLATE
+
+
+def prompt_hash(system: str, response_format: str | dict[str, Any] | None = None) -> str:
+    """Version von System-Prompt, User-Template und Antwortformat; ändert sich eins, passt kein alter Eintrag mehr."""
+    fmt = json.dumps(response_format, sort_keys=True)
+    return hashlib.sha1(f"{system}\0{INTENT_USER_TEMPLATE}\0{fmt}".encode("utf-8")).hexdigest()[:16]
+
+
+class LLMResponseCache:
+    """
+    Key = (llm_model, prompt_hash(System-Prompt, Template, Format), normalisierter User-Prompt),
+    Wert = das aus der Antwort extrahierte JSON-Objekt. Einträge laufen nach ttl_seconds
+    ab; über max_rows werden die am längsten ungenutzten verdrängt. purge() räumt nach
+    einer Änderung in svc.llm.prompts auf (svc purge-llm-cache).
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        model: str,
+        response_format: str | dict[str, Any] | None = None,
+        max_rows: int = 5000,
+        ttl_seconds: float = 30 * 86400.0,
+    ):
+        self.db_path = db_path
+        self.model = model
+        self.response_format = response_format
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    response_json TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache(last_used)")
+            conn.commit()
+            self._rows = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def _key(self, system: str, user: str) -> tuple[str, str]:
+        version = prompt_hash(system, self.response_format)
+        key = hashlib.sha1(f"{self.model}\0{version}\0{normalize_text(user)}".encode("utf-8")).hexdigest()
+        return key, version
+
+    def get(self, system: str, user: str) -> dict[str, Any] | None:
+        """Gecachtes JSON oder None (abgelaufene Einträge werden dabei gelöscht)."""
+        key, _ = self._key(system, user)
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT response_json, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row and row[1] + self.ttl_seconds < now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._rows -= 1
+                row = None
+            elif row:
+                conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, system: str, user: str, data: dict[str, Any]) -> None:
+        """Speichert das JSON, verdrängt bei Überlauf auf 90 % von max_rows."""
+        key, version = self._key(system, user)
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            # rowcount ist bei INSERT OR REPLACE auch fürs Ersetzen 1: nur neue Keys zählen
+            exists = conn.execute("SELECT 1 FROM llm_cache WHERE key = ?", (key,)).fetchone() is not None
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, prompt_hash, prompt, response_json, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, self.model, version, normalize_text(user), json.dumps(data, ensure_ascii=False), now, now),
+            )
+            if not exists:
+                self._rows += 1
+            if self._rows > self.max_rows:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key NOT IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT ?)",
+                    (int(self.max_rows * 0.9),),
+                )
+                self._rows = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            conn.commit()
+
+    def purge(self, system: str | None = None) -> int:
+        """
+        Löscht abgelaufene Einträge und alle dieses Modells, die nicht zum aktuellen
+        System-Prompt/Template passen. system=None: den ganzen Cache. Liefert die Anzahl.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            if system is None:
+                cur = conn.execute("DELETE FROM llm_cache")
+            else:
+                cur = conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at < ? OR (model = ? AND prompt_hash != ?)",
+                    (time.time() - self.ttl_seconds, self.model, prompt_hash(system, self.response_format)),
+                )
+            conn.commit()
+            self._rows = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return cur.rowcount
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -1,21 +1,27 @@
 """CLI Entry: sonic-voice-conductor / svc."""
 from __future__ import annotations
 
+import argparse
 import json
 import sys
 from pathlib import Path
+from statistics import median
 
 # Ensure src is on path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from svc.config import Config, get_data_dir
-from svc.audio import Recorder, resolve_device, list_devices
-from svc.stt import WhisperSTT
-from svc.llm import OllamaClient
+from svc.audio import Preprocessor, Recorder, VADSettings, resolve_device, list_devices
+from svc.stt import STTPool, StreamingTranscriber, WakeWordGate, WhisperSTT
+from svc.llm import OllamaClient, EmbeddingCache
+from svc.llm.async_client import AsyncOllamaClient, BlockingOllamaApi
+from svc.llm.breaker import CircuitBreaker
+from svc.llm.response_cache import LLMResponseCache
 from svc.llm.prompts import INTENT_SYSTEM_PROMPT, build_intent_prompt
-from svc.intent import IntentParser
+from svc.intent import IntentParser, GrammarMatcher, IntentCache
 from svc.intent.knn_store import KNNStore
-from svc.intent.rules import apply_context_rules
+from svc.intent.rules import ALLOWED_INTENTS, apply_context_rules
+from svc.intent.schema import intent_json_schema
 from svc.osc.client import OSCClient
 from svc.osc.protocol import intent_to_osc_messages
 from svc.memory.db import init_db, get_db_path
@@ -25,7 +31,10 @@ from svc.profiles import get_profile
 from svc.profiles.profiles import clamp_to_profile
 from svc.macros.registry import get_macro
 from svc.macros.engine import MacroEngine
-from svc.scheduler import Scheduler
+from svc.scheduler import Scheduler, TickJitter
+from svc.ui.tui import PartialLine
+from svc.listener import ContinuousListener
+from svc.warmup import Warmup
 
 
 # Globals für Controller-State
@@ -44,6 +53,8 @@ _osc_client = None
 _db_path = None
 _macro_engine = None
 _scheduler = None
+_last_activity = 0.0  # time.monotonic() des letzten Befehls
+_last_compaction = None  # CompactionResult der letzten Hintergrund-Kompaktierung
 
 
 def apply_intent(intent, phrase: str, method: str) -> None:
@@ -77,23 +88,298 @@ def apply_intent(intent, phrase: str, method: str) -> None:
         log_event(_db_path, intent.intent, phrase, method, intent.slots_dict(), json.dumps(msgs))
 
 
-def main() -> int:
+def build_ollama(config: Config, db_path: Path, live: bool = False) -> OllamaClient:
+    """OllamaClient inkl. Embedding-Cache laut Config (live: mit Deadlines und Circuit Breaker)."""
+    api = None
+    if live and config.ollama_async:
+        api = BlockingOllamaApi(
+            AsyncOllamaClient(
+                base_url=config.ollama_base_url,
+                deadline=config.ollama_deadline,
+                embed_deadline=config.ollama_embed_deadline,
+                max_concurrency=config.ollama_max_concurrency,
+                breaker_factory=lambda: CircuitBreaker(config.ollama_breaker_failures, config.ollama_breaker_reset),
+            )
+        )
+    embed_cache = None
+    if config.embed_cache_size > 0:
+        embed_cache = EmbeddingCache(
+            db_path,
+            max_memory=config.embed_cache_size,
+            max_rows=config.embed_cache_max_rows,
+        )
+    return OllamaClient(
+        base_url=config.ollama_base_url,
+        llm_model=config.llm_model,
+        embed_model=config.embed_model,
+        embed_cache=embed_cache,
+        response_format=intent_json_schema(ALLOWED_INTENTS) if config.llm_schema else None,
+        session=config.llm_session,
+        keep_alive=config.llm_keep_alive,
+        api=api,
+    )
+
+
+def vad_settings(config: Config) -> VADSettings:
+    return VADSettings(
+        threshold_db=config.vad_threshold_db,
+        zcr_max=config.vad_zcr_max,
+        silence_ms=config.vad_silence_ms,
+        min_speech_ms=config.vad_min_speech_ms,
+        pad_ms=config.vad_pad_ms,
+    )
+
+
+def build_stt(config: Config) -> WhisperSTT | STTPool:
+    """Whisper im eigenen Prozess (angewärmt) oder als Worker-Pool (wärmt in start() selbst an)."""
+    if config.stt_workers > 0:
+        pool = STTPool(
+            workers=config.stt_workers,
+            sample_rate=config.sample_rate,
+            max_seconds=max(config.record_seconds, config.vad_max_seconds) + 1,
+            model_size=config.whisper_model_size,
+            language=config.language,
+            profile=config.stt_profile,
+            data_dir=get_data_dir(config),
+        )
+        pool.start(timeout=600)
+        return pool
+    model = WhisperSTT(
+        model_size=config.whisper_model_size,
+        language=config.language,
+        profile=config.stt_profile,
+        data_dir=get_data_dir(config),
+    )
+    model.warm_up(sample_rate=config.sample_rate)
+    return model
+
+
+def build_llm_cache(config: Config, db_path: Path) -> LLMResponseCache:
+    return LLMResponseCache(
+        db_path,
+        model=config.llm_model,
+        response_format=intent_json_schema(ALLOWED_INTENTS) if config.llm_schema else None,
+        max_rows=config.llm_cache_max_rows,
+        ttl_seconds=config.llm_cache_ttl_days * 86400,
+    )
+
+
+def build_knn_store(config: Config, db_path: Path, ollama: OllamaClient) -> KNNStore:
+    return KNNStore(
+        db_path,
+        ollama.embed,
+        index_mode=config.knn_index,
+        nprobe=config.knn_nprobe,
+        ann_min_examples=config.knn_ann_min_examples,
+        storage=config.knn_storage,
+        dtype=config.knn_dtype,
+        rerank=config.knn_rerank,
+    )
+
+
+def cmd_import_examples(config: Config, args: argparse.Namespace) -> int:
+    """svc import-examples: JSONL/CSV mit gebündelten Embeddings importieren."""
+    from rich.console import Console
+    from rich.progress import Progress
+
+    from svc.intent.importer import import_examples
+
+    data_dir = get_data_dir(config)
+    init_db(data_dir)
+    db_path = get_db_path(data_dir)
+    ollama = build_ollama(config, db_path)
+    store = build_knn_store(config, db_path, ollama)
+    console = Console()
+    with Progress(console=console) as progress:
+        task = progress.add_task("Importiere Examples", total=None)
+
+        def on_progress(done: int, total: int) -> None:
+            progress.update(task, completed=done, total=total)
+
+        result = import_examples(
+            store,
+            args.path,
+            ollama.embed_batch,
+            fmt=args.format,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            progress=on_progress,
+        )
+    store.flush()
+    console.print(
+        f"[green]{result.imported} importiert[/], {result.skipped_existing} schon vorhanden, "
+        f"{result.skipped_invalid} ungültig"
+    )
+    return 0
+
+
+def cmd_compact_examples(config: Config, args: argparse.Namespace) -> int:
+    """svc compact-examples: nahezu identische Examples zusammenführen."""
+    from rich.console import Console
+
+    from svc.intent.compaction import compact_examples
+
+    data_dir = get_data_dir(config)
+    init_db(data_dir)
+    db_path = get_db_path(data_dir)
+    store = build_knn_store(config, db_path, build_ollama(config, db_path))
+    threshold = args.threshold if args.threshold is not None else config.compact_threshold
+    result = compact_examples(store, threshold, dry_run=args.dry_run, vacuum=not args.dry_run)
+    console = Console()
+    verb = "würden entfernt" if args.dry_run else "entfernt"
+    console.print(
+        f"{result.examples_before} Examples, [green]{result.removed} {verb}[/] "
+        f"({result.clusters} Cluster, Schwelle {threshold:.2f})"
+    )
+    if not args.dry_run:
+        console.print(
+            f"Suche p50: {result.latency_before_ms:.2f} ms -> {result.latency_after_ms:.2f} ms, "
+            f"DB: {result.db_bytes_before / 1024:.0f} KB -> {result.db_bytes_after / 1024:.0f} KB"
+        )
+    return 0
+
+
+def cmd_purge_llm_cache(config: Config, args: argparse.Namespace) -> int:
+    """svc purge-llm-cache: veraltete (oder mit --all alle) gecachten LLM-Antworten löschen."""
+    from rich.console import Console
+
+    data_dir = get_data_dir(config)
+    init_db(data_dir)
+    cache = build_llm_cache(config, get_db_path(data_dir))
+    removed = cache.purge(None if args.all else INTENT_SYSTEM_PROMPT)
+    console = Console()
+    console.print(f"[green]{removed} Einträge gelöscht[/], {len(cache)} verbleiben.")
+    return 0
+
+
+def _record_tune_fixtures(config: Config, directory: Path) -> None:
+    """Die mitgelieferten TUNE_PHRASES einmal einsprechen: name.wav + name.txt je Phrase."""
+    from rich.console import Console
+
+    from svc.audio.wav import write_wav
+    from svc.stt.tuning import TUNE_PHRASES
+
+    console = Console()
+    recorder = Recorder(
+        sample_rate=config.sample_rate,
+        record_seconds=config.record_seconds,
+        device=resolve_device(config.mic_device),
+        vad=vad_settings(config) if config.vad_enabled else None,
+        vad_max_seconds=config.vad_max_seconds,
+    )
+    directory.mkdir(parents=True, exist_ok=True)
+    for i, phrase in enumerate(TUNE_PHRASES, 1):
+        console.input(f"[{i}/{len(TUNE_PHRASES)}] Enter drücken, dann sagen: [bold]{phrase}[/] ")
+        audio = recorder.record()
+        write_wav(directory / f"phrase_{i:02d}.wav", audio, config.sample_rate)
+        (directory / f"phrase_{i:02d}.txt").write_text(phrase + "\n", encoding="utf-8")
+
+
+def cmd_tune_stt(config: Config, args: argparse.Namespace) -> int:
+    """svc tune-stt: compute_type/cpu_threads/num_workers auf diesem Rechner messen und speichern."""
+    from rich.console import Console
+
+    from svc.stt.tuning import (
+        FIXTURE_DIR, SttTuning, candidates, load_wav_fixtures, machine_id, save_tuning, tune,
+    )
+
+    data_dir = get_data_dir(config)
+    directory = args.fixtures or data_dir / FIXTURE_DIR
+    if args.record:
+        _record_tune_fixtures(config, directory)
+    console = Console()
+    fixtures = load_wav_fixtures(directory, config.sample_rate) if directory.is_dir() else []
+    if not fixtures:
+        console.print(f"[red]Keine WAV-Fixtures in {directory}[/] – mit --record einsprechen oder --fixtures angeben")
+        return 1
+    labelled = sum(1 for _, _, transcript in fixtures if transcript)
+    console.print(f"{len(fixtures)} Fixtures ({labelled} mit Transkript), Modell {config.whisper_model_size}")
+
+    def make_stt(**options) -> WhisperSTT:
+        return WhisperSTT(
+            model_size=config.whisper_model_size, language=config.language, profile=config.stt_profile, **options
+        )
+
+    def on_result(r) -> None:
+        o = r.options
+        console.print(
+            f"  {o['compute_type']:<13} threads={o['cpu_threads']:<2} workers={o['num_workers']}  "
+            f"{r.latency_ms:>7.0f} ms  WER {r.wer:.1%}"
+        )
+
+    best, _ = tune(fixtures, make_stt, candidates(), args.tolerance, on_result)
+    tuning = SttTuning(
+        model_size=config.whisper_model_size,
+        latency_ms=best.latency_ms,
+        wer=best.wer,
+        machine=machine_id(),
+        **best.options,
+    )
+    path = save_tuning(data_dir, tuning)
+    console.print(
+        f"[green]Beste Kombination[/]: {tuning.compute_type}, {tuning.cpu_threads} Threads, "
+        f"{tuning.num_workers} Worker ({tuning.latency_ms:.0f} ms, WER {tuning.wer:.1%}) -> {path}"
+    )
+    return 0
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(prog="svc", description="Sonic Voice Conductor")
+    ap.add_argument("--config", type=Path, default=None, help="Pfad zur config.yaml")
+    sub = ap.add_subparsers(dest="command")
+    imp = sub.add_parser("import-examples", help="Examples aus JSONL/CSV importieren")
+    imp.add_argument("path", type=Path, help="JSONL ({phrase, intent, slots}) oder CSV (phrase,intent,slots)")
+    imp.add_argument("--format", choices=("jsonl", "csv"), default=None, help="Standard: nach Dateiendung")
+    imp.add_argument("--batch-size", type=int, default=64, help="Texte pro Embed-Request")
+    imp.add_argument("--concurrency", type=int, default=4, help="Parallele Embed-Requests")
+    comp = sub.add_parser("compact-examples", help="Nahezu identische Examples zusammenführen")
+    comp.add_argument("--threshold", type=float, default=None, help="Cosine-Schwelle (Standard: compact_threshold)")
+    comp.add_argument("--dry-run", action="store_true", help="Nur zählen, nichts ändern")
+    purge = sub.add_parser("purge-llm-cache", help="Gecachte LLM-Antworten löschen (nach Prompt-Änderungen)")
+    purge.add_argument("--all", action="store_true", help="Alles löschen statt nur veralteter Einträge")
+    tune_stt = sub.add_parser("tune-stt", help="Whisper compute_type/Threads auf diesem Rechner abstimmen")
+    tune_stt.add_argument("--fixtures", type=Path, default=None, help="name.wav (+ name.txt); Standard: <data_dir>/stt_fixtures")
+    tune_stt.add_argument("--record", action="store_true", help="Mitgelieferte Testphrasen vorher einsprechen")
+    tune_stt.add_argument("--tolerance", type=float, default=0.02, help="Erlaubter WER-Anstieg gegenüber float32")
+    return ap.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    config = Config.load(args.config)
+    if args.command == "import-examples":
+        return cmd_import_examples(config, args)
+    if args.command == "compact-examples":
+        return cmd_compact_examples(config, args)
+    if args.command == "purge-llm-cache":
+        return cmd_purge_llm_cache(config, args)
+    if args.command == "tune-stt":
+        return cmd_tune_stt(config, args)
+    return run_live(config)
+
+
+def run_live(config: Config) -> int:
+    """Live-Betrieb: Push-to-talk + TUI."""
     global _state, _last_phrase, _last_intent, _last_confidence, _last_method
     global _scheduled, _active_macro, _message, _waiting_confirm, _pending_suggestion, _correction_mode
-    global _osc_client, _db_path, _macro_engine, _scheduler
+    global _osc_client, _db_path, _macro_engine, _scheduler, _last_activity
 
-    config = Config.load()
     data_dir = get_data_dir(config)
     _db_path = get_db_path(data_dir)
     init_db(data_dir)
 
     # Init Komponenten
-    ollama = OllamaClient(
-        base_url=config.ollama_base_url,
-        llm_model=config.llm_model,
-        embed_model=config.embed_model,
-    )
-    knn_store = KNNStore(_db_path, ollama.embed)
+    ollama = build_ollama(config, _db_path, live=True)
+    embed_cache = ollama.embed_cache
+    knn_store = build_knn_store(config, _db_path, ollama)
+    knn_store.load()
+    llm_cache = None
+    if config.llm_cache_max_rows > 0:
+        llm_cache = build_llm_cache(config, _db_path)
+        llm_cache.purge(INTENT_SYSTEM_PROMPT)  # Einträge zu geänderten Prompts sind nie mehr gültig
+    intent_cache = None
+    if config.intent_cache_size > 0:
+        intent_cache = IntentCache(config.intent_cache_size, config.intent_cache_ttl)
     parser = IntentParser(
         knn_store=knn_store,
         llm_generate=ollama.generate,
@@ -101,14 +387,75 @@ def main() -> int:
         knn_auto=config.knn_auto,
         knn_suggest=config.knn_suggest,
         llm_auto_conf=config.llm_auto_conf,
+        grammar=GrammarMatcher() if config.grammar_enabled else None,
+        cache=intent_cache,
+        speculative=config.llm_speculative,
+        llm_generate_json=ollama.generate_json if config.llm_stream else None,
+        constrained=config.llm_schema,
+        llm_available=ollama.llm_available,
+        llm_cache=llm_cache,
     )
     _osc_client = OSCClient(host=config.osc_host, port=config.osc_port)
     recorder = Recorder(
         sample_rate=config.sample_rate,
         record_seconds=config.record_seconds,
         device=resolve_device(config.mic_device),
+        vad=vad_settings(config) if config.vad_enabled else None,
+        vad_max_seconds=config.vad_max_seconds,
+        persistent=config.audio_persistent,
+        preroll_ms=config.preroll_ms,
+        ring_seconds=max(config.ring_seconds, config.vad_max_seconds + config.preroll_ms / 1000 + 1),
     )
-    stt = WhisperSTT(model_size=config.whisper_model_size, language=config.language)
+    recorder.start()
+
+    # Modelle im Hintergrund laden/anwärmen, während die TUI schon läuft
+    stt: WhisperSTT | STTPool | None = None
+    warmup: Warmup | None = None
+
+    def load_stt() -> None:
+        nonlocal stt
+        stt = build_stt(config)
+
+    if config.warmup:
+        warmup = Warmup(
+            steps={
+                "Whisper": load_stt,
+                "Embeddings": ollama.ping_embed,
+                "LLM": lambda: ollama.warm_up_llm(INTENT_SYSTEM_PROMPT),
+            },
+            pings={"Embeddings": ollama.ping_embed, "LLM": ollama.ping_llm},
+            interval=config.keepalive_interval,
+        )
+    else:
+        stt = build_stt(config)
+
+    preprocessor = None
+    if config.stt_preprocess:
+        preprocessor = Preprocessor(vad_settings(config), config.sample_rate, config.preprocess_peak)
+
+    streamer = None
+    if config.stt_streaming and config.vad_enabled:
+        streamer = StreamingTranscriber(
+            # Jedes Dekodierfenster und das finale Segment laufen durch die Vorverarbeitung
+            lambda audio: transcribe_capture(audio),
+            sample_rate=config.sample_rate,
+            step_seconds=config.stt_stream_step,
+            on_hypothesis=PartialLine().update,
+        )
+
+    def capture_phrase() -> str:
+        """Aufnehmen und transkribieren; gestreamt liegt die Phrase direkt am Sprachende vor."""
+        if streamer is not None:
+            streamer.reset()
+            audio = recorder.record(on_block=streamer.feed)
+            return streamer.finish(recorder.last_endpointer) if audio.size else ""
+        return transcribe_capture(recorder.record())
+
+    def transcribe_capture(audio) -> str:
+        """Vorverarbeiten und dekodieren; ohne stimmhaften Rest wird Whisper übersprungen."""
+        if preprocessor is not None:
+            audio = preprocessor(audio)
+        return stt.transcribe(audio) if audio.size else ""  # keine Sprache -> leer
 
     # State
     _state = {
@@ -133,13 +480,30 @@ def main() -> int:
     # Background-Tick für Scheduler + Makro (wird in TUI-Loop aufgerufen)
     import threading
     _tick_stop = threading.Event()
+    tick_jitter = TickJitter(period=0.15)
     def tick_loop():
         while not _tick_stop.wait(0.15):
+            tick_jitter.mark()
             _scheduler.set_bpm(_state.get("bpm", 128))
             _scheduler.tick()
             _macro_engine.tick()
     _tick_thread = threading.Thread(target=tick_loop, daemon=True)
     _tick_thread.start()
+    if warmup is not None:
+        warmup.start(_tick_stop)
+
+    # Hintergrund-Kompaktierung im Leerlauf (nur wenn seitdem Examples dazukamen)
+    import time
+    _last_activity = time.monotonic()
+    def compact_loop():
+        global _last_compaction
+        from svc.intent.compaction import compact_examples
+        while not _tick_stop.wait(30.0):
+            idle = time.monotonic() - _last_activity
+            if idle >= config.compact_idle_minutes * 60 and knn_store.added_since_compact > 0:
+                _last_compaction = compact_examples(knn_store, config.compact_threshold)
+    if config.compact_idle_minutes > 0:
+        threading.Thread(target=compact_loop, daemon=True).start()
 
     def do_record_and_process() -> None:
         global _last_phrase, _last_intent, _last_confidence, _last_method, _message, _waiting_confirm
@@ -149,8 +513,11 @@ def main() -> int:
         else:
             _message = ""
         _waiting_confirm = False
-        audio = recorder.record()
-        phrase = stt.transcribe(audio)
+        process_phrase(capture_phrase())
+
+    def process_phrase(phrase: str) -> None:
+        global _last_phrase, _last_intent, _last_confidence, _last_method, _message, _waiting_confirm
+        global _pending_suggestion, _correction_mode
         if not phrase:
             _message = "Nichts erkannt."
             return
@@ -170,13 +537,13 @@ def main() -> int:
         intent, method = parser.parse(phrase)
         intent = apply_context_rules(intent, _state)
 
-        if method in ("knn_auto", "llm_auto"):
+        if method.endswith("_auto"):
             apply_intent(intent, phrase, method)
             _last_phrase, _last_intent = phrase, intent.intent
             _last_confidence, _last_method = intent.confidence, method
             return
 
-        if method in ("knn_suggest", "llm_suggest"):
+        if method.endswith("_suggest"):
             _pending_suggestion = (intent, phrase)
             _message = "Unsicher. Sag: ja / nein / abbrechen"
             _waiting_confirm = True
@@ -215,12 +582,66 @@ def main() -> int:
         """Verarbeitet Phrase direkt (für Confirm-Aufnahme)."""
         do_confirm(phrase)
 
+    # Freihand-Modus: Listener-Thread statt Enter; Enter pausiert/setzt fort
+    listener: ContinuousListener | None = None
+
+    def on_heard(phrase: str) -> None:
+        global _last_activity, _message
+        _last_activity = time.monotonic()
+        if _waiting_confirm:
+            do_confirm(phrase)
+        else:
+            _message = "Sag den richtigen Befehl" if _correction_mode else ""
+            process_phrase(phrase)
+
+    def on_wake() -> None:
+        global _message
+        _message = "Ja?"
+
+    def on_listen_error(e: Exception) -> None:
+        global _message
+        _message = f"Zuhören: {type(e).__name__}: {e} (höre weiter zu)"
+
+    def start_listener() -> None:
+        nonlocal listener
+        wake_model = WhisperSTT(model_size=config.wake_model_size, language=config.language)
+        gate = WakeWordGate(
+            config.wake_word,
+            wake_model.transcribe,
+            sample_rate=config.sample_rate,
+            window_seconds=config.wake_window,
+            follow_up_seconds=config.wake_follow_up,
+        )
+        listener = ContinuousListener(
+            recorder.record,
+            gate,
+            lambda audio: transcribe_capture(audio) if stt is not None else "",
+            on_command=on_heard,
+            on_wake=on_wake,
+            on_error=on_listen_error,
+            armed=lambda: _waiting_confirm or _correction_mode,  # Rückfragen ohne Wake-Word beantworten
+        )
+        listener.start()
+
+    if config.listen_mode:
+        if recorder.ring is None or recorder.vad is None:
+            _message = "Freihand-Modus braucht audio_persistent und vad_enabled"
+        else:
+            threading.Thread(target=start_listener, daemon=True).start()  # lädt das Wake-Modell
+
     def on_enter() -> None:
+        global _last_activity, _message
+        _last_activity = time.monotonic()
+        if stt is None:
+            _message = "Whisper lädt noch …"
+            return
+        if listener is not None:
+            listener.paused = not listener.paused
+            _message = "Zuhören pausiert" if listener.paused else ""
+            return
         if _waiting_confirm:
             # Kurze Bestätigungsaufnahme
-            audio = recorder.record()
-            phrase = stt.transcribe(audio)
-            process_phrase_direct(phrase)
+            process_phrase_direct(capture_phrase())
         else:
             do_record_and_process()
 
@@ -242,6 +663,92 @@ def main() -> int:
     def get_waiting_confirm() -> bool:
         return _waiting_confirm
 
+    def get_stats() -> dict[str, str]:
+        stats: dict[str, str] = {}
+        if warmup is not None:
+            stats["Modelle"] = warmup.summary()
+        if recorder.last_duration:
+            rec = f"{recorder.last_duration * 1000:.0f} ms"
+            if recorder.vad is not None:
+                rec += f" (VAD, {max(0.0, config.record_seconds - recorder.last_duration) * 1000:.0f} ms gespart)"
+            if recorder.ring is not None:
+                rec += f", Pre-Roll {config.preroll_ms} ms"
+            overruns = recorder.overflows + (recorder.ring.overruns if recorder.ring is not None else 0)
+            if overruns:
+                rec += f", {overruns} Überläufe"
+            stats["Aufnahme"] = rec
+        if preprocessor is not None and preprocessor.last is not None:
+            last = preprocessor.last
+            stats["Vorverarbeitung"] = (
+                f"-{last.bytes_saved / 1024:.0f} KB, -{last.ms_saved:.0f} ms Audio (letzte Dekodierung), "
+                f"Whisper {preprocessor.skipped}/{preprocessor.utterances} übersprungen"
+            )
+        if streamer is not None and streamer.decodes:
+            stats["STT-Stream"] = (
+                f"final {streamer.final_latency * 1000:.0f} ms nach Endpunkt, "
+                f"{streamer.reused_finals}/{streamer.finals} ohne Nachdekodierung"
+            )
+        if isinstance(stt, WhisperSTT) and stt.tuning is not None:
+            t = stt.tuning
+            stats["Whisper"] = f"{t.compute_type}, {t.cpu_threads} Threads (tune-stt, {t.latency_ms:.0f} ms)"
+        if listener is not None:
+            stats["Zuhören"] = listener.duty.summary() + (" (pausiert)" if listener.paused else "")
+        if isinstance(stt, STTPool):
+            stats["STT-Pool"] = (
+                f"{stt.workers} Prozesse, {stt.queued} offen, {stt.cancelled} abgebrochen"
+                + (f", {stt.error}" if stt.error else "")
+            )
+        if len(tick_jitter) >= 20:
+            stats["Tick-Jitter"] = tick_jitter.summary()
+        if parser.grammar:
+            g = parser.grammar
+            stats["Grammatik"] = f"{g.hit_rate:.0%} des Traffics ({g.hits}/{g.hits + g.misses})"
+        if parser.cache is not None:
+            c = parser.cache
+            stats["Intent-Cache"] = f"{c.hit_rate:.0%} Hits ({c.hits}/{c.hits + c.misses}), {len(c)} Einträge"
+        if ollama.timings:
+            timings = list(ollama.timings)
+            to_intent = [t.intent for t in timings if t.intent is not None]
+            cut = sum(t.cut_off for t in timings) / len(timings)
+            total_ms = median(t.total for t in timings) * 1000
+            intent_ms = f"{median(to_intent) * 1000:.0f} ms" if to_intent else "-"
+            stats["LLM"] = f"Intent nach {intent_ms}, Stream {total_ms:.0f} ms, {cut:.0%} abgeschnitten"
+            # Abgeschnittene Streams liefern kein prompt_eval_duration; die Zeit bis zum
+            # ersten Token (Prompt-Eval + erstes Token) gibt es dagegen immer
+            first = [t.first_token for t in timings if t.first_token]
+            evals = [t for t in timings if t.prompt_eval is not None]
+            if first or evals:
+                parts = [f"erstes Token {median(first) * 1000:.0f} ms"] if first else []
+                if evals:
+                    parts.append(
+                        f"laut Ollama {median(t.prompt_eval for t in evals) * 1000:.0f} ms "
+                        f"({median(t.prompt_tokens or 0 for t in evals):.0f} Tokens)"
+                    )
+                stats["Prompt-Eval"] = ", ".join(parts) + (", Session" if ollama.session else "")
+        if isinstance(ollama.api, BlockingOllamaApi):
+            client = ollama.api.client
+            state = "offen (nur kNN)" if not ollama.llm_available() else "ok"
+            stats["Ollama"] = (
+                f"LLM {state}, {client.timeouts} Timeouts, {parser.llm_skipped} ohne LLM"
+            )
+        if llm_cache is not None and llm_cache.hits + llm_cache.misses:
+            stats["LLM-Cache"] = f"{llm_cache.hits} Hits, {len(llm_cache)} Antworten gespeichert"
+        if parser.llm_retries:
+            stats["LLM-Retries"] = str(parser.llm_retries)
+        if parser.speculative:
+            stats["LLM spekulativ"] = f"{parser.spec_useful} genutzt, {parser.spec_wasted} abgebrochen"
+        if knn_store.prefilter is not None:
+            stats["kNN-Prefilter"] = f"{knn_store.prefilter.scan_fraction:.0%} der Examples gescannt"
+        if _last_compaction is not None:
+            c = _last_compaction
+            stats["Kompaktierung"] = (
+                f"-{c.removed} Examples, Suche {c.latency_before_ms:.1f} -> {c.latency_after_ms:.1f} ms"
+            )
+        if embed_cache:
+            total = embed_cache.hits + embed_cache.misses
+            stats["Embed-Cache"] = f"{embed_cache.hit_rate:.0%} Hits ({embed_cache.hits}/{total})"
+        return stats
+
     # TUI starten
     from svc.ui.tui import run_tui
     try:
@@ -255,9 +762,18 @@ def main() -> int:
         get_message=get_message,
         get_waiting_confirm=get_waiting_confirm,
         list_devices=list_devices,
+        get_stats=get_stats,
     )
     finally:
         _tick_stop.set()
+        if listener is not None:
+            listener.stop()
+        recorder.stop()
+        if isinstance(stt, STTPool):
+            stt.close()
+        if isinstance(ollama.api, BlockingOllamaApi):
+            ollama.api.close()
+        knn_store.flush()
     return 0
 
 
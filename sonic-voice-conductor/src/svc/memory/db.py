@@ -19,7 +19,8 @@ def init_db(data_dir: Path) -> None:
                 intent TEXT NOT NULL,
                 slots_json TEXT,
                 embedding BLOB,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                usage_count INTEGER NOT NULL DEFAULT 1
             )
         """)
         conn.execute("""
@@ -1,4 +1,5 @@
 """Bar-basierter Scheduler für zeitliche Planung."""
+from .jitter import TickJitter
 from .scheduler import Scheduler
 
-__all__ = ["Scheduler"]
+__all__ = ["Scheduler", "TickJitter"]
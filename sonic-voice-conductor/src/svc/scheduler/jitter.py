@@ -0,0 +1,42 @@
+"""Messung der Tick-Verspätung (Jitter) des Scheduler-/Makro-Threads."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable
+
+
+class TickJitter:
+    """
+    mark() bei jedem Tick aufrufen: misst, wie viel später als `period` nach dem
+    vorigen Tick der Thread tatsächlich lief (GIL-Konkurrenz, z.B. durch Whisper im
+    selben Prozess). Hält die letzten `window` Werte, Angaben in Millisekunden.
+    """
+
+    def __init__(self, period: float, window: int = 400, clock: Callable[[], float] = time.perf_counter):
+        self.period = period
+        self.clock = clock
+        self._late: deque[float] = deque(maxlen=window)
+        self._last: float | None = None
+
+    def mark(self) -> None:
+        now = self.clock()
+        if self._last is not None:
+            self._late.append(max(0.0, now - self._last - self.period) * 1000)
+        self._last = now
+
+    def __len__(self) -> int:
+        return len(self._late)
+
+    def percentile(self, q: float) -> float:
+        if not self._late:
+            return 0.0
+        values = sorted(self._late)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    @property
+    def max(self) -> float:
+        return max(self._late, default=0.0)
+
+    def summary(self) -> str:
+        return f"p50 {self.percentile(0.5):.1f} ms, p99 {self.percentile(0.99):.1f} ms, max {self.max:.1f} ms"
@@ -1,4 +1,7 @@
 """Speech-to-Text via faster-whisper."""
 from .whisper_stt import WhisperSTT
+from .streaming import Hypothesis, StreamingTranscriber
+from .pool import STTPool
+from .wake import WakeWordGate
 
-__all__ = ["WhisperSTT"]
+__all__ = ["WhisperSTT", "Hypothesis", "StreamingTranscriber", "STTPool", "WakeWordGate"]
@@ -0,0 +1,48 @@
+"""Dekodier-Profile für WhisperSTT: faster-whisper-Standard oder Befehlsmodus."""
+from __future__ import annotations
+
+from typing import Any
+
+PROFILES = ("default", "command")
+
+
+def command_vocabulary() -> list[str]:
+    """Befehlswörter der Grammatik plus Profil- und Makronamen (Unterstriche als Leerzeichen)."""
+    from svc.intent.grammar import vocabulary
+    from svc.macros.registry import list_macros
+    from svc.profiles.profiles import list_profiles
+
+    words = vocabulary() + list_profiles() + [m.replace("_", " ") for m in list_macros()]
+    return list(dict.fromkeys(words))
+
+
+# Beispiel-Befehle als initial_prompt: Whisper übernimmt Kleinschreibung und Ziffern.
+# Das Vokabular selbst geht als hotwords in den Prompt (beides zusammen würde es doppeln).
+COMMAND_PROMPT = "bpm 128, energie 0.8, break 16 takte, kick aus, profil peak."
+
+
+def decode_options(profile: str = "default", vocabulary: list[str] | None = None) -> dict[str, Any]:
+    """
+    Keyword-Argumente für WhisperModel.transcribe.
+    default: Beam-Search und Temperatur-Fallback von faster-whisper.
+    command: greedy (beam_size=1), nur Temperatur 0 (kein Fallback), kein Kontext
+    aus vorigen Segmenten, ohne Timestamps und mit max_new_tokens als früher
+    Abbruch – Befehle sind wenige Tokens lang. hotwords = Befehlsvokabular.
+    """
+    options: dict[str, Any] = {"vad_filter": True, "vad_parameters": {"min_silence_duration_ms": 500}}
+    if profile == "default":
+        return options
+    if profile != "command":
+        raise ValueError(f"Unbekanntes STT-Profil: {profile} (erlaubt: {', '.join(PROFILES)})")
+    words = command_vocabulary() if vocabulary is None else vocabulary
+    options.update(
+        beam_size=1,
+        best_of=1,
+        temperature=0.0,
+        condition_on_previous_text=False,
+        without_timestamps=True,
+        max_new_tokens=32,
+        initial_prompt=COMMAND_PROMPT,
+        hotwords=" ".join(words),
+    )
+    return options
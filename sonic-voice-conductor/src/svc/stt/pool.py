@@ -0,0 +1,224 @@
+"""Whisper in eigenen Worker-Prozessen: Audio über Shared Memory, Warteschlange, Abbruch."""
+from __future__ import annotations
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+from concurrent.futures import Future, InvalidStateError
+from multiprocessing import shared_memory
+from typing import Any, Callable
+
+import numpy as np
+
+from .whisper_stt import WhisperSTT
+
+_HEADER = 8  # int64 Request-ID vor den Samples; -1 = abgebrochen
+_CANCELLED = "abgebrochen"
+
+
+class CancelledDecode(Exception):
+    """Request wurde abgebrochen, bevor der Worker ein Ergebnis hatte."""
+
+
+def _worker_main(factory: Callable[..., Any], kwargs: dict, sample_rate: int, requests, results) -> None:
+    """Worker-Prozess: Modell einmal laden und anwärmen, dann Requests aus der Queue dekodieren."""
+    try:
+        model = factory(**kwargs)
+        model.warm_up(sample_rate=sample_rate)
+    except BaseException as e:  # noqa: BLE001 – Ladefehler an den Hauptprozess melden
+        results.put(("ready", os.getpid(), repr(e)))
+        return
+    results.put(("ready", os.getpid(), None))
+    attached: dict[str, shared_memory.SharedMemory] = {}
+    try:
+        while True:
+            item = requests.get()
+            if item is None:
+                break
+            req_id, name, n = item
+            shm = attached.get(name)
+            if shm is None:
+                shm = attached[name] = shared_memory.SharedMemory(name=name)
+            header = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+            if header[0] != req_id:
+                results.put((req_id, None, _CANCELLED))
+                del header
+                continue
+            audio = np.ndarray((n,), dtype=np.float32, buffer=shm.buf, offset=_HEADER)
+            try:
+                text = model.transcribe(audio, cancelled=lambda: header[0] != req_id)
+            except Exception as e:  # noqa: BLE001
+                results.put((req_id, None, repr(e)))
+            else:
+                results.put((req_id, text, None if header[0] == req_id else _CANCELLED))
+            del header, audio  # Views freigeben, sonst lässt sich shm nicht schließen
+    finally:
+        for shm in attached.values():
+            shm.close()
+
+
+class STTPool:
+    """
+    Pool aus `workers` Prozessen mit je einem geladenen Whisper-Modell, damit lange
+    Dekodierungen nicht mit Tick-Thread und TUI um das GIL konkurrieren.
+
+    Audio wird in vorab angelegte Shared-Memory-Slots kopiert (2 je Worker, je
+    max_seconds Audio) statt gepickelt; über die Queue gehen nur (id, slot, länge).
+    submit() blockiert, solange alle Slots belegt sind. Ein Future, das per cancel()
+    abgebrochen wird, markiert seinen Slot: noch wartende Requests überspringt der
+    Worker, laufende werden nach dem aktuellen Segment beendet.
+    transcribe() ist ein Drop-in für WhisperSTT.transcribe.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        sample_rate: int = 16000,
+        max_seconds: float = 30.0,
+        factory: Callable[..., Any] = WhisperSTT,
+        **model_kwargs: Any,
+    ):
+        self.workers = workers
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_seconds * sample_rate)
+        self._factory = factory
+        self._model_kwargs = model_kwargs
+        self._ctx = mp.get_context("spawn")  # kein fork mit laufenden Threads/CTranslate2
+        self._requests = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._slots = [
+            shared_memory.SharedMemory(create=True, size=_HEADER + 4 * self.max_samples)
+            for _ in range(2 * workers)
+        ]
+        self._free: queue.Queue[int] = queue.Queue()
+        for i in range(len(self._slots)):
+            self._free.put(i)
+        self._pending: dict[int, tuple[Future[str], int]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._procs: list[mp.process.BaseProcess] = []
+        self._reader: threading.Thread | None = None
+        self._closed = False
+        self.error: str | None = None  # gesetzt, wenn ein Worker ausgefallen ist
+        self.completed = 0
+        self.cancelled = 0
+
+    def start(self, timeout: float | None = None) -> None:
+        """Worker starten und warten, bis alle ihr Modell geladen und angewärmt haben."""
+        for _ in range(self.workers):
+            p = self._ctx.Process(
+                target=_worker_main,
+                args=(self._factory, self._model_kwargs, self.sample_rate, self._requests, self._results),
+                daemon=True,
+                name="svc-stt-worker",
+            )
+            p.start()
+            self._procs.append(p)
+        for _ in range(self.workers):
+            try:
+                _, pid, error = self._results.get(timeout=timeout)
+            except queue.Empty:
+                self.close()
+                raise TimeoutError("STT-Worker nicht rechtzeitig bereit") from None
+            if error is not None:
+                self.close()
+                raise RuntimeError(f"STT-Worker {pid} konnte das Modell nicht laden: {error}")
+        self._reader = threading.Thread(target=self._read_results, daemon=True, name="svc-stt-results")
+        self._reader.start()
+
+    @property
+    def queued(self) -> int:
+        """Requests, die abgeschickt, aber noch nicht beantwortet sind."""
+        return len(self._pending)
+
+    def submit(self, audio: np.ndarray) -> Future[str]:
+        if self._closed or self.error is not None:
+            raise RuntimeError(self.error or "STT-Pool ist geschlossen")
+        n = len(audio)
+        if n > self.max_samples:
+            raise ValueError(f"Audio länger als {self.max_samples / self.sample_rate:.0f} s")
+        slot = self._free.get()
+        shm = self._slots[slot]
+        req_id = next(self._ids)
+        np.ndarray((n,), dtype=np.float32, buffer=shm.buf, offset=_HEADER)[:] = audio
+        self._set_header(slot, req_id)
+        future: Future[str] = Future()
+
+        def on_done(f: Future[str]) -> None:
+            with self._lock:  # nur solange der Slot noch zu diesem Request gehört
+                if f.cancelled() and req_id in self._pending:
+                    self._set_header(slot, -1)
+
+        future.add_done_callback(on_done)
+        with self._lock:
+            self._pending[req_id] = (future, slot)
+        self._requests.put((req_id, shm.name, n))
+        return future
+
+    def _set_header(self, slot: int, value: int) -> None:
+        np.ndarray((1,), dtype=np.int64, buffer=self._slots[slot].buf)[0] = value
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        return self.submit(audio).result()
+
+    def cancel_all(self) -> int:
+        """Alle offenen Requests abbrechen; liefert deren Anzahl."""
+        with self._lock:
+            futures = [f for f, _ in self._pending.values()]
+        return sum(f.cancel() for f in futures)
+
+    def _read_results(self) -> None:
+        while not self._closed:
+            try:
+                req_id, text, error = self._results.get(timeout=0.5)
+            except queue.Empty:
+                if not all(p.is_alive() for p in self._procs) and not self._closed:
+                    self._fail_all("STT-Worker unerwartet beendet")
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                future, slot = self._pending.pop(req_id)
+            self._free.put(slot)
+            try:
+                if error == _CANCELLED:
+                    self.cancelled += 1
+                    if not future.cancelled():
+                        future.set_exception(CancelledDecode())
+                elif error is not None:
+                    future.set_exception(RuntimeError(error))
+                else:
+                    self.completed += 1
+                    future.set_result(text)
+            except InvalidStateError:
+                pass  # zwischenzeitlich per cancel() abgebrochen
+
+    def _fail_all(self, message: str) -> None:
+        self.error = message
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future, slot in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError(message))
+            self._free.put(slot)
+
+    def close(self) -> None:
+        """Offene Requests abbrechen, Worker beenden, Shared Memory freigeben."""
+        if self._closed:
+            return
+        self.cancel_all()
+        self._closed = True
+        for _ in self._procs:
+            self._requests.put(None)
+        for p in self._procs:
+            p.join(timeout=2.0)
+            if p.is_alive():
+                p.terminate()
+        if self._reader is not None:
+            self._reader.join(timeout=1.0)
+        for shm in self._slots:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,132 @@
+"""Streaming-STT: Teil-Hypothesen während der Aufnahme, finale Hypothese am Sprachende."""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from svc.audio.vad import Endpointer
+
+
+@dataclass
+class Hypothesis:
+    text: str
+    stable: str  # bestätigter Präfix, ändert sich nicht mehr
+    final: bool = False
+
+
+def common_prefix(a: str, b: str) -> str:
+    """Gemeinsamer Wort-Präfix zweier Hypothesen."""
+    out = []
+    for x, y in zip(a.split(), b.split()):
+        if x != y:
+            break
+        out.append(x)
+    return " ".join(out)
+
+
+class StreamingTranscriber:
+    """
+    Dekodiert das wachsende Audio der laufenden Aufnahme in einem Worker-Thread, alle
+    step_seconds neues Audio und sofort, wenn die VAD eine Pause meldet. Jedes Fenster
+    beginnt am Sprachanfang, aufeinanderfolgende Fenster überlappen also; was zwei
+    Hypothesen in Folge gemeinsam haben, gilt als stabil (LocalAgreement) und wird nicht
+    mehr zurückgenommen. Die Dekodierung zur Pause läuft, während der Endpointer noch
+    auf silence_ms Stille wartet: finish() liefert dann ohne weitere Dekodierung.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray], str],
+        sample_rate: int = 16000,
+        step_seconds: float = 0.6,
+        on_hypothesis: Callable[[Hypothesis], None] | None = None,
+    ):
+        self.transcribe = transcribe
+        self.sample_rate = sample_rate
+        self.step = int(step_seconds * sample_rate)
+        self.on_hypothesis = on_hypothesis
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="svc-stt")
+        self._decode_lock = threading.Lock()  # Whisper nie parallel
+        self.decodes = 0
+        self.finals = 0
+        self.reused_finals = 0  # finale Hypothese ohne eigene Dekodierung
+        self.final_latency = 0.0  # Sekunden von finish() bis zur finalen Hypothese
+        self.reset()
+
+    def reset(self) -> None:
+        self._chunks: list[np.ndarray] = []
+        self._samples = 0
+        self._submitted = 0  # Audioende der zuletzt gestarteten Dekodierung
+        self._pause_decoded = False
+        self._pending: Future[None] | None = None
+        self._last_text = ""
+        self._stable = ""
+        self._decoded: tuple[int, int, str] | None = None  # (start, end, text)
+
+    def _emit(self, text: str, final: bool = False) -> None:
+        if final:
+            self._stable = text
+        else:
+            agreed = common_prefix(self._last_text, text)
+            if len(agreed) > len(self._stable) and agreed.startswith(self._stable):
+                self._stable = agreed
+            self._last_text = text
+        if self.on_hypothesis is not None:
+            self.on_hypothesis(Hypothesis(text, self._stable, final))
+
+    def _decode(self, audio: np.ndarray, start: int, end: int) -> None:
+        with self._decode_lock:
+            text = self.transcribe(audio)
+        self.decodes += 1
+        self._decoded = (start, end, text)
+        if text:
+            self._emit(text)
+
+    def feed(self, block: np.ndarray, endpointer: Endpointer) -> None:
+        """Recorder-Hook (on_block): Block anhängen, ggf. Dekodierung anstoßen."""
+        self._chunks.append(block)
+        self._samples += len(block)
+        if not endpointer.heard_speech:
+            return
+        if endpointer.speaking:
+            self._pause_decoded = False
+        due = self._samples - self._submitted >= self.step or not (endpointer.speaking or self._pause_decoded)
+        if not due or (self._pending is not None and not self._pending.done()):
+            return  # Worker beschäftigt: der nächste Block stößt erneut an
+        if not endpointer.speaking:
+            self._pause_decoded = True
+        start = endpointer.voiced_span()[0]
+        audio = np.concatenate(self._chunks)[start:]
+        self._submitted = self._samples
+        self._pending = self._executor.submit(self._decode, audio, start, self._samples)
+
+    def wait(self) -> None:
+        """Wartet auf die laufende Teil-Dekodierung (Fehler daraus werden hier geworfen)."""
+        if self._pending is not None:
+            self._pending.result()
+
+    def finish(self, endpointer: Endpointer) -> str:
+        """Finale Hypothese nach dem Endpunkt; "" wenn keine Sprache erkannt wurde."""
+        t0 = time.perf_counter()
+        start, end = endpointer.voiced_span()
+        if end == 0:
+            return ""
+        self.wait()
+        decoded = self._decoded
+        if decoded is not None and decoded[0] == start and decoded[1] >= endpointer.speech_end_sample:
+            text = decoded[2]
+            self.reused_finals += 1
+        else:
+            audio = np.concatenate(self._chunks)[start:end]
+            with self._decode_lock:
+                text = self.transcribe(audio)
+            self.decodes += 1
+        self.finals += 1
+        self.final_latency = time.perf_counter() - t0
+        self._emit(text, final=True)
+        return text
@@ -0,0 +1,139 @@
+"""Autotune für faster-whisper: compute_type, cpu_threads, num_workers je Rechner."""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable
+
+import numpy as np
+
+from svc.audio.wav import read_wav
+
+from .wer import word_error_rate
+
+TUNING_FILE = "stt_tuning.json"
+FIXTURE_DIR = "stt_fixtures"
+COMPUTE_TYPES = ("float32", "int8_float32", "int8")  # float32 zuerst: Referenz für Fixtures ohne Transkript
+
+# Phrasen für `svc tune-stt --record`: decken Grammatik, Zahlen, Profile und Makros ab
+TUNE_PHRASES = (
+    "bpm hundertachtundzwanzig",
+    "energie null komma acht",
+    "dunkelheit siebzig prozent",
+    "hats auf null komma fünf",
+    "kick aus",
+    "break sechzehn takte",
+    "in acht takten drop",
+    "profil afterhour",
+    "makro hypnotischer zug",
+    "mach es etwas dunkler",
+    "mehr energie bitte",
+    "rückgängig",
+)
+
+
+@dataclass
+class SttTuning:
+    model_size: str
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
+    latency_ms: float  # Median je Fixture
+    wer: float
+    machine: str
+
+    def model_kwargs(self) -> dict[str, Any]:
+        return {"compute_type": self.compute_type, "cpu_threads": self.cpu_threads, "num_workers": self.num_workers}
+
+
+def machine_id() -> str:
+    """Grobe Kennung des Rechners: eine Abstimmung gilt nur auf der Hardware, auf der sie gemessen wurde."""
+    return f"{platform.node()}/{platform.machine()}/{os.cpu_count()}"
+
+
+def load_tuning(data_dir: Path, model_size: str) -> SttTuning | None:
+    """Gespeicherte Abstimmung für dieses Modell auf diesem Rechner, sonst None."""
+    path = Path(data_dir) / TUNING_FILE
+    try:
+        tuning = SttTuning(**json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError):
+        return None
+    if tuning.model_size != model_size or tuning.machine != machine_id():
+        return None
+    return tuning
+
+
+def save_tuning(data_dir: Path, tuning: SttTuning) -> Path:
+    path = Path(data_dir) / TUNING_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(tuning), indent=2), encoding="utf-8")
+    return path
+
+
+def candidates(cpu_count: int | None = None) -> list[dict[str, Any]]:
+    """Kombinationen aus compute_type, cpu_threads (halbe/alle Kerne) und num_workers 1/2."""
+    cores = cpu_count or os.cpu_count() or 1
+    threads = sorted({max(1, cores // 2), cores})
+    return [
+        {"compute_type": ct, "cpu_threads": t, "num_workers": w}
+        for ct in COMPUTE_TYPES
+        for t in threads
+        for w in (1, 2)
+    ]
+
+
+def load_wav_fixtures(directory: Path, sample_rate: int = 16000) -> list[tuple[str, np.ndarray, str | None]]:
+    """(name, audio, transkript) für name.wav mit optionalem name.txt."""
+    fixtures = []
+    for wav in sorted(Path(directory).glob("*.wav")):
+        txt = wav.with_suffix(".txt")
+        transcript = txt.read_text(encoding="utf-8").strip() if txt.exists() else None
+        fixtures.append((wav.stem, read_wav(wav, sample_rate), transcript))
+    return fixtures
+
+
+@dataclass
+class TuneResult:
+    options: dict[str, Any]
+    latency_ms: float
+    wer: float
+
+
+def tune(
+    fixtures: list[tuple[str, np.ndarray, str | None]],
+    make_stt: Callable[..., Any],
+    combos: list[dict[str, Any]],
+    wer_tolerance: float = 0.02,
+    on_result: Callable[[TuneResult], None] | None = None,
+) -> tuple[TuneResult, list[TuneResult]]:
+    """
+    Misst jede Kombination über alle Fixtures (Modell laden, anwärmen, Median-Latenz)
+    und liefert die schnellste, deren WER höchstens wer_tolerance über der der ersten
+    Kombination (Referenz, float32) liegt. Fixtures ohne Transkript werden gegen die
+    Ausgabe der Referenz verglichen.
+    """
+    results: list[TuneResult] = []
+    references: list[str] = []
+    for i, options in enumerate(combos):
+        stt = make_stt(**options)
+        stt.warm_up()
+        latencies, texts = [], []
+        for _, audio, _ in fixtures:
+            t0 = time.perf_counter()
+            texts.append(stt.transcribe(audio))
+            latencies.append(time.perf_counter() - t0)
+        if i == 0:
+            references = [transcript or text for (_, _, transcript), text in zip(fixtures, texts)]
+        result = TuneResult(options, median(latencies) * 1000, word_error_rate(list(zip(references, texts))))
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+        del stt  # Modell freigeben, bevor das nächste geladen wird
+    limit = results[0].wer + wer_tolerance
+    best = min((r for r in results if r.wer <= limit + 1e-9), key=lambda r: r.latency_ms)
+    return best, results
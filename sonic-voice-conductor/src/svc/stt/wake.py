@@ -0,0 +1,80 @@
+"""Wake-Word-Gate für den Freihand-Modus: billige Prüfung vor der vollen Pipeline."""
+from __future__ import annotations
+
+import re
+import time
+from difflib import SequenceMatcher
+from typing import Callable
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+_FILLERS = {"hey", "hallo", "hi", "ok", "okay", "he", "du"}
+
+
+class WakeWordGate:
+    """
+    Entscheidet je Äußerung, ob die volle STT + IntentParser-Pipeline laufen soll.
+    `check` ist ein kleines Modell (z.B. Whisper tiny), das nur die ersten
+    window_seconds der Äußerung dekodiert; passt der Anfang unscharf zum Wake-Word
+    (SequenceMatcher >= min_ratio, ein Füllwort wie „hey“ davor ist erlaubt), geht die
+    Äußerung durch. Nach einem Wake-Word ohne Befehl ist das Gate follow_up_seconds
+    lang offen (arm()), der nächste Satz braucht dann kein Wake-Word.
+    """
+
+    def __init__(
+        self,
+        wake_word: str,
+        check: Callable[[np.ndarray], str] | None = None,
+        sample_rate: int = 16000,
+        window_seconds: float = 1.5,
+        min_ratio: float = 0.75,
+        follow_up_seconds: float = 4.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.words = [w.lower() for w in _WORD.findall(wake_word)]
+        if not self.words:
+            raise ValueError("wake_word ist leer")
+        self.check = check
+        self.window = int(window_seconds * sample_rate)
+        self.min_ratio = min_ratio
+        self.follow_up_seconds = follow_up_seconds
+        self.clock = clock
+        self._armed_until = 0.0
+        self.last_check = ""  # Text der letzten Gate-Dekodierung
+
+    def split(self, text: str) -> str | None:
+        """Befehl nach dem Wake-Word ("" wenn nur das Wake-Word); None ohne Wake-Word."""
+        tokens = list(_WORD.finditer(text))
+        words = [t.group().lower() for t in tokens]
+        k = len(self.words)
+        target = " ".join(self.words)
+        for skip in (0, 1):
+            if skip and not (words and words[0] in _FILLERS):
+                break
+            head = words[skip : skip + k]
+            if len(head) < k or SequenceMatcher(None, " ".join(head), target).ratio() < self.min_ratio:
+                continue
+            if len(tokens) == skip + k:
+                return ""
+            return text[tokens[skip + k].start() :].strip()
+        return None
+
+    def arm(self) -> None:
+        self._armed_until = self.clock() + self.follow_up_seconds
+
+    def disarm(self) -> None:
+        self._armed_until = 0.0
+
+    @property
+    def armed(self) -> bool:
+        return self.clock() < self._armed_until
+
+    def passes(self, audio: np.ndarray) -> bool:
+        """Billige Stufe: offen nach arm(), sonst Wake-Word im Anfang der Äußerung."""
+        if self.armed:
+            return True
+        if self.check is None:
+            return False
+        self.last_check = self.check(audio[: self.window])
+        return self.split(self.last_check) is not None
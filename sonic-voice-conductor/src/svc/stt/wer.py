@@ -0,0 +1,27 @@
+"""Wortfehlerrate (WER) für STT-Benchmarks und tune-stt."""
+from __future__ import annotations
+
+from svc.intent.grammar import normalize_command
+
+
+def word_errors(reference: str, hypothesis: str) -> tuple[int, int]:
+    """(Substitutionen + Einfügungen + Löschungen, Wörter der Referenz) nach normalize_command."""
+    ref = normalize_command(reference).split()
+    hyp = normalize_command(hypothesis).split()
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1], len(ref)
+
+
+def word_error_rate(pairs: list[tuple[str, str]]) -> float:
+    """Korpus-WER über (Referenz, Hypothese)-Paare: Fehler / Referenzwörter."""
+    errors = words = 0
+    for reference, hypothesis in pairs:
+        e, n = word_errors(reference, hypothesis)
+        errors += e
+        words += n
+    return errors / words if words else 0.0
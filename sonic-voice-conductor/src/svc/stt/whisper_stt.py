@@ -1,24 +1,67 @@
 """faster-whisper Wrapper für Speech-to-Text."""
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Callable
+
 import numpy as np
-from faster_whisper import Whisper
+
+from .decoding import decode_options
+from .tuning import load_tuning
 
 
 class WhisperSTT:
-    """STT via faster-whisper, lokal."""
+    """
+    STT via faster-whisper, lokal. Mit data_dir wird die per `svc tune-stt` gemessene
+    Abstimmung (compute_type, cpu_threads, num_workers) für dieses Modell und diesen
+    Rechner übernommen; explizit übergebene Werte haben Vorrang.
+    """
 
-    def __init__(self, model_size: str = "base", language: str = "de", device: str = "auto"):
-        self.model = Whisper(model_size, device=device)
+    def __init__(
+        self,
+        model_size: str = "base",
+        language: str = "de",
+        device: str = "auto",
+        profile: str = "default",
+        vocabulary: list[str] | None = None,
+        compute_type: str | None = None,
+        cpu_threads: int | None = None,
+        num_workers: int | None = None,
+        data_dir: Path | None = None,
+    ):
+        self.options = decode_options(profile, vocabulary)  # unbekanntes Profil fällt vor dem Laden auf
+        from faster_whisper import WhisperModel  # lädt CTranslate2; erst hier, im Warm-up-Thread
+
+        self.tuning = load_tuning(data_dir, model_size) if data_dir is not None else None
+        kwargs = self.tuning.model_kwargs() if self.tuning is not None else {}
+        explicit = {"compute_type": compute_type, "cpu_threads": cpu_threads, "num_workers": num_workers}
+        kwargs.update({k: v for k, v in explicit.items() if v is not None})
+        self.model = WhisperModel(model_size, device=device, **kwargs)
         self.language = language if language != "auto" else None
 
-    def transcribe(self, audio: np.ndarray) -> str:
-        """Transkribiert Audio zu Text. Leer wenn Stille/Nichts erkannt."""
-        segments, _ = self.model.transcribe(
-            audio,
-            language=self.language,
-            vad_filter=True,
-            vad_parameters=dict(min_silence_duration_ms=500),
-        )
-        parts = [s.text.strip() for s in segments if s.text.strip()]
+    def transcribe(self, audio: np.ndarray, cancelled: Callable[[], bool] | None = None) -> str:
+        """
+        Transkribiert Audio zu Text. Leer wenn Stille/Nichts erkannt.
+        cancelled: wird zwischen den Segmenten gefragt (segments dekodiert lazy); True bricht ab.
+        """
+        segments, _ = self.model.transcribe(audio, language=self.language, **self.options)
+        parts = []
+        for s in segments:
+            if cancelled is not None and cancelled():
+                break
+            if s.text.strip():
+                parts.append(s.text.strip())
         return " ".join(parts).strip()
+
+    def warm_up(self, seconds: float = 1.0, sample_rate: int = 16000) -> None:
+        """
+        Erste Inferenz vorziehen (CTranslate2 initialisiert dabei Kernel und Puffer).
+        Ohne VAD-Filter, sonst würde der stille Puffer verworfen, bevor der Decoder läuft;
+        segments ist ein Generator und wird deshalb vollständig abgeholt.
+        """
+        silence = np.zeros(int(seconds * sample_rate), dtype=np.float32)
+        options = {k: v for k, v in self.options.items() if k != "vad_parameters"}
+        options["vad_filter"] = False
+        segments, _ = self.model.transcribe(silence, language=self.language, **options)
+        for _ in segments:
+            pass
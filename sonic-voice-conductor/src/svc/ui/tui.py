@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import sys
+import threading
 from typing import Callable
 
 from rich.console import Console
@@ -26,6 +27,7 @@ class TUI:
         self._active_macro = ""
         self._message = ""
         self._waiting_confirm = False
+        self._stats: dict[str, str] = {}
 
     def update_state(self, state: dict) -> None:
         self._state = dict(state)
@@ -48,6 +50,9 @@ class TUI:
     def set_waiting_confirm(self, waiting: bool) -> None:
         self._waiting_confirm = waiting
 
+    def update_stats(self, stats: dict[str, str]) -> None:
+        self._stats = dict(stats)
+
     def _make_layout(self) -> Layout:
         layout = Layout()
 
@@ -63,7 +68,7 @@ class TUI:
         status.add_row("Hats", f"{state.get('hats', 0.5):.2f}")
         status.add_row("Kick", "ON" if state.get("kick_on", 1) else "OFF")
 
-        layout.split_column(
+        rows = [
             Layout(Panel(status, title="[bold]Status[/]"), name="status"),
             Layout(
                 Panel(
@@ -90,10 +95,16 @@ class TUI:
                 ),
                 name="macro",
             ),
-        )
+        ]
+        if self._stats:
+            perf = Table(show_header=False)
+            perf.add_column(style="cyan")
+            perf.add_column(style="magenta")
+            for k, v in self._stats.items():
+                perf.add_row(k, v)
+            rows.append(Layout(Panel(perf, title="[bold]Performance[/]"), name="perf"))
         if self._message or self._waiting_confirm:
-            layout.split_column(
-                layout,
+            rows.append(
                 Layout(
                     Panel(
                         (self._message or "Unsicher. Sag: ja / nein / abbrechen") + (
@@ -105,6 +116,8 @@ class TUI:
                     name="msg",
                 ),
             )
+        # Einmal splitten – ein Layout darf sich nicht selbst enthalten
+        layout.split_column(*rows)
         return layout
 
     def render(self) -> None:
@@ -127,6 +140,38 @@ class TUI:
         self.console.print(table)
 
 
+class PartialLine:
+    """
+    Streaming-STT live in einer Zeile, während on_enter die TUI-Schleife blockiert:
+    stabiler Präfix fett, unsicherer Rest gedimmt; die finale Hypothese bleibt stehen.
+    """
+
+    def __init__(self, console: Console | None = None):
+        self.console = console or Console()
+        self._lock = threading.Lock()
+
+    def update(self, hyp) -> None:
+        words, stable = hyp.text.split(), hyp.stable.split()
+        rest = words[len(stable):] if words[: len(stable)] == stable else words
+        line = Text("» ", style="cyan")
+        line.append(" ".join(stable), style="bold")
+        if rest:
+            line.append((" " if stable else "") + " ".join(rest), style="dim")
+        with self._lock:
+            if not self.console.is_terminal:
+                if hyp.final:
+                    self.console.print(line)
+                return
+            self.console.file.write("\r\x1b[2K")
+            self.console.print(line, end="\n" if hyp.final else "")
+            self.console.file.flush()
+
+
+# Stats-Zeilen, deren Änderung ohne Tastendruck neu zeichnet (Bereitschaft, Fallback).
+# Zähler wie Tick-Jitter oder Zuhören ändern sich laufend und warten auf den nächsten Refresh.
+BACKGROUND_STATS = ("Modelle", "Ollama")
+
+
 def run_tui(
     on_enter: Callable[[], None],
     on_key: Callable[[str], None],
@@ -137,6 +182,7 @@ def run_tui(
     get_message: Callable[[], str],
     get_waiting_confirm: Callable[[], bool],
     list_devices: Callable[[], list],
+    get_stats: Callable[[], dict[str, str]] | None = None,
 ) -> None:
     """Blocking TUI-Loop. Enter=aufnehmen, d=devices, q=quit, m=macros, p=profiles."""
     tui = TUI()
@@ -149,9 +195,15 @@ def run_tui(
         tui.update_active_macro(get_active_macro() or "")
         tui.set_message(get_message() or "")
         tui.set_waiting_confirm(get_waiting_confirm())
+        if get_stats:
+            tui.update_stats(get_stats())
         tui.render()
         tui.print_help()
 
+    def background_key() -> tuple:
+        stats = get_stats() if get_stats else {}
+        return (get_message() or "", get_waiting_confirm(), *(stats.get(k) for k in BACKGROUND_STATS))
+
     has_tty = False
     try:
         import select
@@ -171,6 +223,7 @@ def run_tui(
         try:
             tty.setcbreak(sys.stdin.fileno())
             refresh()
+            shown = background_key()
             while True:
                 if select.select([sys.stdin], [], [], 0.5)[0]:
                     ch = sys.stdin.read(1)
@@ -189,6 +242,11 @@ def run_tui(
                     else:
                         on_key(ch)
                     refresh()
+                    shown = background_key()
+                elif (key := background_key()) != shown:
+                    # Hintergrund-Änderungen (Modelle bereit, Listener-Meldung) auch ohne Tastendruck zeigen
+                    shown = key
+                    refresh()
         except Exception:
             has_tty = False
         finally:
@@ -0,0 +1,101 @@
+"""Warm-up und Keep-alive der Modelle (Whisper, LLM, Embeddings) im Hintergrund."""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+LOADING = "lädt"
+READY = "bereit"
+FAILED = "Fehler"
+
+
+class Warmup:
+    """
+    Führt je Komponente einen Warm-up-Schritt in einem Hintergrund-Thread aus
+    (Modell laden, erste Inferenz), während die TUI schon läuft. Danach ruft
+    keep_alive alle `interval` Sekunden die Pings auf, damit Ollama die Modelle
+    mitten im Set nicht entlädt. Ein fehlgeschlagener Schritt (z.B. Ollama noch
+    nicht gestartet) wird beim nächsten Ping wieder "bereit".
+    """
+
+    def __init__(
+        self,
+        steps: dict[str, Callable[[], None]],
+        pings: dict[str, Callable[[], None]] | None = None,
+        interval: float = 300.0,
+    ):
+        self.steps = steps
+        self.pings = pings or {}
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.status: dict[str, str] = {name: LOADING for name in steps}
+        self.durations: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.pings_sent = 0
+
+    def _set(self, name: str, status: str, error: str = "") -> None:
+        with self._lock:
+            self.status[name] = status
+            if error:
+                self.errors[name] = error
+            else:
+                self.errors.pop(name, None)
+
+    def run(self) -> None:
+        """Alle Warm-up-Schritte nacheinander (blockierend)."""
+        for name, step in self.steps.items():
+            t0 = time.perf_counter()
+            try:
+                step()
+            except Exception as e:  # Warm-up darf den Live-Betrieb nie verhindern
+                self._set(name, FAILED, str(e) or type(e).__name__)
+                continue
+            self.durations[name] = time.perf_counter() - t0
+            self._set(name, READY)
+
+    def ping(self) -> None:
+        """Ein Keep-alive-Durchlauf über alle Pings."""
+        for name, ping in self.pings.items():
+            try:
+                ping()
+            except Exception as e:
+                self._set(name, FAILED, str(e) or type(e).__name__)
+                continue
+            self.pings_sent += 1
+            if name in self.status:
+                self._set(name, READY)
+
+    def start(self, stop: threading.Event) -> threading.Thread:
+        """Warm-up, danach Keep-alive bis `stop` gesetzt ist (interval <= 0: kein Keep-alive)."""
+
+        def loop() -> None:
+            self.run()
+            if self.interval <= 0 or not self.pings:
+                return
+            while not stop.wait(self.interval):
+                self.ping()
+
+        thread = threading.Thread(target=loop, name="svc-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def ready(self, name: str) -> bool:
+        with self._lock:
+            return self.status.get(name) == READY
+
+    @property
+    def all_ready(self) -> bool:
+        with self._lock:
+            return all(s == READY for s in self.status.values())
+
+    def summary(self) -> str:
+        """Kurzform für die TUI, z.B. "Whisper bereit (2.1 s), LLM lädt"."""
+        with self._lock:
+            parts = []
+            for name, status in self.status.items():
+                if status == READY and name in self.durations:
+                    parts.append(f"{name} {status} ({self.durations[name]:.1f} s)")
+                else:
+                    parts.append(f"{name} {status}")
+            return ", ".join(parts)
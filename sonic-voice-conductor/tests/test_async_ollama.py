@@ -0,0 +1,228 @@
+"""Tests für den asyncio-Ollama-Client gegen einen lokalen Stub-Server."""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from svc.intent.knn_store import KNNStore
+from svc.intent.parser import IntentParser
+from svc.llm.async_client import AsyncOllamaClient, BlockingOllamaApi, CircuitOpenError
+from svc.llm.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from svc.llm.ollama_client import LLMTransportError, OllamaClient
+
+INTENT = {"intent": "DROP", "slots": {}, "confidence": 0.9}
+
+
+class StubOllama(ThreadingHTTPServer):
+    """Minimaler /api/chat + /api/embed Server; `delay` simuliert ein hängendes Ollama."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.delay = 0.0
+        self.status = 200  # >= 500: Ollama-Fehler statt Antwort
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        srv = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with srv.lock:
+            srv.requests += 1
+            srv.in_flight += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+        try:
+            time.sleep(srv.delay)
+            if srv.status != 200:
+                data = json.dumps({"error": "model runner crashed"}).encode()
+                self.send_response(srv.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            elif self.path == "/api/embed":
+                self._send([{"model": body["model"], "embeddings": [[1.0, 0.0]]}])
+            elif body.get("stream"):
+                pieces = ['{"intent": "DROP", ', '"slots": {}, "confidence": 0.9}', " Erklärung"]
+                self._send([{"model": body["model"], "message": {"role": "assistant", "content": p}, "done": False}
+                            for p in pieces] + [{"model": body["model"], "message": {"role": "assistant", "content": ""}, "done": True}])
+            else:
+                content = json.dumps(INTENT)
+                self._send([{"model": body["model"], "message": {"role": "assistant", "content": content}, "done": True}])
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with srv.lock:
+                srv.in_flight -= 1
+
+    def _send(self, lines):
+        data = "".join(json.dumps(line) + "\n" for line in lines).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub():
+    srv = StubOllama()
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _client(stub, **kwargs):
+    kwargs.setdefault("deadline", 2.0)
+    kwargs.setdefault("load_deadline", 0.0)
+    return AsyncOllamaClient(base_url=stub.url, **kwargs)
+
+
+def test_breaker_states_with_fake_clock():
+    now = [0.0]
+    b = CircuitBreaker(failure_threshold=2, reset_after=10.0, clock=lambda: now[0])
+    b.record_failure()
+    assert b.state == CLOSED and b.allow()
+    b.record_failure()
+    assert b.state == OPEN and not b.allow() and b.rejected == 1
+    now[0] = 10.0
+    assert b.state == HALF_OPEN
+    assert b.allow() and not b.allow()  # nur ein Probe-Call
+    b.record_failure()
+    assert b.state == OPEN and b.trips == 2
+    now[0] = 20.0
+    assert b.allow()
+    b.record_success()
+    assert b.state == CLOSED
+
+
+def test_async_chat_and_embed_round_trip(stub):
+    async def run():
+        client = _client(stub)
+        try:
+            chat = await client.call("chat", model="m", messages=[{"role": "user", "content": "drop"}])
+            emb = await client.call("embed", model="e", input=["drop"])
+            return chat, emb
+        finally:
+            await client.aclose()
+
+    chat, emb = asyncio.run(run())
+    assert json.loads(chat["message"]["content"]) == INTENT
+    assert list(emb["embeddings"][0]) == [1.0, 0.0]
+
+
+def test_deadline_trips_breaker_and_fails_fast(stub):
+    stub.delay = 0.5
+
+    async def run():
+        client = _client(stub, deadline=0.1, breaker_factory=lambda: CircuitBreaker(2, 60.0))
+        errors = []
+        try:
+            for _ in range(4):
+                t0 = time.perf_counter()
+                with pytest.raises(LLMTransportError) as exc:
+                    await client.call("chat", model="m", messages=[])
+                errors.append((exc.type, time.perf_counter() - t0))
+            return client, errors
+        finally:
+            await client.aclose()
+
+    client, errors = asyncio.run(run())
+    assert [e[0] for e in errors] == [LLMTransportError, LLMTransportError, CircuitOpenError, CircuitOpenError]
+    assert all(t < 0.4 for _, t in errors)
+    assert client.timeouts == 2 and not client.available("m")
+    assert client.available("e")  # Embedding-Modell hat eigenen Breaker
+    assert stub.requests == 2
+
+
+def test_concurrency_is_bounded(stub):
+    stub.delay = 0.1
+
+    async def run():
+        client = _client(stub, max_concurrency=1)
+        try:
+            await asyncio.gather(*(client.call("embed", model="e", input=["x"]) for _ in range(3)))
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert stub.requests == 3 and stub.max_in_flight == 1
+
+
+def test_blocking_api_streams_through_ollama_client(stub):
+    api = BlockingOllamaApi(_client(stub))
+    try:
+        client = OllamaClient(base_url=stub.url, llm_model="m", embed_model="e", api=api)
+        assert client.generate_json("s", "drop") == INTENT
+        assert client.timings[-1].cut_off
+        assert client.extract_json(client.generate("s", "drop")) == INTENT
+        assert client.embed_batch(["drop"]) == [[1.0, 0.0]]
+        assert client.llm_available()
+    finally:
+        api.close()
+
+
+def test_parser_falls_back_to_knn_only(tmp_path):
+    store = KNNStore(tmp_path / "svc.db", lambda text: [1.0, 0.0])
+    store.add("drop jetzt", "DROP", {})
+
+    def llm(*args, **kwargs):
+        raise AssertionError("LLM darf bei offenem Breaker nicht aufgerufen werden")
+
+    parser = IntentParser(store, llm, OllamaClient.extract_json, llm_available=lambda: False)
+    assert parser.parse("drop jetzt")[1] == "knn_auto"
+    store.embed_fn = lambda text: [0.0, 1.0]
+    assert parser.parse("etwas anderes")[1] == "unknown"
+    assert parser.llm_skipped == 1
+
+
+def test_stream_5xx_during_half_open_probe_reopens_and_recovers(stub):
+    stub.status = 500
+
+    async def drain(client):
+        return [c async for c in client.stream("chat", model="m", messages=[])]
+
+    async def run():
+        client = _client(stub, breaker_factory=lambda: CircuitBreaker(1, 0.05))
+        try:
+            with pytest.raises(LLMTransportError):
+                await drain(client)
+            assert client.breaker("m").state == OPEN
+            await asyncio.sleep(0.06)
+            with pytest.raises(LLMTransportError):  # Probe bekommt 5xx -> wieder offen, nicht hängend
+                await drain(client)
+            assert client.breaker("m").state == OPEN and not client.available("m")
+            stub.status = 200
+            await asyncio.sleep(0.06)
+            chunks = await drain(client)
+            assert chunks and client.breaker("m").state == CLOSED
+            # Abbruch vor dem ersten Chunk gibt den Probe-Platz frei
+            b = client.breaker("m")
+            b.record_failure()
+            await asyncio.sleep(0.06)
+            stub.delay = 0.3
+            task = asyncio.create_task(drain(client))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert b.state == HALF_OPEN and b.allow()
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
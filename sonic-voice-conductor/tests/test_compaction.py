@@ -0,0 +1,106 @@
+"""Tests für die Kompaktierung nahezu identischer Examples."""
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from svc.intent.compaction import compact_examples, find_duplicates
+from svc.intent import knn_store
+from svc.intent.knn_store import KNNStore
+
+
+def _store(tmp: str, storage: str = "sqlite", index_mode: str = "exact"):
+    rng = np.random.default_rng(0)
+    base = {name: rng.normal(size=16) for name in ("energie", "break", "kick")}
+    vectors: dict[str, list[float]] = {}
+    for name, vec in base.items():
+        for i in range(5):
+            vectors[f"{name} {i}"] = (vec + 0.01 * rng.normal(size=16)).tolist()
+    store = KNNStore(Path(tmp) / "svc.db", lambda t: vectors[t], storage=storage, index_mode=index_mode)
+    for i in range(5):
+        store.add(f"energie {i}", "SET_ENERGY", {"value": 0.8})
+        store.add(f"break {i}", "BREAK", {"bars": 8})
+    # gleiche Phrasenfamilie, andere Slots: darf nicht verschmelzen
+    for i in range(3):
+        store.add(f"kick {i}", "KICK_ON", {"value": i % 2})
+    return store
+
+
+@pytest.mark.parametrize("storage", ["sqlite", "mmap"])
+def test_merges_same_intent_and_slots(storage):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp, storage=storage)
+        result = compact_examples(store, threshold=0.95)
+        assert result.examples_before == 13
+        # energie 5->1, break 5->1, kick: zwei Slot-Varianten, {value: 0} doppelt -> 1
+        assert result.removed == 9 and result.clusters == 3
+        index = store.load()
+        assert len(index) == 4
+        usage = store.usage_counts()
+        assert sorted(usage.values()) == [1, 2, 5, 5]
+        assert store.search("energie 3", k=1)[0][1] == "SET_ENERGY"
+
+
+def test_dry_run_changes_nothing():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        result = compact_examples(store, threshold=0.95, dry_run=True)
+        assert result.removed == 9
+        assert len(store.load()) == 13
+        assert store.added_since_compact == 13
+
+
+def test_run_without_duplicates_resets_insert_counter():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        result = compact_examples(store, threshold=1.01)
+        assert result.removed == 0
+        assert store.added_since_compact == 0
+
+
+def test_inserts_during_scan_keep_counting(monkeypatch):
+    from svc.intent import compaction
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        scan = compaction.find_duplicates
+
+        def scan_with_insert(s, threshold):
+            s.add("energie 4", "SET_ENERGY", {"value": 0.5})  # Insert aus dem Live-Prozess
+            return scan(s, threshold)
+
+        monkeypatch.setattr(compaction, "find_duplicates", scan_with_insert)
+        compact_examples(store, threshold=1.01)
+        assert store.added_since_compact == 1
+
+
+def test_high_threshold_keeps_distinct_examples():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        assert find_duplicates(store, threshold=1.01) == []
+
+
+def test_usage_count_migration():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "svc.db"
+        with sqlite3.connect(db) as conn:
+            conn.execute(
+                "CREATE TABLE examples (id INTEGER PRIMARY KEY, phrase TEXT NOT NULL, intent TEXT NOT NULL, "
+                "slots_json TEXT, embedding BLOB, created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.execute("INSERT INTO examples (phrase, intent, slots_json) VALUES ('drop', 'DROP', '{}')")
+        store = KNNStore(db, lambda t: [1.0, 0.0])
+        assert store.usage_counts() == {1: 1}
+
+
+def test_exact_vectors_chunks_large_id_lists():
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(1)
+        n = knn_store.SQL_IN_CHUNK * 2 + 7
+        vecs = rng.normal(size=(n, 8)).astype(np.float32)
+        store = KNNStore(Path(tmp) / "svc.db", lambda t: vecs[int(t)].tolist())
+        store.add_many([str(i) for i in range(n)], ["DROP"] * n, [{}] * n, vecs.tolist())
+        rows = store.exact_vectors(list(range(n)))
+        expected = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+        assert rows.shape == (n, 8) and np.allclose(rows, expected, atol=1e-6)
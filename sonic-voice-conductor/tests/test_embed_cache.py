@@ -0,0 +1,80 @@
+"""Tests für den Embedding-Cache."""
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from svc.llm import ollama_client
+from svc.llm.embed_cache import EmbeddingCache, normalize_text
+from svc.llm.ollama_client import OllamaClient
+
+
+def test_normalize_text():
+    assert normalize_text("  Energie   Hoch. ") == "energie hoch"
+
+
+def test_hit_miss_and_persistence():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "test.db"
+        cache = EmbeddingCache(db)
+        assert cache.get("m", "drop") is None
+        cache.put("m", "drop", [0.5, 0.25])
+        assert cache.get("m", "Drop!") == [0.5, 0.25]
+        assert cache.get("other-model", "drop") is None
+        assert (cache.hits, cache.misses) == (1, 2)
+        # Neue Instanz: Treffer aus der SQLite-Stufe
+        cache2 = EmbeddingCache(db)
+        assert cache2.get("m", "drop") == [0.5, 0.25]
+
+
+def test_eviction_bounds_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "test.db"
+        cache = EmbeddingCache(db, max_memory=2, max_rows=10)
+        for i in range(30):
+            cache.put("m", f"phrase {i}", [float(i)])
+        with sqlite3.connect(db) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM embed_cache").fetchone()[0]
+        assert rows <= 10
+        assert len(cache._mem) == 2
+
+
+def test_client_skips_ollama_on_hit(monkeypatch):
+    calls = []
+
+    def fake_embeddings(model, prompt):
+        calls.append(prompt)
+        return {"embedding": [1.0, 2.0]}
+
+    monkeypatch.setattr(ollama_client.ollama, "embeddings", fake_embeddings)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = OllamaClient(embed_cache=EmbeddingCache(Path(tmp) / "test.db"))
+        assert client.embed("Break 8") == [1.0, 2.0]
+        assert client.embed("break 8") == [1.0, 2.0]
+        # Normalisiert wird nur der Key; Ollama bekommt denselben Text wie ohne Cache
+        assert calls == ["Break 8"]
+        OllamaClient().embed("Break 8")
+        assert calls == ["Break 8", "Break 8"]
+
+
+def test_row_count_ignores_replaced_keys():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache(Path(tmp) / "test.db")
+        cache.put("m", "drop", [1.0])
+        cache.put("m", "Drop!", [2.0])
+        cache.put("m", "kick", [3.0])
+        assert cache.stats()["rows"] == 2
+
+
+def test_embed_batch_only_sends_misses(monkeypatch):
+    sent = []
+
+    def fake_embed(model, input):
+        sent.append(list(input))
+        return {"embeddings": [[float(len(t))] for t in input]}
+
+    monkeypatch.setattr(ollama_client.ollama, "embed", fake_embed)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = OllamaClient(embed_cache=EmbeddingCache(Path(tmp) / "test.db"))
+        assert client.embed_batch(["drop", "break 8"]) == [[4.0], [7.0]]
+        assert client.embed_batch(["Drop", "Kick aus"]) == [[4.0], [8.0]]
+        assert sent == [["drop", "break 8"], ["Kick aus"]]
@@ -0,0 +1,68 @@
+"""Tests für den Grammatik-Fastpath."""
+import pytest
+from svc.intent.grammar import GrammarMatcher, parse_number_word
+from svc.intent.parser import IntentParser
+
+
+@pytest.mark.parametrize("word,value", [
+    ("acht", 8),
+    ("sechzehn", 16),
+    ("zweiunddreißig", 32),
+    ("hundertachtundzwanzig", 128),
+    ("einhundertvierzig", 140),
+    ("hundert", 100),
+    ("hallo", None),
+])
+def test_number_words(word, value):
+    assert parse_number_word(word) == value
+
+
+@pytest.mark.parametrize("phrase,intent,slots", [
+    ("bpm 128", "SET_BPM", {"value": 128.0}),
+    ("Hundertachtundzwanzig BPM.", "SET_BPM", {"value": 128.0}),
+    ("tempo hundertvierzig", "SET_BPM", {"value": 140.0}),
+    ("break 16 takte", "BREAK", {"bars": 16}),
+    ("break", "BREAK", {}),
+    ("kick aus", "KICK_ON", {"value": 0}),
+    ("Kick an!", "KICK_ON", {"value": 1}),
+    ("profil warmup", "PROFILE_SET", {"name": "warmup"}),
+    ("energie 0.8", "SET_ENERGY", {"value": 0.8}),
+    ("energie 0,8", "SET_ENERGY", {"value": 0.8}),
+    ("energie null komma acht", "SET_ENERGY", {"value": 0.8}),
+    ("darkness sechzig prozent", "SET_DARKNESS", {"value": 0.6}),
+    ("energie 1 prozent", "SET_ENERGY", {"value": 0.01}),
+    ("in sechzehn takten break", "SCHEDULE", {"action": "break", "bars": 16}),
+    ("hypnotischer zug", "MACRO_RUN", {"name": "hypnotischer_zug"}),
+    ("rückgängig", "UNDO", {}),
+    ("langweilig", "RATE", {"rating": "langweilig"}),
+])
+def test_matches(phrase, intent, slots):
+    out = GrammarMatcher().match(phrase)
+    assert out is not None
+    assert out.intent == intent
+    assert out.slots_dict() == slots
+    assert out.confidence == 1.0
+
+
+@pytest.mark.parametrize("phrase", ["energie hoch", "profil techno", "energie 5", "mach mal lauter",
+                                    "energie 0.8 prozent", "energie 0,5 %"])
+def test_no_match(phrase):
+    assert GrammarMatcher().match(phrase) is None
+
+
+def test_parser_fast_path_skips_knn_and_llm():
+    class NoStore:
+        def search(self, phrase, k=1):
+            raise AssertionError("kNN darf nicht laufen")
+
+    def no_llm(system, user):
+        raise AssertionError("LLM darf nicht laufen")
+
+    grammar = GrammarMatcher()
+    parser = IntentParser(NoStore(), no_llm, lambda t: None, grammar=grammar)
+    intent, method = parser.parse("bpm hundertdreißig")
+    assert method == "grammar_auto"
+    assert intent.intent == "SET_BPM"
+    assert intent.slots_dict() == {"value": 130}
+    assert parser.stats["grammar_auto"] == 1
+    assert grammar.hit_rate == 1.0
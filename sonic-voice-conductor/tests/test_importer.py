@@ -0,0 +1,84 @@
+"""Tests für den Bulk-Import von Examples."""
+import hashlib
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from svc.intent.importer import import_examples
+from svc.intent.knn_store import KNNStore
+
+
+def _vec(text: str) -> list[float]:
+    # hashlib statt hash(): gleiche Vektoren in jedem Lauf (hash() ist je Prozess gesalzen)
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).normal(size=16).tolist()
+
+
+def _count(db: Path) -> int:
+    with sqlite3.connect(db) as conn:
+        return conn.execute("SELECT COUNT(*) FROM examples").fetchone()[0]
+
+
+def test_import_jsonl_batched_and_resumable():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "ex.jsonl"
+        lines = [{"phrase": f"energie stufe {i}", "intent": "set_energy", "slots": {"value": i / 100}} for i in range(50)]
+        lines.append({"phrase": "kaputt"})
+        lines.append({"phrase": "was auch immer", "intent": "FOO"})
+        src.write_text("\n".join(json.dumps(line) for line in lines))
+        db = Path(tmp) / "svc.db"
+        store = KNNStore(db, _vec)
+        store.load()
+        batches = []
+
+        def embed_batch(texts):
+            batches.append(len(texts))
+            return [_vec(t) for t in texts]
+
+        progress = []
+        res = import_examples(store, src, embed_batch, batch_size=8, concurrency=2,
+                              progress=lambda d, t: progress.append((d, t)))
+        assert (res.imported, res.skipped_existing, res.skipped_invalid) == (50, 0, 2)
+        assert max(batches) == 8 and sum(batches) == 50
+        assert progress[-1] == (50, 50)
+        assert _count(db) == 50
+        # Index wurde inkrementell erweitert
+        assert store.search("energie stufe 7", k=1)[0][2] == "energie stufe 7"
+        # Erneuter Lauf (z.B. nach Abbruch) importiert nichts doppelt
+        res2 = import_examples(store, src, embed_batch)
+        assert (res2.imported, res2.skipped_existing) == (0, 50)
+        assert _count(db) == 50
+
+
+def test_import_csv_mmap():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "ex.csv"
+        src.write_text('phrase,intent,slots\nkick aus,KICK_ON,"{""value"": 0}"\ndrop jetzt,DROP,\n')
+        db = Path(tmp) / "svc.db"
+        store = KNNStore(db, _vec, storage="mmap")
+        res = import_examples(store, src, lambda ts: [_vec(t) for t in ts])
+        assert res.imported == 2
+        sim, intent, phrase, slots = store.search("kick aus", k=1)[0]
+        assert (intent, slots) == ("KICK_ON", {"value": 0})
+
+
+def test_import_jsonl_bad_lines_in_the_middle_are_skipped():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "ex.jsonl"
+        src.write_text(
+            '{"phrase": "drop jetzt", "intent": "DROP"}\n'
+            '{"phrase": "abgeschnitten", "int\n'
+            '[1, 2, 3]\n'
+            '"nur ein string"\n'
+            '{"phrase": "kaputte slots", "intent": "DROP", "slots": [1]}\n'
+            '{"phrase": "kick aus", "intent": "KICK_ON", "slots": {"value": 0}}\n'
+        )
+        db = Path(tmp) / "svc.db"
+        store = KNNStore(db, _vec)
+        store.load()
+        res = import_examples(store, src, lambda ts: [_vec(t) for t in ts])
+        assert (res.imported, res.skipped_invalid) == (2, 4)
+        with sqlite3.connect(db) as conn:
+            assert sorted(r[0] for r in conn.execute("SELECT phrase FROM examples")) == ["drop jetzt", "kick aus"]
@@ -0,0 +1,87 @@
+"""Tests für den Parse-Cache und die korrekturbewusste Invalidierung."""
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from svc.intent.cache import IntentCache
+from svc.intent.knn_store import KNNStore
+from svc.intent.parser import IntentParser
+from svc.intent.schema import Intent
+
+VECS = {
+    "energie hoch": [1.0, 0.0, 0.0],
+    "energie rauf": [0.95, 0.31, 0.0],
+    "mach lauter": [0.0, 0.0, 1.0],
+    "lauter machen": [0.0, 0.1, 0.99],
+}
+
+
+def _embed(text):
+    return VECS[text.strip().lower()]
+
+
+def _parser(tmp, llm_calls):
+    store = KNNStore(Path(tmp) / "t.db", _embed)
+
+    def llm(system, user):
+        llm_calls.append(user)
+        return json.dumps({"intent": "SET_HATS", "slots": {"delta": 0.1}, "confidence": 0.9})
+
+    return IntentParser(store, llm, json.loads, cache=IntentCache(max_entries=8)), store
+
+
+def test_knn_result_is_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        parser, store = _parser(tmp, [])
+        store.add("energie hoch", "SET_ENERGY", {"delta": 0.2})
+        calls = []
+        store.embed_fn = lambda t: calls.append(t) or _embed(t)
+        assert parser.parse("energie rauf")[1] == "knn_auto"
+        assert parser.parse("Energie rauf.")[1] == "knn_auto"
+        assert len(calls) == 1
+        assert parser.cache.hits == 1
+
+
+def test_correction_invalidates_llm_result():
+    with tempfile.TemporaryDirectory() as tmp:
+        llm_calls = []
+        parser, store = _parser(tmp, llm_calls)
+        intent, method = parser.parse("mach lauter")
+        assert (intent.intent, method) == ("SET_HATS", "llm_auto")
+        parser.parse("mach lauter")
+        assert len(llm_calls) == 1
+        # Korrektur einer ähnlichen Phrase -> gecachtes LLM-Ergebnis darf nicht überleben
+        parser.learn_correction("lauter machen", "SET_ENERGY", {"delta": 0.1})
+        intent, method = parser.parse("mach lauter")
+        assert (intent.intent, method) == ("SET_ENERGY", "knn_auto")
+
+
+def test_unrelated_example_keeps_entry():
+    with tempfile.TemporaryDirectory() as tmp:
+        parser, store = _parser(tmp, [])
+        store.add("energie hoch", "SET_ENERGY", {"delta": 0.2})
+        parser.parse("energie hoch")
+        store.add("mach lauter", "SET_HATS", {"delta": 0.1})
+        assert len(parser.cache) == 1
+
+
+def test_ttl_and_lru():
+    cache = IntentCache(max_entries=2, ttl_seconds=60)
+    q = np.array([1.0, 0.0])
+    for p in ("a", "b", "c"):
+        cache.put(p, Intent(intent="DROP"), "knn_auto", q, 0.9)
+    assert cache.get("a") is None
+    assert cache.get("c")[1] == "knn_auto"
+    cache.ttl_seconds = -1
+    cache.put("d", Intent(intent="DROP"), "knn_auto", q, 0.9)
+    assert cache.get("d") is None
+
+
+def test_delete_clears_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        parser, store = _parser(tmp, [])
+        store.add("energie hoch", "SET_ENERGY", {"delta": 0.2})
+        parser.parse("energie hoch")
+        store.delete([1])
+        assert len(parser.cache) == 0
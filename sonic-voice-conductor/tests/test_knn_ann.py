@@ -0,0 +1,78 @@
+"""Tests für den IVF-ANN-Index."""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from svc.intent.ann import IVFIndex
+from svc.intent.index import EmbeddingIndex, normalize_rows
+from svc.intent.knn_store import KNNStore
+
+
+def _clustered(n: int, dim: int = 32, clusters: int = 20, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    points = centers[rng.integers(0, clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return normalize_rows(points)
+
+
+def test_ivf_recall_against_exact():
+    matrix = _clustered(3000)
+    index = EmbeddingIndex(matrix.shape[1])
+    index.append(np.arange(len(matrix)), matrix, ["X"] * len(matrix), [""] * len(matrix), [{}] * len(matrix))
+    ivf = IVFIndex.build(index.matrix, n_lists=32)
+    queries = _clustered(100, seed=1)
+    hits = sum(
+        ivf.search(index.matrix, q, k=1, nprobe=8)[0][1] == index.search(q, k=1)[0][1]
+        for q in queries
+    )
+    assert hits >= 90
+    # nprobe = alle Listen -> exakt
+    q = queries[0]
+    assert ivf.search(index.matrix, q, k=5, nprobe=32) == index.search(q, k=5)
+
+
+def test_ivf_add_and_persist():
+    matrix = _clustered(500)
+    ivf = IVFIndex.build(matrix[:400], n_lists=8)
+    ivf.add(matrix[400:])
+    assert len(ivf) == 500
+    # Neue Zeile wird gefunden
+    assert ivf.search(matrix, matrix[450], k=1, nprobe=1)[0][1] == 450
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "x.ivf.npz"
+        ids = np.arange(500) + 10
+        ivf.save(path, ids)
+        loaded = IVFIndex.load(path, ids, matrix)
+        assert loaded is not None and len(loaded) == 500
+        # Andere ids -> nicht mehr passend
+        assert IVFIndex.load(path, ids + 1, matrix) is None
+
+
+def test_store_ivf_mode():
+    vecs = _clustered(60, dim=16)
+    lookup = {f"p{i}": vecs[i].tolist() for i in range(len(vecs))}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "svc.db"
+        store = KNNStore(db, lambda t: lookup[t], index_mode="ivf", nprobe=64, ann_min_examples=50)
+        for i in range(60):
+            store.add(f"p{i}", "SET_ENERGY", {"value": i})
+        store.load()
+        # Neubau läuft im Hintergrund, gesucht wird solange exakt
+        sim, _, phrase, _ = store.search("p42", k=1)[0]
+        assert phrase == "p42" and sim > 0.999
+        store.flush()
+        assert store.ivf_path.exists() and store._ivf is not None
+        sim, _, phrase, _ = store.search("p42", k=1)[0]
+        assert phrase == "p42" and sim > 0.999
+        # Einzelne Korrekturen schreiben die Datei nicht jedes Mal neu
+        saves = []
+        save = store._save_ivf
+        store._save_ivf = lambda: (saves.append(1), save())
+        lookup["neu"] = vecs[3].tolist()
+        store.add("neu", "SET_ENERGY", {"value": 3})
+        assert saves == [] and len(store._ivf) == 61
+        store.flush()
+        assert saves == [1]
+        # Neu laden nutzt die persistierte Datei
+        store2 = KNNStore(db, lambda t: lookup[t], index_mode="ivf", nprobe=64, ann_min_examples=50)
+        assert store2.search("p7", k=1)[0][2] == "p7"
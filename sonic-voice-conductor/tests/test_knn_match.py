@@ -31,3 +31,37 @@ def test_empty_search():
         store = KNNStore(db, _mock_embed)
         results = store.search("irgendwas", k=3)
         assert results == []
+
+
+def test_index_matches_bruteforce():
+    import numpy as np
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "test.db"
+        store = KNNStore(db, _mock_embed)
+        phrases = [f"phrase {i}" for i in range(50)]
+        for i, p in enumerate(phrases):
+            store.add(p, "SET_ENERGY" if i % 2 else "SET_BPM", {"value": i})
+        q = np.array(_mock_embed("query"), dtype=np.float32)
+        sims = []
+        for p in phrases:
+            e = np.array(_mock_embed(p), dtype=np.float32)
+            sims.append(float(e @ q / (np.linalg.norm(e) * np.linalg.norm(q))))
+        expected = sorted(sims, reverse=True)[:5]
+        results = store.search("query", k=5)
+        assert [round(r[0], 5) for r in results] == [round(s, 5) for s in expected]
+
+
+def test_add_after_load_is_incremental():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "test.db"
+        store = KNNStore(db, _mock_embed)
+        store.add("energie hoch", "SET_ENERGY", {"delta": 0.2})
+        index = store.load()
+        assert len(index) == 1
+        store.add("kick aus", "KICK_ON", {"value": 0})
+        assert store.load() is index
+        assert len(index) == 2
+        sim, intent, phrase, slots = store.search("kick aus", k=1)[0]
+        assert intent == "KICK_ON"
+        assert slots == {"value": 0}
+        assert sim > 0.999
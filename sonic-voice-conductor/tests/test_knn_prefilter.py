@@ -0,0 +1,56 @@
+"""Tests für den Intent-Prefilter (zweistufige, exakte kNN-Suche)."""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from svc.intent.index import EmbeddingIndex, normalize_rows
+from svc.intent.knn_store import KNNStore
+from svc.intent.prefilter import IntentPrefilter
+
+
+def _intent_data(n: int, n_intents: int = 12, dim: int = 24, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_intents, dim))
+    labels = rng.integers(0, n_intents, size=n)
+    vecs = (centers[labels] + 0.4 * rng.normal(size=(n, dim))).astype(np.float32)
+    return vecs, [f"I{c}" for c in labels]
+
+
+def _index(vecs, intents) -> EmbeddingIndex:
+    index = EmbeddingIndex(vecs.shape[1])
+    index.append(np.arange(len(vecs)), vecs, intents, [""] * len(vecs), [{}] * len(vecs))
+    return index
+
+
+def test_matches_exact_search_and_scans_less():
+    vecs, intents = _intent_data(2000)
+    index = _index(vecs, intents)
+    pre = IntentPrefilter.build(index)
+    rng = np.random.default_rng(1)
+    for q in normalize_rows(vecs[:50] + 0.3 * rng.normal(size=(50, vecs.shape[1]))):
+        assert [p for _, p in pre.search(index, q, k=3)] == [p for _, p in index.search(q, k=3)]
+    assert pre.scan_fraction < 0.5
+
+
+def test_incremental_add_stays_exact():
+    vecs, intents = _intent_data(600, seed=2)
+    index = _index(vecs[:300], intents[:300])
+    pre = IntentPrefilter.build(index)
+    index.append(np.arange(300, 600), vecs[300:], intents[300:], [""] * 300, [{}] * 300)
+    pre.add(index, 300)
+    for q in normalize_rows(vecs[::37]):
+        assert [p for _, p in pre.search(index, q, k=5)] == [p for _, p in index.search(q, k=5)]
+
+
+def test_store_intent_mode():
+    vecs, intents = _intent_data(80, n_intents=4, dim=16)
+    lookup = {f"p{i}": vecs[i].tolist() for i in range(80)}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = KNNStore(Path(tmp) / "svc.db", lambda t: lookup[t], index_mode="intent")
+        for i in range(40):
+            store.add(f"p{i}", intents[i], {})
+        store.load()
+        for i in range(40, 80):
+            store.add(f"p{i}", intents[i], {})
+        assert store.prefilter is not None
+        assert store.search("p63", k=1)[0][2] == "p63"
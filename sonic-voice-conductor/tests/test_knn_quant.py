@@ -0,0 +1,57 @@
+"""Tests für quantisierte Index-Matrix (float16/int8) mit exaktem Re-Rank."""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from svc.intent.index import EmbeddingIndex, normalize_rows
+from svc.intent.knn_store import KNNStore
+
+
+def _vectors(n: int, dim: int = 32) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    return rng.normal(size=(n, dim)).astype(np.float32)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_scores_close_to_float32(dtype):
+    vecs = _vectors(300)
+    ref = EmbeddingIndex(32)
+    quant = EmbeddingIndex(32, dtype=dtype)
+    for index in (ref, quant):
+        index.append(np.arange(300), vecs, ["X"] * 300, [""] * 300, [{}] * 300)
+    q = normalize_rows(vecs[7])[0]
+    assert np.abs(quant.scores(q) - ref.scores(q)).max() < 0.02
+    assert quant.nbytes < ref.nbytes
+    assert np.allclose(quant.rows(np.array([7]))[0], ref.matrix[7], atol=0.02)
+
+
+@pytest.mark.parametrize("storage", ["sqlite", "mmap"])
+def test_store_rerank_returns_exact_scores(storage):
+    vecs = _vectors(40)
+    lookup = {f"p{i}": vecs[i].tolist() for i in range(40)}
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "svc.db"
+        store = KNNStore(db, lambda t: lookup[t], storage=storage, dtype="int8", rerank=4)
+        for i in range(40):
+            store.add(f"p{i}", "SET_ENERGY", {"value": i})
+        sim, intent, phrase, slots = store.search("p11", k=1)[0]
+        assert phrase == "p11" and intent == "SET_ENERGY" and slots == {"value": 11}
+        # Re-Rank rechnet in float32 aus der Quelle: Selbstähnlichkeit exakt 1
+        assert sim == pytest.approx(1.0, abs=1e-5)
+        # Bestehende DB ohne Migration auf float32 zurückstellen
+        store2 = KNNStore(db, lambda t: lookup[t], storage=storage, dtype="float32")
+        exact = store2.search("p11", k=3)
+        reranked = store.search("p11", k=3)
+        assert [h[2] for h in reranked] == [h[2] for h in exact]
+        assert np.allclose([h[0] for h in reranked], [h[0] for h in exact], atol=1e-5)
+
+
+def test_invalid_dtype_fails_at_startup():
+    from pydantic import ValidationError
+    from svc.config import Config
+
+    with pytest.raises(ValidationError):
+        Config(knn_dtype="fp16")
+    with tempfile.TemporaryDirectory() as tmp, pytest.raises(ValueError):
+        KNNStore(Path(tmp) / "svc.db", lambda t: [1.0], dtype="fp16")
@@ -0,0 +1,88 @@
+"""Tests für den persistenten LLM-Antwort-Cache."""
+import json
+import time
+
+from svc.intent.knn_store import KNNStore
+from svc.intent.parser import IntentParser
+from svc.llm.ollama_client import OllamaClient
+from svc.llm.response_cache import LLMResponseCache
+
+ANSWER = {"intent": "DROP", "slots": {}, "confidence": 0.9}
+
+
+def test_key_includes_model_and_system_prompt(tmp_path):
+    db = tmp_path / "svc.db"
+    cache = LLMResponseCache(db, model="llama3.2")
+    cache.put("SYS", 'Phrase: "Mach den Drop!"', ANSWER)
+    assert cache.get("SYS", 'phrase: "mach den drop!"') == ANSWER
+    assert cache.get("SYS NEU", 'Phrase: "Mach den Drop!"') is None
+    assert LLMResponseCache(db, model="qwen2.5").get("SYS", 'Phrase: "Mach den Drop!"') is None
+    assert cache.hits == 1 and cache.misses == 1
+    cache.put("SYS", 'Phrase: "mach den drop"', ANSWER)  # gleicher Key, ersetzt
+    assert len(cache) == 1
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = LLMResponseCache(tmp_path / "svc.db", model="m", max_rows=10, ttl_seconds=0.05)
+    cache.put("SYS", "a", ANSWER)
+    time.sleep(0.1)
+    assert cache.get("SYS", "a") is None and len(cache) == 0
+    cache.ttl_seconds = 3600
+    for i in range(11):
+        cache.put("SYS", f"p{i}", ANSWER)
+    assert len(cache) == 9
+    assert cache.get("SYS", "p10") == ANSWER and cache.get("SYS", "p0") is None
+
+
+def test_purge_after_prompt_change(tmp_path):
+    db = tmp_path / "svc.db"
+    cache = LLMResponseCache(db, model="m")
+    cache.put("ALT", "a", ANSWER)
+    cache.put("NEU", "b", ANSWER)
+    LLMResponseCache(db, model="anderes").put("ALT", "c", ANSWER)
+    assert cache.purge("NEU") == 1
+    assert cache.get("NEU", "b") == ANSWER
+    assert cache.purge() == 2 and len(cache) == 0
+
+
+def test_parser_reports_cache_hits(tmp_path):
+    db = tmp_path / "svc.db"
+    calls = []
+
+    def llm(system, user):
+        calls.append(user)
+        return json.dumps(ANSWER)
+
+    store = KNNStore(db, lambda text: [])
+    parser = IntentParser(store, llm, OllamaClient.extract_json, llm_cache=LLMResponseCache(db, model="m"))
+    assert parser.parse("mach rein den kram")[1] == "llm_auto"
+    # Neuer Prozess: gleicher Cache auf der Platte
+    parser = IntentParser(store, llm, OllamaClient.extract_json, llm_cache=LLMResponseCache(db, model="m"))
+    intent, method = parser.parse("Mach rein den Kram")
+    assert (intent.intent, method) == ("DROP", "llm_cache_auto")
+    assert len(calls) == 1
+
+
+def test_parser_skips_cache_lookup_when_knn_decides(tmp_path):
+    db = tmp_path / "svc.db"
+    store = KNNStore(db, lambda text: [1.0, 0.0])
+    store.add("drop", "DROP", {})
+    cache = LLMResponseCache(db, model="m")
+    parser = IntentParser(store, lambda s, u: json.dumps(ANSWER), OllamaClient.extract_json, llm_cache=cache)
+    assert parser.parse("drop")[1] == "knn_auto"
+    assert cache.hits + cache.misses == 0
+
+
+def test_parser_does_not_cache_suggestions(tmp_path):
+    db = tmp_path / "svc.db"
+    calls = []
+
+    def llm(system, user):
+        calls.append(user)
+        return json.dumps({**ANSWER, "confidence": 0.5})
+
+    cache = LLMResponseCache(db, model="m")
+    parser = IntentParser(KNNStore(db, lambda text: []), llm, OllamaClient.extract_json, llm_cache=cache)
+    assert parser.parse("mach rein den kram")[1] == "llm_suggest"
+    assert parser.parse("mach rein den kram")[1] == "llm_suggest"
+    assert len(calls) == 2 and len(cache) == 0
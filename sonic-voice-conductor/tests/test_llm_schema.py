@@ -0,0 +1,66 @@
+"""Tests für schema-erzwungene LLM-Antworten und Retry nur bei Transportfehlern."""
+import json
+import tempfile
+from pathlib import Path
+
+import ollama
+from svc.intent.knn_store import KNNStore
+from svc.intent.parser import IntentParser
+from svc.intent.rules import ALLOWED_INTENTS
+from svc.intent.schema import intent_json_schema
+from svc.llm.ollama_client import OllamaClient
+
+
+def test_schema_from_intent_model():
+    schema = intent_json_schema(ALLOWED_INTENTS)
+    assert schema["properties"]["intent"]["enum"] == list(ALLOWED_INTENTS)
+    slots = schema["properties"]["slots"]["properties"]
+    assert slots["bars"] == {"type": "integer"} and slots["value"] == {"type": "number"}
+    assert "rating" in slots
+
+
+def test_format_is_sent(monkeypatch):
+    seen = {}
+
+    def fake_chat(**kwargs):
+        seen.update(kwargs)
+        return {"message": {"content": "{}"}}
+
+    monkeypatch.setattr(ollama, "chat", fake_chat)
+    schema = intent_json_schema(ALLOWED_INTENTS)
+    OllamaClient(response_format=schema).generate("s", "u")
+    assert seen["format"] == schema
+
+
+def _parser(tmp, llm, constrained):
+    store = KNNStore(Path(tmp) / "t.db", lambda t: [])
+    return IntentParser(store, llm, OllamaClient.extract_json, constrained=constrained)
+
+
+def test_constrained_does_not_retry_invalid_output():
+    calls = []
+
+    def llm(system, user):
+        calls.append(user)
+        return "{kaputt"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parser = _parser(tmp, llm, constrained=True)
+        assert parser.parse("irgendwas")[1] == "unknown"
+        assert len(calls) == 1 and parser.llm_retries == 0
+
+
+def test_constrained_retries_transport_error():
+    calls = []
+
+    def llm(system, user):
+        calls.append(user)
+        if len(calls) == 1:
+            raise ConnectionError("reset")
+        return json.dumps({"intent": "DROP", "slots": {}, "confidence": 0.9})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parser = _parser(tmp, llm, constrained=True)
+        intent, method = parser.parse("irgendwas")
+        assert intent.intent == "DROP" and method == "llm_suggest"
+        assert calls[0] == calls[1] and parser.llm_retries == 1
@@ -0,0 +1,46 @@
+"""Tests für den Session-Modus (geprimter System-Prompt, wiederverwendeter context)."""
+import ollama
+from svc.llm.ollama_client import OllamaClient
+
+
+def _fake_generate(calls):
+    def generate(model, prompt, system=None, context=None, stream=False, **kwargs):
+        calls.append({"prompt": prompt, "system": system, "context": context, "model": model})
+        if system is not None:
+            return {"response": "{}", "context": [1, 2, 3, len(system)], "done": True}
+        return {
+            "response": '{"intent": "DROP", "slots": {}, "confidence": 0.9}',
+            "done": True,
+            "prompt_eval_count": 9,
+            "prompt_eval_duration": 12_000_000,
+        }
+
+    return generate
+
+
+def test_primes_once_and_reuses_context(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ollama, "generate", _fake_generate(calls))
+    client = OllamaClient(session=True)
+    assert client.extract_json(client.generate("SYS", "Phrase: a")) == {
+        "intent": "DROP", "slots": {}, "confidence": 0.9,
+    }
+    client.generate("SYS", "Phrase: b")
+    assert client.session_primes == 1
+    assert [c["context"] for c in calls[1:]] == [[1, 2, 3, 3], [1, 2, 3, 3]]
+    assert calls[2]["prompt"] == "Phrase: b" and calls[2]["system"] is None
+    # Priming wertet nur den System-Prompt aus, kein Beispiel-Kommando
+    assert calls[0]["system"] == "SYS" and not calls[0]["prompt"].strip()
+    assert client.timings[-1].prompt_eval == 0.012 and client.timings[-1].prompt_tokens == 9
+
+
+def test_reprimes_when_prompt_or_model_changes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ollama, "generate", _fake_generate(calls))
+    client = OllamaClient(session=True)
+    client.generate("SYS", "x")
+    client.generate("SYSTEM NEU", "x")
+    client.llm_model = "anderes-modell"
+    client.generate("SYSTEM NEU", "x")
+    assert client.session_primes == 3
+    assert calls[-1]["context"] == [1, 2, 3, len("SYSTEM NEU")]
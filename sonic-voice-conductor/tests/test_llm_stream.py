@@ -0,0 +1,44 @@
+"""Tests für gestreamte LLM-Generierung mit frühem JSON-Abbruch."""
+import threading
+
+import ollama
+from svc.llm.json_scan import JsonObjectScanner
+from svc.llm.ollama_client import OllamaClient
+
+
+def _feed_all(pieces):
+    scanner = JsonObjectScanner()
+    return [obj for p in pieces for obj in scanner.feed(p)]
+
+
+def test_scanner_across_chunks():
+    pieces = ['Klar: {"int', 'ent": "BREAK", "slots": {"b', 'ars": 8}}', " Viel Spaß!"]
+    assert _feed_all(pieces) == ['{"intent": "BREAK", "slots": {"bars": 8}}']
+
+
+def test_scanner_ignores_braces_in_strings():
+    pieces = ['{"intent": "MACRO_RUN", "slots": {"name": "a}b\\"{"}}', '{"x": 1}']
+    assert _feed_all(pieces) == ['{"intent": "MACRO_RUN", "slots": {"name": "a}b\\"{"}}', '{"x": 1}']
+
+
+def test_generate_json_cuts_off_after_first_object(monkeypatch):
+    consumed = []
+    closed = threading.Event()
+
+    def fake_chat(model, messages, stream=False):
+        def chunks():
+            try:
+                for piece in ['{"intent": "DROP", ', '"slots": {}, "confidence": 0.9}', " Erklärung", " ..."]:
+                    consumed.append(piece)
+                    yield {"message": {"content": piece}}
+            finally:
+                closed.set()
+
+        return chunks()
+
+    monkeypatch.setattr(ollama, "chat", fake_chat)
+    client = OllamaClient()
+    assert client.generate_json("s", "u") == {"intent": "DROP", "slots": {}, "confidence": 0.9}
+    assert len(consumed) == 2 and closed.is_set()
+    timing = client.timings[-1]
+    assert timing.cut_off and timing.intent is not None and timing.intent <= timing.total
@@ -0,0 +1,45 @@
+"""Tests für die Audio-Vorverarbeitung vor Whisper."""
+import numpy as np
+from svc.audio.preprocess import Preprocessor, preprocess
+from svc.audio.ring import RingBuffer
+from svc.audio.vad import VADSettings
+
+SR = 16000
+
+
+def test_preprocess_trims_removes_dc_and_normalizes_in_place():
+    t = np.arange(int(0.5 * SR)) / SR
+    tone = (0.05 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+    audio = np.concatenate([np.zeros(SR, np.float32), tone, np.zeros(SR, np.float32)]) + np.float32(0.02)
+    result = preprocess(audio, VADSettings(pad_ms=100), SR, target_peak=0.9)
+    assert np.shares_memory(result.audio, audio)
+    assert len(result.audio) == int(0.7 * SR)
+    assert abs(float(np.abs(result.audio).max()) - 0.9) < 1e-3
+    assert abs(float(result.audio.mean())) < 0.01
+    assert result.bytes_saved == 4 * (len(audio) - len(result.audio))
+    assert abs(result.ms_saved - 1800.0) < 1.0
+
+
+def test_preprocessor_skips_silence_and_counts():
+    noise = np.random.default_rng(0).normal(0, 1e-4, 2 * SR).astype(np.float32)
+    pre = Preprocessor(VADSettings(), SR)
+    assert pre(noise).size == 0
+    assert pre.skipped == 1 and pre.last.ms_saved == 2000.0 and pre.last.bytes_saved == noise.nbytes
+
+
+def test_preprocessor_leaves_ring_view_and_mirror_untouched():
+    t = np.arange(int(0.5 * SR)) / SR
+    tone = (0.05 * np.sin(2 * np.pi * 200 * t)).astype(np.float32) + np.float32(0.02)
+    ring = RingBuffer(SR)
+    ring.write(np.zeros(SR // 2, np.float32))
+    ring.write(tone)  # läuft über den Umbruch
+    view = ring.view(ring.written - len(tone), ring.written)
+    before = view.copy()
+    pre = Preprocessor(VADSettings(pad_ms=100), SR)
+    out = pre(view)
+    assert abs(float(np.abs(out).max()) - 0.9) < 1e-3
+    assert np.array_equal(view, before)
+    assert np.array_equal(ring._buf[:SR], ring._buf[SR:])
+    scratch = pre._scratch
+    pre(view)
+    assert pre._scratch is scratch  # Puffer wird wiederverwendet
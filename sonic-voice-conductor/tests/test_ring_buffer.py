@@ -0,0 +1,55 @@
+"""Tests für Ringpuffer und dauerhafte Aufnahme mit Pre-Roll."""
+import threading
+import time
+
+import numpy as np
+from svc.audio.recorder import Recorder
+from svc.audio.ring import RingBuffer
+from svc.audio.vad import VADSettings
+
+SR = 16000
+
+
+def test_ring_view_is_contiguous_across_wraparound_without_copy():
+    ring = RingBuffer(100)
+    data = np.arange(250, dtype=np.float32)
+    for block in np.array_split(data, 7):
+        ring.write(block)
+    assert ring.written == 250 and ring.oldest() == 150
+    view = ring.view(180, 240)  # liegt über der Umbruchstelle (200)
+    assert np.array_equal(view, data[180:240])
+    assert np.shares_memory(view, ring._buf)
+    assert np.array_equal(ring.view(150, 250), data[150:])
+
+
+def test_ring_counts_overrun_when_reader_falls_behind():
+    ring = RingBuffer(50)
+    ring.write(np.arange(120, dtype=np.float32))
+    view = ring.view(10, 120)
+    assert ring.overruns == 1
+    assert np.array_equal(view, np.arange(70, 120, dtype=np.float32))
+
+
+def test_persistent_record_includes_preroll_and_returns_view():
+    t = np.arange(int(0.6 * SR)) / SR
+    speech = (0.1 * np.sin(2 * np.pi * 180.0 * t)).astype(np.float32)
+    rec = Recorder(SR, vad=VADSettings(silence_ms=200, pad_ms=0), persistent=True, preroll_ms=300, ring_seconds=5.0)
+    # Sprache beginnt 0.2 s vor dem "Tastendruck"
+    rec.push(np.zeros(int(0.5 * SR), dtype=np.float32))
+    rec.push(speech[: int(0.2 * SR)])
+
+    def feed():
+        time.sleep(0.02)
+        rest = np.concatenate([speech[int(0.2 * SR) :], np.zeros(SR, dtype=np.float32)])
+        for block in np.array_split(rest, 30):
+            rec.push(block)
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=feed)
+    thread.start()
+    audio = rec.record()
+    thread.join()
+    assert np.shares_memory(audio, rec.ring._buf)
+    # die ganze Äußerung, auch der Teil vor dem Aufruf
+    assert abs(len(audio) - len(speech)) <= SR // 50
+    assert rec.ring.overruns == 0
@@ -37,3 +37,17 @@ def test_cancel():
     sa.cancelled = True
     s.tick()
     assert len(executed) == 0
+
+
+def test_tick_jitter_measures_lateness():
+    from svc.scheduler.jitter import TickJitter
+
+    now = [0.0]
+    j = TickJitter(period=0.15, clock=lambda: now[0])
+    for step in (0.15, 0.16, 0.15, 0.40):
+        j.mark()
+        now[0] += step
+    j.mark()
+    assert len(j) == 4
+    assert abs(j.max - 250.0) < 1e-6
+    assert j.percentile(0.5) >= 0.0 and "p99" in j.summary()
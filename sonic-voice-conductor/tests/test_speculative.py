@@ -0,0 +1,93 @@
+"""Tests für spekulatives LLM parallel zur kNN-Suche."""
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import ollama
+from svc.intent.knn_store import KNNStore
+from svc.intent.parser import IntentParser
+from svc.llm.ollama_client import OllamaClient
+
+VECS = {"energie hoch": [1.0, 0.0], "mach was": [0.0, 1.0]}
+
+
+def _parser(tmp, events):
+    store = KNNStore(Path(tmp) / "t.db", lambda t: VECS[t])
+    store.add("energie hoch", "SET_ENERGY", {"delta": 0.2})
+
+    def llm(system, user, cancel=None):
+        events.append(cancel)
+        if cancel.wait(0.3):
+            return ""
+        return json.dumps({"intent": "DROP", "slots": {}, "confidence": 0.9})
+
+    return IntentParser(store, llm, json.loads, speculative=True)
+
+
+def test_knn_hit_cancels_llm_without_waiting():
+    with tempfile.TemporaryDirectory() as tmp:
+        events = []
+        parser = _parser(tmp, events)
+        t = time.perf_counter()
+        intent, method = parser.parse("energie hoch")
+        assert method == "knn_auto" and intent.intent == "SET_ENERGY"
+        assert time.perf_counter() - t < 0.25
+        assert events[0].is_set()
+        assert (parser.spec_useful, parser.spec_wasted) == (0, 1)
+
+
+def test_knn_miss_consumes_llm_result():
+    with tempfile.TemporaryDirectory() as tmp:
+        events = []
+        parser = _parser(tmp, events)
+        intent, method = parser.parse("mach was")
+        assert method == "llm_auto" and intent.intent == "DROP"
+        assert not events[0].is_set()
+        assert (parser.spec_useful, parser.spec_wasted) == (1, 0)
+
+
+def test_failed_speculative_call_is_not_useful():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = KNNStore(Path(tmp) / "t.db", lambda t: VECS[t])
+
+        def llm(system, user, cancel=None):
+            raise ConnectionError("ollama weg")
+
+        parser = IntentParser(store, llm, json.loads, speculative=True, constrained=True)
+        assert parser.parse("mach was")[1] == "unknown"
+        assert parser.spec_useful == 0
+
+
+def test_cancel_before_start_is_not_wasted():
+    with tempfile.TemporaryDirectory() as tmp:
+        parser = _parser(tmp, [])
+        parser._cancel_llm((Future(), threading.Event()))  # noch in der Queue
+        assert parser.spec_wasted == 0
+        running = Future()
+        running.set_running_or_notify_cancel()
+        parser._cancel_llm((running, threading.Event()))
+        assert parser.spec_wasted == 1
+
+
+def test_generate_cancel_closes_stream(monkeypatch):
+    closed = threading.Event()
+
+    def fake_chat(model, messages, stream=False):
+        def chunks():
+            try:
+                for piece in ('{"intent"', ': "DROP"}', " und noch mehr"):
+                    yield {"message": {"content": piece}}
+            finally:
+                closed.set()
+
+        return chunks()
+
+    monkeypatch.setattr(ollama, "chat", fake_chat)
+    cancel = threading.Event()
+    cancel.set()
+    assert OllamaClient().generate("s", "u", cancel=cancel) == ""
+    assert closed.is_set()
+    assert OllamaClient().generate("s", "u", cancel=threading.Event()) == '{"intent": "DROP"} und noch mehr'
@@ -0,0 +1,60 @@
+"""Tests für Streaming-STT mit Teil-Hypothesen."""
+import numpy as np
+from svc.audio.vad import Endpointer, VADSettings
+from svc.stt.streaming import StreamingTranscriber, common_prefix
+
+SR = 16000
+WORDS = "mach die hats etwas leiser".split()
+
+
+def _utterance():
+    t = np.arange(int(1.2 * SR)) / SR
+    voice = (0.1 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+    silence = np.zeros(int(0.3 * SR), dtype=np.float32)
+    return np.concatenate([silence, voice, np.zeros(SR, dtype=np.float32)])
+
+
+def _fake_whisper(audio):
+    # Ein Wort je 0.25 s Audio; das letzte Wort ist bis zum Schluss unsicher
+    n = min(len(WORDS), int(len(audio) / SR / 0.25))
+    words = WORDS[:n]
+    if 0 < n < len(WORDS):
+        words[-1] = words[-1].upper()
+    return " ".join(words)
+
+
+def _run(streamer, audio):
+    ep = Endpointer(VADSettings(silence_ms=400, pad_ms=100), SR)
+    for i in range(0, len(audio), SR // 10):
+        block = audio[i : i + SR // 10]
+        done = ep.feed(block)
+        streamer.feed(block, ep)
+        streamer.wait()  # Echtzeit: 100 ms Audio dauern länger als die Fake-Dekodierung
+        if done:
+            break
+    return streamer.finish(ep)
+
+
+def test_common_prefix():
+    assert common_prefix("mach die hats", "mach die HATS leiser") == "mach die"
+    assert common_prefix("", "drop") == ""
+
+
+def test_partials_stabilize_and_final_is_ready_at_endpoint():
+    hyps = []
+    streamer = StreamingTranscriber(_fake_whisper, SR, step_seconds=0.3, on_hypothesis=hyps.append)
+    final = _run(streamer, _utterance())
+    assert final == " ".join(WORDS)
+    partials = [h for h in hyps if not h.final]
+    assert len(partials) >= 2 and hyps[-1].final and hyps[-1].text == final
+    # Der stabile Präfix wird nie zurückgenommen
+    stables = [h.stable for h in hyps]
+    assert all(b.startswith(a) for a, b in zip(stables, stables[1:]))
+    # Dekodierung zur Pause deckt die Sprache ab: keine zusätzliche Dekodierung nach dem Endpunkt
+    assert streamer.reused_finals == 1 and streamer.finals == 1
+
+
+def test_silence_gives_empty_final():
+    calls = []
+    streamer = StreamingTranscriber(lambda a: calls.append(a) or "x", SR)
+    assert _run(streamer, np.zeros(SR, dtype=np.float32)) == "" and not calls
@@ -0,0 +1,28 @@
+"""Tests für Dekodier-Profile und WER."""
+import pytest
+from svc.stt.decoding import command_vocabulary, decode_options
+from svc.stt.wer import word_error_rate, word_errors
+
+
+def test_default_profile_keeps_faster_whisper_defaults():
+    options = decode_options("default")
+    assert options["vad_filter"] is True
+    assert "beam_size" not in options and "hotwords" not in options
+
+
+def test_command_profile_is_greedy_and_biased_to_vocabulary():
+    options = decode_options("command")
+    assert options["beam_size"] == 1 and options["temperature"] == 0.0
+    assert options["max_new_tokens"] <= 64 and options["without_timestamps"]
+    vocab = command_vocabulary()
+    for word in ("energie", "break", "peak", "warmup", "hypnotischer zug"):
+        assert word in vocab and word in options["hotwords"]
+    assert "rueckgaengig" not in vocab
+    with pytest.raises(ValueError):
+        decode_options("turbo")
+
+
+def test_word_error_rate_normalizes_numbers_and_punctuation():
+    assert word_errors("BPM hundertachtundzwanzig", "bpm 128.") == (0, 2)
+    assert word_errors("break sechzehn takte", "brake 16") == (2, 3)
+    assert word_error_rate([("kick aus", "kick aus"), ("profil peak", "profil")]) == 0.25
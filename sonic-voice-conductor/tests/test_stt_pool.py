@@ -0,0 +1,65 @@
+"""Tests für den STT-Worker-Pool (Fake-Modell statt faster-whisper, echte Prozesse)."""
+import os
+import time
+
+import numpy as np
+import pytest
+from svc.stt.pool import STTPool
+
+
+class FakeSTT:
+    """Im Worker-Prozess instanziiert; meldet PID und Audio-Prüfsumme."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        if fail:
+            raise OSError("Modell fehlt")
+        self.delay = delay
+
+    def warm_up(self, sample_rate: int = 16000) -> None:
+        pass
+
+    def transcribe(self, audio, cancelled=None) -> str:
+        t_end = time.monotonic() + self.delay
+        while time.monotonic() < t_end:
+            if cancelled is not None and cancelled():
+                return "abgebrochen"
+            time.sleep(0.01)
+        return f"{os.getpid()} {len(audio)} {float(audio.sum()):.1f}"
+
+
+def test_pool_decodes_in_worker_process_via_shared_memory():
+    pool = STTPool(workers=1, max_seconds=2.0, factory=FakeSTT)
+    pool.start(timeout=60)
+    try:
+        audio = np.full(16000, 0.5, dtype=np.float32)
+        pid, n, total = pool.transcribe(audio).split()
+        assert int(pid) != os.getpid()
+        assert (int(n), float(total)) == (16000, 8000.0)
+        with pytest.raises(ValueError):
+            pool.submit(np.zeros(3 * 16000, dtype=np.float32))
+    finally:
+        pool.close()
+
+
+def test_pool_cancels_queued_and_running_requests():
+    pool = STTPool(workers=1, max_seconds=1.0, factory=FakeSTT, delay=0.5)
+    pool.start(timeout=60)
+    try:
+        audio = np.ones(1600, dtype=np.float32)
+        running = pool.submit(audio)
+        queued = pool.submit(audio)
+        time.sleep(0.1)
+        assert queued.cancel() and running.cancel()
+        t0 = time.monotonic()
+        # beide Slots werden frei, sobald der Worker geantwortet hat
+        assert pool.transcribe(audio * 2).split()[1:] == ["1600", "3200.0"]
+        assert time.monotonic() - t0 < 0.5 + 0.4
+        assert pool.cancelled == 2 and pool.completed == 1
+    finally:
+        pool.close()
+
+
+def test_pool_reports_worker_load_error():
+    pool = STTPool(workers=1, max_seconds=1.0, factory=FakeSTT, fail=True)
+    with pytest.raises(RuntimeError, match="Modell fehlt"):
+        pool.start(timeout=60)
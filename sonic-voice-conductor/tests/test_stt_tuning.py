@@ -0,0 +1,54 @@
+"""Tests für das STT-Autotune (Fake-Modell statt faster-whisper)."""
+import json
+
+import numpy as np
+from svc.stt.tuning import (
+    SttTuning, TUNING_FILE, candidates, load_tuning, machine_id, save_tuning, tune,
+)
+
+
+class FakeSTT:
+    # Latenz je compute_type; int8 ist am schnellsten, verhört sich aber
+    COST = {"float32": 3.0, "int8_float32": 2.0, "int8": 1.0}
+
+    def __init__(self, compute_type, cpu_threads, num_workers, clock):
+        self.compute_type, self.threads, self.clock = compute_type, cpu_threads, clock
+
+    def warm_up(self):
+        pass
+
+    def transcribe(self, audio):
+        self.clock[0] += self.COST[self.compute_type] / self.threads
+        if self.compute_type == "int8":
+            return "brake sechzehn"
+        return "break sechzehn takte"
+
+
+def test_tune_picks_fastest_within_wer_tolerance(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("svc.stt.tuning.time.perf_counter", lambda: clock[0])
+    fixtures = [("a", np.zeros(10, dtype=np.float32), "break 16 takte"), ("b", np.zeros(10, dtype=np.float32), None)]
+    seen = []
+    best, results = tune(
+        fixtures,
+        lambda **o: FakeSTT(clock=clock, **o),
+        candidates(cpu_count=4),
+        wer_tolerance=0.05,
+        on_result=seen.append,
+    )
+    assert len(results) == len(seen) == 12  # 3 compute_types x {2, 4} Threads x 1/2 Worker
+    assert results[0].wer == 0.0
+    assert best.options == {"compute_type": "int8_float32", "cpu_threads": 4, "num_workers": 1}
+    assert all(r.wer > 0.05 for r in results if r.options["compute_type"] == "int8")
+
+
+def test_tuning_roundtrip_only_for_same_model_and_machine(tmp_path):
+    tuning = SttTuning("base", "int8", 4, 1, latency_ms=120.0, wer=0.0, machine=machine_id())
+    save_tuning(tmp_path, tuning)
+    assert load_tuning(tmp_path, "base") == tuning
+    assert load_tuning(tmp_path, "small") is None
+    data = json.loads((tmp_path / TUNING_FILE).read_text())
+    data["machine"] = "anderer-laptop/x86_64/2"
+    (tmp_path / TUNING_FILE).write_text(json.dumps(data))
+    assert load_tuning(tmp_path, "base") is None
+    assert load_tuning(tmp_path / "fehlt", "base") is None
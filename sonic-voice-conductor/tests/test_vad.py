@@ -0,0 +1,47 @@
+"""Tests für Frame-VAD und Endpointing."""
+import numpy as np
+from svc.audio.vad import Endpointer, VADSettings, frame_features, voiced_frames
+
+SR = 16000
+
+
+def _tone(seconds, db=-20.0, freq=180.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return (10 ** (db / 20) * np.sqrt(2) * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def test_frame_features_energy_and_zcr():
+    energy, zcr = frame_features(_tone(0.1, db=-20.0), 320)
+    assert len(energy) == 5 and np.allclose(energy, -20.0, atol=0.5)
+    assert np.all(zcr < 0.05)
+    noise = np.random.default_rng(0).normal(0, 0.1, SR // 10).astype(np.float32)
+    # Lautes Rauschen hat viele Nulldurchgänge und zählt nicht als Sprache
+    assert not voiced_frames(noise, VADSettings(), SR).any()
+
+
+def test_endpointer_stops_after_trailing_silence():
+    audio = np.concatenate([_silence(0.3), _tone(0.5), _silence(2.2)])
+    ep = Endpointer(VADSettings(silence_ms=400, pad_ms=100), SR, max_seconds=6.0)
+    blocks = np.array_split(audio, 37)  # ungerade Blockgrößen
+    fed = 0
+    for block in blocks:
+        fed += 1
+        if ep.feed(block):
+            break
+    assert fed < len(blocks)
+    assert 0.8 * SR <= ep.samples <= 1.4 * SR
+    start, end = ep.voiced_span()
+    assert start == int(0.2 * SR) and end == int(0.9 * SR)
+
+
+def test_endpointer_ignores_clicks_and_respects_max():
+    click = _tone(0.04, db=-10.0)
+    audio = np.concatenate([_silence(0.2), click, _silence(1.0)])
+    ep = Endpointer(VADSettings(min_speech_ms=100), SR, max_seconds=1.0)
+    assert ep.feed(audio)
+    assert not ep.heard_speech and ep.voiced_span() == (0, 0)
+    assert ep.samples == len(audio)
@@ -0,0 +1,140 @@
+"""Tests für die memory-mapped Vektordatei und KNNStore(storage="mmap")."""
+import hashlib
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from svc.intent.knn_store import KNNStore
+from svc.intent.vector_store import VectorFile
+
+
+def _mock_embed(text: str) -> list[float]:
+    # hashlib statt hash(): gleiche Vektoren in jedem Lauf (hash() ist je Prozess gesalzen)
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).normal(size=16).tolist()
+
+
+def test_append_and_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "svc.vectors"
+        vf = VectorFile(base)
+        vf.append([1, 2], np.ones((2, 4), dtype=np.float32))
+        vf.append([5], np.full((1, 4), 2.0, dtype=np.float32))
+        vf2 = VectorFile(base)
+        assert len(vf2) == 3 and vf2.dim == 4
+        assert vf2.ids().tolist() == [1, 2, 5]
+        assert vf2.vectors()[2].tolist() == [2.0] * 4
+
+
+def test_torn_append_is_truncated():
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "svc.vectors"
+        vf = VectorFile(base)
+        vf.append([1], np.ones((1, 4), dtype=np.float32))
+        # Absturz: Vektor geschrieben, id nicht
+        with open(vf.vec_path, "ab") as f:
+            f.write(np.zeros(4, dtype=np.float32).tobytes())
+        vf2 = VectorFile(base)
+        assert len(vf2) == 1
+        assert os.path.getsize(vf2.vec_path) == 16 + 16
+
+
+def test_compact_and_roll_forward():
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "svc.vectors"
+        vf = VectorFile(base)
+        vf.append([1, 2, 3], np.arange(12, dtype=np.float32).reshape(3, 4))
+        assert vf.compact(np.array([1, 3])) == 1
+        assert vf.ids().tolist() == [1, 3]
+        assert vf.vectors()[1].tolist() == [8.0, 9.0, 10.0, 11.0]
+        # Absturz nach Vektor-Rename, vor ids-Rename: neue Vektordatei, alte ids + ids.tmp
+        with open(vf.vec_path, "r+b") as f:
+            f.truncate(16 + 16)
+        tmp_ids = vf.ids_path.with_name(vf.ids_path.name + ".tmp")
+        tmp_ids.write_bytes(np.array([3], dtype=np.int64).tobytes())
+        vf2 = VectorFile(base)
+        assert not tmp_ids.exists()
+        assert vf2.ids().tolist() == [3]
+
+
+def test_store_migrates_blobs_and_searches():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "svc.db"
+        old = KNNStore(db, _mock_embed)
+        old.add("energie hoch", "SET_ENERGY", {"delta": 0.2})
+        old.add("kick aus", "KICK_ON", {"value": 0})
+        expected = old.search("kick aus", k=2)
+
+        store = KNNStore(db, _mock_embed, storage="mmap")
+        with sqlite3.connect(db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM examples WHERE embedding IS NOT NULL").fetchone()[0] == 0
+        got = store.search("kick aus", k=2)
+        assert [(round(s, 5), i) for s, i, _, _ in got] == [(round(s, 5), i) for s, i, _, _ in expected]
+        assert isinstance(store.load().matrix, np.memmap)
+
+        store.add("drop", "DROP", {})
+        assert store.search("drop", k=1)[0][1] == "DROP"
+        assert len(store._vectors) == 3
+        expected = store.search("kick aus", k=3)
+
+        # Zurück auf sqlite: Vektoren wandern in die BLOBs, inklusive der im mmap-Modus hinzugefügten
+        back = KNNStore(db, _mock_embed)
+        assert not (Path(tmp) / "svc.vectors.f32").exists()
+        with sqlite3.connect(db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM examples WHERE embedding IS NULL").fetchone()[0] == 0
+        got = back.search("kick aus", k=3)
+        assert [(round(s, 5), i) for s, i, _, _ in got] == [(round(s, 5), i) for s, i, _, _ in expected]
+
+
+def test_store_delete_compacts():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "svc.db"
+        store = KNNStore(db, _mock_embed, storage="mmap")
+        for p in ("a", "b", "c"):
+            store.add(p, "DROP", {})
+        with sqlite3.connect(db) as conn:
+            ids = [r[0] for r in conn.execute("SELECT id FROM examples WHERE phrase != 'b'")]
+        assert store.delete(ids) == 2
+        assert len(store._vectors) == 1
+        assert store.search("b", k=3)[0][2] == "b"
+        assert len(store.search("b", k=3)) == 1
+
+
+def test_migration_clears_blobs_with_wrong_dimension():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "svc.db"
+        old = KNNStore(db, _mock_embed)
+        old.add("energie hoch", "SET_ENERGY", {"delta": 0.2})
+        with sqlite3.connect(db) as conn:
+            conn.execute(
+                "INSERT INTO examples (phrase, intent, slots_json, embedding) VALUES ('kaputt', 'DROP', '{}', ?)",
+                (np.ones(3, dtype=np.float32).tobytes(),),
+            )
+        store = KNNStore(db, _mock_embed, storage="mmap")
+        assert store.dropped_blobs == 1 and len(store._vectors) == 1
+        with sqlite3.connect(db) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM examples WHERE embedding IS NOT NULL").fetchone()[0] == 0
+        # Nächster Start: nichts mehr zu migrieren
+        assert KNNStore(db, _mock_embed, storage="mmap").dropped_blobs == 0
+
+
+def test_live_store_follows_compaction_from_other_process():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "svc.db"
+        live = KNNStore(db, _mock_embed, storage="mmap")
+        for p in ("a", "b", "c"):
+            live.add(p, "DROP", {})
+        live.load()
+        cli = KNNStore(db, _mock_embed, storage="mmap")  # z.B. svc compact-examples
+        with sqlite3.connect(db) as conn:
+            ids = [r[0] for r in conn.execute("SELECT id FROM examples WHERE phrase != 'c'")]
+        assert cli.delete(ids) == 2
+        live.add("d", "KICK_ON", {"value": 1})
+        vf = VectorFile(db.with_suffix(".vectors"))
+        with sqlite3.connect(db) as conn:
+            phrases = dict(conn.execute("SELECT id, phrase FROM examples"))
+        assert [phrases[i] for i in vf.ids().tolist()] == ["c", "d"]
+        assert np.allclose(vf.vectors()[1], np.asarray(live.embed_query("d")))
+        assert [r[2] for r in live.search("d", k=3)][0] == "d" and len(live.search("d", k=3)) == 2
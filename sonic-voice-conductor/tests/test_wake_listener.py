@@ -0,0 +1,102 @@
+"""Tests für Wake-Word-Gate und Freihand-Listener."""
+import threading
+
+import numpy as np
+from svc.listener import ContinuousListener
+from svc.stt.wake import WakeWordGate
+
+
+def test_gate_splits_fuzzy_wake_word_and_command():
+    gate = WakeWordGate("Dirigent")
+    assert gate.split("Dirigent, mehr Energie!") == "mehr Energie!"
+    assert gate.split("hey dirigenten mehr Bass") == "mehr Bass"  # Whisper-Varianten
+    assert gate.split("Dirigent.") == ""
+    assert gate.split("mehr Energie") is None
+    assert gate.split("die Regierung tagt") is None
+
+
+def test_gate_checks_only_window_and_follow_up_opens_it():
+    seen = []
+    now = [0.0]
+
+    def check(audio):
+        seen.append(len(audio))
+        return "Dirigent" if audio[0] > 0 else "irgendwas"
+
+    gate = WakeWordGate("dirigent", check, sample_rate=1000, window_seconds=0.5, follow_up_seconds=4, clock=lambda: now[0])
+    assert gate.passes(np.ones(3000, dtype=np.float32)) and seen == [500]
+    assert not gate.passes(np.zeros(3000, dtype=np.float32))
+    gate.arm()
+    now[0] = 3.0
+    assert gate.passes(np.zeros(3000, dtype=np.float32)) and len(seen) == 2
+    now[0] = 5.0
+    assert not gate.armed
+
+
+def test_listener_runs_pipeline_only_for_gated_utterances():
+    speech = np.ones(800, dtype=np.float32)
+    utterances = [np.zeros(0, dtype=np.float32), speech * -1, speech, speech, speech]
+    transcripts = iter(["Dirigent", "lauter bitte", "Dirigent mehr Hats"])
+    commands, wakes, full = [], [], []
+
+    def transcribe(audio):
+        full.append(len(audio))
+        return next(transcripts)
+
+    gate = WakeWordGate("dirigent", lambda a: "dirigent" if a[0] > 0 else "musik läuft", sample_rate=1000)
+    listener = ContinuousListener(
+        record=lambda: utterances.pop(0),
+        gate=gate,
+        transcribe=transcribe,
+        on_command=commands.append,
+        on_wake=lambda: wakes.append(1),
+    )
+    results = [listener.listen_once() for _ in range(5)]
+    # Stille, fremdes Gespräch (vom Gate verworfen), nur Wake-Word, Folgebefehl, Wake-Word + Befehl
+    assert results == [None, None, None, "lauter bitte", "mehr Hats"]
+    assert len(full) == 3 and wakes == [1]
+    assert commands == ["lauter bitte", "mehr Hats"]
+    assert listener.duty.utterances == 4 and listener.duty.passed == 2
+    assert "Äußerungen durchgelassen" in listener.duty.summary()
+
+
+def test_listener_thread_survives_record_and_transcribe_errors():
+    speech = np.ones(800, dtype=np.float32)
+    steps = [RuntimeError("Keine Audiodaten vom Mikrofon"), speech, speech]
+    transcripts = iter([ValueError("whisper kaputt"), "Dirigent mehr Bass"])
+    commands, errors = [], []
+    done = threading.Event()
+
+    def record():
+        step = steps.pop(0) if steps else np.zeros(0, dtype=np.float32)
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+    def transcribe(audio):
+        t = next(transcripts)
+        if isinstance(t, Exception):
+            raise t
+        return t
+
+    def on_command(cmd):
+        commands.append(cmd)
+        done.set()
+
+    listener = ContinuousListener(
+        record=record,
+        gate=WakeWordGate("dirigent", lambda a: "dirigent", sample_rate=1000),
+        transcribe=transcribe,
+        on_command=on_command,
+        on_error=errors.append,
+        backoff=0.01,
+    )
+    listener.start()
+    try:
+        assert done.wait(2.0)
+    finally:
+        listener.stop()
+    assert commands == ["mehr Bass"]
+    assert [type(e) for e in errors] == [RuntimeError, ValueError]
+    assert listener.duty.errors == 2 and isinstance(listener.last_error, ValueError)
+    assert "2 Fehler" in listener.duty.summary()
@@ -0,0 +1,71 @@
+"""Tests für Warm-up und Keep-alive."""
+import threading
+
+import ollama
+from svc.llm.ollama_client import LLMTransportError, OllamaClient
+from svc.warmup import FAILED, LOADING, READY, Warmup
+
+
+def test_steps_report_readiness_per_component():
+    order = []
+
+    def broken():
+        raise LLMTransportError("connection refused")
+
+    w = Warmup({"Whisper": lambda: order.append("stt"), "LLM": broken, "Embeddings": lambda: order.append("emb")})
+    assert set(w.status.values()) == {LOADING}
+    w.run()
+    assert order == ["stt", "emb"]
+    assert w.status == {"Whisper": READY, "LLM": FAILED, "Embeddings": READY}
+    assert w.errors["LLM"] == "connection refused"
+    assert not w.all_ready
+    assert "LLM Fehler" in w.summary() and "Whisper bereit" in w.summary()
+
+
+def test_ping_recovers_failed_component():
+    up = {"ok": False}
+
+    def llm():
+        if not up["ok"]:
+            raise ConnectionError("down")
+
+    w = Warmup({"LLM": llm}, pings={"LLM": llm})
+    w.run()
+    assert not w.ready("LLM")
+    up["ok"] = True
+    w.ping()
+    assert w.ready("LLM") and w.pings_sent == 1 and "LLM" not in w.errors
+
+
+def test_keepalive_loop_pings_until_stopped():
+    pinged = threading.Event()
+    stop = threading.Event()
+    w = Warmup({"LLM": lambda: None}, pings={"LLM": pinged.set}, interval=0.01)
+    thread = w.start(stop)
+    assert pinged.wait(2.0)
+    stop.set()
+    thread.join(2.0)
+    assert not thread.is_alive() and w.all_ready
+
+
+def test_client_warm_up_and_pings_use_keep_alive(monkeypatch):
+    calls = []
+
+    def fake_generate(model, prompt, system=None, context=None, stream=False, **kwargs):
+        calls.append(("generate", prompt, system, kwargs.get("keep_alive")))
+        return {"response": "{}", "context": [1, 2], "done": True}
+
+    def fake_embed(model, input, **kwargs):
+        calls.append(("embed", input, None, kwargs.get("keep_alive")))
+        return {"embeddings": [[0.1]]}
+
+    monkeypatch.setattr(ollama, "generate", fake_generate)
+    monkeypatch.setattr(ollama, "embed", fake_embed)
+    client = OllamaClient(session=True, keep_alive="30m")
+    client.warm_up_llm("SYS")
+    client.ping_llm()
+    client.ping_embed()
+    assert client.session_primes == 1 and not client.timings
+    assert calls[0][2] == "SYS"
+    assert calls[1] == ("generate", "", None, "30m")
+    assert calls[2] == ("embed", "warmup", None, "30m")